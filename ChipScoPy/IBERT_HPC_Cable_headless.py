@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+#--------------------------------------------------------------------------------------------------------------------------------------
+# # IBERT HPC-cable test, headless batch mode
+# The same data sources, histogram / PER analysis and result files as IBERT_HPC_Cable_testing.py, without PyQt5 / matplotlib:
+# - runs for TEST_SEC seconds, then checks every link against PASS_BER / PASS_SNR / PASS_EYE / PASS_PER
+# - prints a JSON summary as the last line of stdout (and into SUMMARY_FILE), exit code: 0 all links PASS, 1 any FAIL, 2 error
+#
+# Ex.  python IBERT_HPC_Cable_headless.py --PDI_FILE PDI_Files/VPK120_iBERT_2xQDD_53G.pdi --FPGA_HWID 112A --TESTID B5.sn112 \
+#             --TEST_SEC 1800 --PASS_BER 1e-6 --PASS_SNR 16 --SUMMARY_FILE summary.112A.json --DBG_LEVEL 1
+#--------------------------------------------------------------------------------------------------------------------------------------
+from module.YK_datasrc  import *          # configuration, sysconfig, and the data source classes
+import json
+
+#======================================================================================================================================
+# Headless counterparts of YKScan_DataView / HPCTest_ViewArena: no pixels, no table
+#======================================================================================================================================
+class Headless_DataView(Base_DataView):
+    def __init__(self, link, parent):
+        super().__init__(link_dsrc_name(link), parent)
+        self.link = link
+        self.nID  = link.nID
+
+        if sysconfig.SIMULATE:          self.myDataSrc = Fake_YKScanLink_DataSrc(self, link)
+        elif sysconfig.REPLAY != "":    self.myDataSrc = Replay_YKScanLink_DataSrc(self, link)
+        else:                           self.myDataSrc = IBert_YKScanLink_DataSrc(self, link)
+
+    def update_chartView(self, graphType, dsrc):    pass
+    def update_tableView(self):                     pass
+
+
+class Headless_Arena:
+    def __init__(self, links):
+        self.dataViews   = [Headless_DataView(link, self) for link in links]
+        self.poll_jitter = {}
+        self.freshness   = {}
+        self.metrics     = {}
+
+    def updateTable(self, row, col, val, color=None):   pass
+
+    def run(self, test_sec):
+        start_acquisition([c.myDataSrc for c in self.dataViews])   # FSM pollers, watchdogs and global flow control, by one event loop
+        time.sleep(test_sec)
+
+    def finish_object(self):
+        self.poll_jitter, self.freshness, self.metrics = stop_acquisition()
+        for c in self.dataViews:
+            c.myDataSrc.finish_object()
+        refresh_all_peaks_and_valleys([c.myDataSrc for c in self.dataViews])
+        stop_result_writers()
+
+    #----------------------------------------------------------------------------------------------------------------------------
+    def link_summary(self, c):
+        d   = c.myDataSrc
+        snr = d.SNR_series.mean if len(d.SNR_series) > 0 else float(d.snr)
+        failed = []
+        if d.ASYN_samples_count == 0:                                          failed.append("no YK samples")
+        if str(d.status) == "No link":                                         failed.append("no link")
+        if sysconfig.PASS_BER > 0 and not (d.ber      <= sysconfig.PASS_BER):  failed.append(f"BER {d.ber:.3e} > {sysconfig.PASS_BER:.1e}")
+        if sysconfig.PASS_SNR > 0 and not (snr        >= sysconfig.PASS_SNR):  failed.append(f"SNR {snr:.2f} < {sysconfig.PASS_SNR}")
+        if sysconfig.PASS_EYE > 0 and not (d.EYE_open >= sysconfig.PASS_EYE):  failed.append(f"EYE {d.EYE_open:.2f} < {sysconfig.PASS_EYE}")
+        if sysconfig.PASS_PER > 0 and not (d.per_val  <= sysconfig.PASS_PER):  failed.append(f"PER {d.per_val:.3e} > {sysconfig.PASS_PER:.1e}")
+        return {
+            "link":         c.myName,
+            "board":        c.link.board,
+            "result":       "FAIL" if failed else "PASS",
+            "failed":       failed,
+            "status":       str(d.status),
+            "BER":          float(d.ber),
+            "SNR":          float(snr),
+            "EYE_open":     float(d.EYE_open),
+            "PER":          float(d.per_val),
+            "errors":       int(d.error_count),
+            "bits":         str(d.bit_count),
+            "YK_samples":   d.ASYN_samples_count,
+            "link_samples": d.SYNC_samples_count,
+            "roundtrips_per_poll": d.roundtrips_per_poll(),
+            "YK_drops":     d.YKSample_queue.drops,
+            "poll_jitter":  self.poll_jitter.get(c.myName, {}),
+            "freshness":    self.freshness.get(c.myName, {}),
+            "metrics":      self.metrics.get(c.myName, {}),
+        }
+
+    def summary(self, test_sec):
+        links = [self.link_summary(c) for c in self.dataViews]
+        return {
+            "result":     "PASS" if len(links) > 0 and all(l["result"] == "PASS" for l in links) else "FAIL",
+            "TID":        sysconfig.TESTID,
+            "FPGA_HWID":  sysconfig.FPGA_HWID,
+            "DATA_RATE":  sysconfig.DATA_RATE,
+            "DPATTERN":   sysconfig.DPATTERN,
+            "start_time": app_start_time.isoformat(timespec="seconds"),
+            "test_sec":   test_sec,
+            "thresholds": {"BER": sysconfig.PASS_BER, "SNR": sysconfig.PASS_SNR, "EYE": sysconfig.PASS_EYE, "PER": sysconfig.PASS_PER},
+            "metrics":    self.metrics.get("ALL", {}),
+            "links":      links,
+        }
+
+
+#======================================================================================================================================
+if __name__ == '__main__':
+    try:
+        start_result_writers()
+        myLinks = init_iBERT_engine(sysconfig, global_N_links)
+        arena = Headless_Arena(myLinks)
+        bprint_loading_time(f"Headless run of {len(myLinks)} links for {sysconfig.TEST_SEC} sec")
+
+        arena.run(sysconfig.TEST_SEC)
+        arena.finish_object()
+        summary = arena.summary(sysconfig.TEST_SEC)
+    except Exception as e:
+        summary = {"result": "ERROR", "error": f"{type(e).__name__}: {str(e)}", "TID": sysconfig.TESTID, "FPGA_HWID": sysconfig.FPGA_HWID}
+
+    text = json.dumps(summary)
+    if sysconfig.SUMMARY_FILE != "":
+        with open(sysconfig.SUMMARY_FILE, "w") as f:
+            f.write(json.dumps(summary, indent=2) + "\n")
+    log_flush()                             # the buffered log lines first, the summary as the last stdout line
+    print(text, flush=True)
+    sys.exit({"PASS": 0, "FAIL": 1}.get(summary["result"], 2))
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Check of link_count_value() (batched LINK_POLL) against the counters cs_server really returned, as recorded in the "Link Status"
+# column of the result CSVs:  LINK ('No link' R=26.543 Gbps LS='Not locked' EC='0x8E2' CC='0x2_29A5_9709')
+# every EC (error count) / CC (cycle count) value must be parsed into a non-negative int
+#   Ex.  python misc/check_link_counts.py misc/YK_CSV_Files
+#--------------------------------------------------------------------------------------------------------------------------------------
+import glob, os, re, sys
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from module.iBert_ScoPy import link_count_value
+
+LINK_STATUS_RE = re.compile(r"EC='([^']*)' CC='([^']*)'")
+
+if __name__ == '__main__':
+    root   = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "YK_CSV_Files")
+    checked, failed = 0, []
+    for path in sorted(glob.glob(f"{root}/**/*.csv", recursive=True)):
+        df = pd.read_csv(path, usecols=lambda c: c == "Link Status")
+        if not "Link Status" in df:  continue
+        for status in df["Link Status"].dropna():
+            for raw in LINK_STATUS_RE.findall(str(status)):
+                for v in raw:
+                    n = link_count_value(v)
+                    checked += 1
+                    if not isinstance(n, int) or n < 0:
+                        failed.append(f"{path}: not parsed: {v!r} => {n!r}")
+
+    for f in failed:  print(f, file=sys.stderr)
+    print(f"{checked} recorded EC / CC values checked, {len(failed)} failed", file=sys.stderr)
+    sys.exit(1 if failed or checked == 0 else 0)
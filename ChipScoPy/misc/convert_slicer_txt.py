@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Convert legacy np.savetxt slicer data files (*.txt) into binary YK slicer archives (*.yks), next to the original files
+#   Ex.  python misc/convert_slicer_txt.py YK_SlicerData_Files/TID_B2.sn111_B1.sn112.2024-0708/*.txt
+# The metadata is taken from the file name "Sn<HWID>_<RATE>G.<LINK>-<hhmm>.txt", and from the TID_<TID>.<date> folder name.
+#--------------------------------------------------------------------------------------------------------------------------------------
+import argparse, os, re, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from module.YK_archive import convert_slicer_txt
+
+parser = argparse.ArgumentParser(description="Convert slicer *.txt files into *.yks archives")
+parser.add_argument("files", nargs="+", metavar="file.txt")
+parser.add_argument("--SLICE_SIZE", default=2000, type=int, metavar="size", help="samples per slicer frame. Default: 2000")
+parser.add_argument("--DPATTERN",   default="",               metavar="pattern", help='Bits data pattern, not recorded in the file name. Default: ""')
+args = parser.parse_args()
+
+for fname in args.files:
+    base = os.path.basename(fname)
+    m    = re.match(r"Sn(\w+?)_([0-9]+)G\.(.+)-[0-9]+\.txt$", base)
+    t    = re.match(r"TID_(.*)\.[0-9-]+$", os.path.basename(os.path.dirname(os.path.abspath(fname))))
+    meta = dict(TID=t.group(1) if t else "", FPGA_HWID=m.group(1) if m else "", DATA_RATE=int(m.group(2)) if m else 0,
+                LINK=m.group(3) if m else base, DPATTERN=args.DPATTERN, SOURCE=base)
+    out  = os.path.splitext(fname)[0] + ".yks"
+    meta = convert_slicer_txt(fname, out, args.SLICE_SIZE, **meta)
+    print(f"{fname}  =>  {out}   frames={meta['N_FRAMES']}  LINK={meta['LINK']}")
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Cross-run query of the per-link result CSVs, by the columnar index cache (module/YK_index.py) of a YK_CSV_Files folder
+#   Ex.  python misc/index_YK_CSV.py misc/YK_CSV_Files --cable B5 --rate 53
+#        python misc/index_YK_CSV.py misc/YK_CSV_Files --board 111A --rate 10 26 --latest --OUTPUT B5_111A.csv
+# The first run ingests every CSV (by --WORKERS processes); later runs only the new / changed files (by size and mtime).
+#--------------------------------------------------------------------------------------------------------------------------------------
+import argparse, os, sys, time
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from module.YK_index import YK_CSV_Index
+
+parser = argparse.ArgumentParser(description="Query final BER / SNR / EYE / PER of YK result CSVs across runs")
+parser.add_argument("root",                                    metavar="folder", help="YK_CSV_Files folder, with TID_* sub-folders")
+parser.add_argument("--cable",   nargs="*",                    metavar="cable",  help="cable(s), by the TID naming, Ex. B5")
+parser.add_argument("--board",   nargs="*",                    metavar="hwid",   help="board HWID(s), Ex. 111A")
+parser.add_argument("--rate",    nargs="*", type=int,          metavar="Gbps",   help="data rate(s), Ex. 53")
+parser.add_argument("--TID",     nargs="*",                    metavar="TID",    help="TID(s), Ex. B5.sn111_B3.sn112")
+parser.add_argument("--quad",    nargs="*", type=int,          metavar="quad",   help="GT quad(s), Ex. 204")
+parser.add_argument("--channel", nargs="*", type=int,          metavar="ch",     help="GT channel(s), 0 ~ 3")
+parser.add_argument("--latest",  action="store_true",                            help="only the last run of a link per TID, like combine_YK_CSV.sh")
+parser.add_argument("--WORKERS", default=None, type=int,       metavar="N",      help="ingest processes. Default: CPU count")
+parser.add_argument("--OUTPUT",  default="",                   metavar="file",   help="also write the result table into this CSV file")
+args = parser.parse_args()
+
+t0 = time.perf_counter()
+index = YK_CSV_Index(args.root)
+index.refresh(args.WORKERS)
+t1 = time.perf_counter()
+df = index.final_results(latest=args.latest, cable=args.cable, board=args.board, rate=args.rate, TID=args.TID, quad=args.quad, channel=args.channel)
+t2 = time.perf_counter()
+
+cols = ["TID", "date", "board", "cable", "rate", "quad", "channel", "hhmm", "rows", "BER", "SNR", "EYE", "PER"]
+with pd.option_context("display.max_rows", None, "display.width", 200):
+    print(df[cols].to_string(index=False))
+print(f"\n{len(df)} of {len(index.catalog)} files:  index {t1 - t0:.3f} sec ({index.ingested} ingested)  query {(t2 - t1) * 1000:.1f} ms", file=sys.stderr)
+if args.OUTPUT != "":
+    df.to_csv(args.OUTPUT, index=False)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Batch re-analysis of archived slicer data: histogram / peaks / EYE / PER of every slicer file under SLICER_PATH/TID_*, by the same
+# Slicer_Analyzer as the live data sources, with the analysis parameters given here (Ex. another HIST_BINS or PER_METHOD).
+#   Ex.  python misc/reanalyze_slicer.py YK_SlicerData_Files --HIST_BINS 200 --PER_METHOD em --SUMMARY reanalysis.em-200.csv
+# - slicer files: "Sn<HWID>_<RATE>G.YK-Quad_<q>_CH<c>-<hhmm>.{ykc,yks,txt}", one per link run (ykc, else yks, else txt)
+# - the files are analyzed by a process pool; each result row is appended to the SUMMARY table as soon as it is done
+# - a file already in SUMMARY, with the same size / mtime and analysis parameters, is not analyzed again
+# - SLICE_SIZE: of the archive header for *.yks / *.ykc; --SLICE_SIZE for the legacy *.txt files only
+#--------------------------------------------------------------------------------------------------------------------------------------
+import argparse, glob, os, re, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from module.YK_archive  import load_slicer_frames
+from module.YK_analysis import Slicer_Analyzer, make_smoothing_kernel
+
+SLICER_NAME_RE = re.compile(r"Sn(\w+?)_([0-9]+)G\.(YK-Quad_[0-9]+_CH[0-9]+)-([0-9]+)\.(ykc|yks|txt)$")
+SLICER_EXTS    = ("ykc", "yks", "txt")
+KEY_COLUMNS    = ["path", "size", "mtime_ns", "params"]      # mtime in integer ns: a float mtime is not exact through the CSV
+SUMMARY_COLUMNS= KEY_COLUMNS + ["TID", "board", "rate", "link", "hhmm", "frames", "resolved", "EYE", "peaks", "valleys", "PER"] + \
+                 [f"P{k}_{s}" for k in range(1, 5) for s in ("mean", "std")] + ["error"]
+
+def find_slicer_files(root):
+    # {stem: path} of the preferred file per link run
+    found = {}
+    for path in sorted(glob.glob(f"{root}/**/Sn*_*G.YK-Quad_*_CH*-*.*", recursive=True)):
+        m = SLICER_NAME_RE.search(os.path.basename(path))
+        if m is None:  continue
+        stem = path[:-len(m[5]) - 1]
+        if not stem in found or SLICER_EXTS.index(m[5]) < SLICER_EXTS.index(found[stem].rsplit(".", 1)[1]):
+            found[stem] = path
+    return list(found.values())
+
+def analyze_file(path, params):
+    # worker process: one slicer file, its frames fed in arrival order by chunks of CHUNK frames, like the FSM steps of a live run
+    m     = SLICER_NAME_RE.search(os.path.basename(path))
+    tid   = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    rate  = int(m[2])
+    st    = os.stat(path)
+    row   = {"path": path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "params": params["signature"],
+             "TID": tid[len("TID_"):] if tid.startswith("TID_") else tid, "board": m[1], "rate": rate, "link": m[3], "hhmm": m[4]}
+    try:
+        frames = np.asarray(load_slicer_frames(path, params["SLICE_SIZE"]), dtype=np.float32)
+        levels = 4 if rate > 50 else 2                                          # PAM4 or NRZ, like HIST_LEVELS of the live run
+        bins   = params["HIST_BINS"]
+        ana    = Slicer_Analyzer(bins, levels, params["MAX_SLICES"], params["HIST_MODE"], make_smoothing_kernel(params["HIST_SMOOTH"]),
+                                 int(4.1 * bins / 100), params["PER_METHOD"])
+        for i in range(0, len(frames), params["CHUNK"]):
+            ana.add_slices(frames[i:i + params["CHUNK"]])
+        result = ana.evaluate_PER(frames[-params["MAX_SLICES"]:])
+        row.update(frames=len(frames), resolved=bool(ana.pv is not None and ana.pv[0].valid[ana.pv[1]]), EYE=float(ana.eye_open),
+                   peaks=" / ".join(f"{p * 100 / bins:.0f}" for p in ana.peaks), valleys=" / ".join(f"{v * 100 / bins:.0f}" for v in ana.valleys),
+                   PER=np.nan if result is None else float(result[3]), error="")
+        if result is not None:
+            for k, stat in enumerate(result[0]):
+                row[f"P{k+1}_mean"], row[f"P{k+1}_std"] = stat["mean"], stat["std"]
+    except Exception as e:
+        row.update(frames=0, resolved=False, EYE=np.nan, peaks="", valleys="", PER=np.nan, error=f"{type(e).__name__}: {str(e)}")
+    return row
+
+def load_summary(path):
+    # a summary of an older layout (Ex. float "mtime"): its rows match no file, i.e. analyzed again
+    try:
+        return pd.read_csv(path, dtype={"hhmm": str, "size": "Int64", "mtime_ns": "Int64"}).reindex(columns=SUMMARY_COLUMNS)
+    except (OSError, ValueError):
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+def summary_keys(summary):
+    keys = set()
+    for path, size, mtime_ns, params in zip(*(summary[k] for k in KEY_COLUMNS)):
+        if not (pd.isna(size) or pd.isna(mtime_ns)):
+            keys.add((path, int(size), int(mtime_ns), params))
+    return keys
+
+#======================================================================================================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Re-analyze archived slicer data files into one summary table")
+    parser.add_argument("root",                                        metavar="folder", help="SLICER_PATH folder, with TID_* sub-folders")
+    parser.add_argument("--SUMMARY",    default="reanalysis.csv",      metavar="file",   help="summary table, kept across runs. Default: reanalysis.csv")
+    parser.add_argument("--HIST_BINS",  default=int(os.getenv("HIST_BINS", "100")), type=int, metavar="bins",  help="histogram bins. Default: 100")
+    parser.add_argument("--HIST_MODE",  default="cumulative",          metavar="mode",   help="cumulative | window:<N> | decay:<F>. Default: cumulative")
+    parser.add_argument("--HIST_SMOOTH",default="tri:3",               metavar="kernel", help="none | box:<N> | tri:<N> | gauss:<sigma>. Default: tri:3")
+    parser.add_argument("--PER_METHOD", default="threshold",           metavar="method", help="threshold | em. Default: threshold")
+    parser.add_argument("--MAX_SLICES", default=int(os.getenv("MAX_SLICES", "12")), type=int, metavar="n", help="PER window in slices. Default: 12")
+    parser.add_argument("--SLICE_SIZE", default=int(os.getenv("YKSCAN_SLICER_SIZE", "2000")), type=int, metavar="size", help="samples per frame of the legacy *.txt files (archives: by their header). Default: 2000")
+    parser.add_argument("--CHUNK",      default=1, type=int,           metavar="n",      help="frames per analysis step. Default: 1")
+    parser.add_argument("--WORKERS",    default=None, type=int,        metavar="N",      help="analysis processes. Default: CPU count")
+    parser.add_argument("--FORCE",      action="store_true",                             help="re-analyze every file")
+    args   = parser.parse_args()
+    params = {k: getattr(args, k) for k in ("HIST_BINS", "HIST_MODE", "HIST_SMOOTH", "PER_METHOD", "MAX_SLICES", "SLICE_SIZE", "CHUNK")}
+    params["signature"] = "/".join(str(params[k]) for k in ("HIST_BINS", "HIST_MODE", "HIST_SMOOTH", "PER_METHOD", "MAX_SLICES", "CHUNK"))
+
+    t0      = time.perf_counter()
+    summary = load_summary(args.SUMMARY)
+    done    = set() if args.FORCE else summary_keys(summary)
+    todo    = []
+    for path in find_slicer_files(args.root):
+        st = os.stat(path)
+        if not (path, st.st_size, st.st_mtime_ns, params["signature"]) in done:
+            todo.append(path)
+    print(f"{len(todo)} slicer files to analyze, {len(done)} rows in {args.SUMMARY}  params={params['signature']}", file=sys.stderr)
+
+    # streamed: every row appended once done, so an interrupted run keeps its results; duplicates resolved below
+    header = not os.path.isfile(args.SUMMARY) or os.path.getsize(args.SUMMARY) == 0
+    if not header and pd.read_csv(args.SUMMARY, nrows=0).columns.tolist() != SUMMARY_COLUMNS:
+        summary.to_csv(args.SUMMARY, index=False)        # of an older layout: rewritten in the current one, before appending to it
+    with ProcessPoolExecutor(args.WORKERS) as pool, open(args.SUMMARY, "a") as f:
+        futures = [pool.submit(analyze_file, path, params) for path in todo]
+        for n, future in enumerate(as_completed(futures), 1):
+            r = future.result()
+            f.write(pd.DataFrame([r], columns=SUMMARY_COLUMNS).to_csv(index=False, header=header))
+            f.flush()
+            header = False
+            print(f"[{n}/{len(todo)}] {r['path']}  frames={r['frames']}  EYE={r['EYE']:.2f}  PER={r['PER']:.3e}  {r['error']}", file=sys.stderr)
+
+    # the latest row per file and parameters, sorted
+    summary = load_summary(args.SUMMARY)
+    if len(summary) > 0:
+        summary = summary.reindex(columns=SUMMARY_COLUMNS).drop_duplicates(["path", "params"], keep="last")
+        summary = summary.sort_values(["params", "TID", "board", "rate", "link", "hhmm"], kind="stable")
+        tmp = args.SUMMARY + ".tmp"
+        summary.to_csv(tmp, index=False)
+        os.replace(tmp, args.SUMMARY)
+    print(f"{len(todo)} analyzed in {time.perf_counter() - t0:.1f} sec, {len(summary)} rows in {args.SUMMARY}", file=sys.stderr)
@@ -0,0 +1,173 @@
+#======================================================================================================================================
+# YK-Scan acquisition core: one asyncio event loop, on one thread, owning the FSM pollers, watchdogs and the global flow control
+# of all link data sources, instead of a worker thread + a watchdog thread per link and a flow-control thread.
+#   - every FSM step / watchdog / YK.start() / YK.stop() is a blocking chipscopy (TCF) call or numpy work: it runs on a fixed
+#     pool of n_workers threads, at most one at a time per link (a per-link asyncio.Lock), so the thread count is constant
+#   - pollers are paced by absolute deadlines of the loop clock: no drift, and an overrun skips the missed ticks instead of
+#     bursting; the lateness of every wake-up is kept per link, see jitter_report()
+#   - post(): bridge for foreign threads, like the chipscopy TCF call-backs, into the loop thread by call_soon_threadsafe()
+#   - subscribe(): callback(dsrc) on the loop thread after each FSM step of dsrc, Ex. a Qt signal emit() for the GUI thread
+#   - global flow control: every tick, YK engines are started / stopped as planned by a YK_FlowScheduler (module.YK_scheduler)
+#   - every(): light periodic work on the loop thread, Ex. the metrics dump
+#--------------------------------------------------------------------------------------------------------------------------------------
+import asyncio, contextlib, math, threading, time, traceback
+from concurrent.futures import ThreadPoolExecutor
+from module.common import BPrint, DBG_LEVEL_ERR
+from module.YK_storage import Running_Stats
+
+class _Source_Pacer:
+    def __init__(self, dsrc, interval):
+        self.dsrc     = dsrc
+        self.interval = interval
+        self.lock     = None            # asyncio.Lock, created on the loop thread
+        self.jitter   = Running_Stats() # seconds of wake-up lateness, per FSM tick
+        self.overruns = 0               # FSM steps longer than interval, their missed ticks skipped
+
+
+class Acquisition_Loop(threading.Thread):
+    def __init__(self, n_workers=4):
+        super().__init__(name="ACQ-LOOP", daemon=True)
+        self.loop        = asyncio.new_event_loop()
+        self.executor    = ThreadPoolExecutor(n_workers, thread_name_prefix="ACQ-IO")
+        self.pacers      = []
+        self.subscribers = []
+        self.periodics   = []
+        self.flowctrl    = None
+        self.scheduler   = None
+        self.started     = threading.Event()
+
+    #---- before start() ------------------------------------------------------
+    def add_source(self, dsrc, interval):
+        # dsrc: Base_DataSource, its fsmFunc_step() every interval sec, its fsmFunc_watchdog() every WATCHDOG_INTERVAL msec
+        dsrc.acq = self
+        self.pacers.append(_Source_Pacer(dsrc, interval))
+
+    def set_flow_control(self, scheduler, tick, refresh=None, refresh_period=None):
+        # global flow control of YKScan traffic: scheduler.plan() every tick sec; refresh([dsrc, ...]) every refresh_period sec
+        self.scheduler = scheduler
+        self.flowctrl  = (tick, refresh, refresh_period)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def every(self, period, fn):
+        # fn() every period sec, on the loop thread: it must not block
+        self.periodics.append((period, fn))
+
+    #---- any thread ----------------------------------------------------------
+    def post(self, fn, *args):
+        try:
+            self.loop.call_soon_threadsafe(fn, *args)
+            return True
+        except RuntimeError:            # loop closed: acquisition stopped, the late call-back is dropped
+            return False
+
+    def jitter_report(self):
+        return {p.dsrc.dsrcName: {"mean_ms": p.jitter.mean * 1000, "max_ms": max(p.jitter.max, 0) * 1000, "steps": len(p.jitter), "overruns": p.overruns}
+                for p in self.pacers}
+
+    def freshness_report(self):
+        return {} if self.scheduler is None else self.scheduler.metrics(time.monotonic())
+
+    def stop(self, timeout=None):
+        # cancel all pollers, and wait for the FSM steps in flight
+        if self.started.wait(timeout):
+            self.post(self.stopping.set)
+        self.join(timeout)
+
+    #---- loop thread ---------------------------------------------------------
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main())
+        finally:
+            self.executor.shutdown(wait=True)
+            self.loop.close()
+
+    async def _main(self):
+        self.stopping = asyncio.Event()
+        tasks = []
+        for p in self.pacers:
+            p.lock = asyncio.Lock()
+            tasks.append(asyncio.create_task(self._fsm_task(p),      name=f"FSM-{p.dsrc.dsrcName}"))
+            tasks.append(asyncio.create_task(self._watchdog_task(p), name=f"WDOG-{p.dsrc.dsrcName}"))
+        if self.flowctrl is not None:
+            tasks.append(asyncio.create_task(self._flowctrl_task(*self.flowctrl), name="FLOWCTRL"))
+        for period, fn in self.periodics:
+            tasks.append(asyncio.create_task(self._periodic_task(period, fn), name=f"EVERY-{period}"))
+        self.started.set()
+
+        await self.stopping.wait()
+        for t in tasks:  t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _call(self, p, fn, *args):
+        async with p.lock:
+            return await self.loop.run_in_executor(self.executor, fn, *args)
+
+    async def _fsm_task(self, p):
+        d = p.dsrc
+        next_t = self.loop.time()
+        try:
+            while d.fsm_running:
+                delay = d.fsmFunc_delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    next_t = self.loop.time()
+                await self._call(p, d.fsmFunc_step)
+                for callback in self.subscribers:  callback(d)
+
+                next_t += p.interval
+                now = self.loop.time()
+                if next_t < now:
+                    p.overruns += 1
+                    next_t += math.ceil((now - next_t) / p.interval) * p.interval
+                await asyncio.sleep(next_t - now)
+                p.jitter.add(self.loop.time() - next_t)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            BPrint(f"{d.dsrcName}: FSM poller stopped by exception\n{traceback.format_exc()}", level=DBG_LEVEL_ERR)
+
+    async def _watchdog_task(self, p):
+        d = p.dsrc
+        await asyncio.sleep(d.wdog_delay / 1000)
+        while d.fsm_running:
+            await asyncio.sleep(d.WATCHDOG_INTERVAL / 1000)
+            try:
+                await self._call(p, d.fsmFunc_watchdog)
+            except Exception:
+                BPrint(f"{d.dsrcName}: watchdog exception\n{traceback.format_exc()}", level=DBG_LEVEL_ERR)
+
+    async def _flowctrl_task(self, tick, refresh, refresh_period):
+        pacers = {id(p.dsrc): p for p in self.pacers}
+        next_refresh = time.monotonic() + (refresh_period or 0)
+        while True:
+            try:
+                now = time.monotonic()
+                self.scheduler.observe(now)
+                to_stop, to_start = self.scheduler.plan(now)
+                for d in to_stop:               # stops first, so that no more than the planned engines ever run together
+                    await self._call(pacers[id(d)], d.dsrc_traffic_manager, False)
+                for d in to_start:
+                    await self._call(pacers[id(d)], d.dsrc_traffic_manager, True)
+
+                if refresh is not None and time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + refresh_period
+                    # the analyzers / histograms of all links: no FSM step of any link meanwhile; locks taken in the pacers order
+                    async with contextlib.AsyncExitStack() as locks:
+                        for p in self.pacers:  await locks.enter_async_context(p.lock)
+                        await self.loop.run_in_executor(self.executor, refresh, [p.dsrc for p in self.pacers])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                BPrint(f"flow control exception\n{traceback.format_exc()}", level=DBG_LEVEL_ERR)
+            await asyncio.sleep(tick)
+
+    async def _periodic_task(self, period, fn):
+        while True:
+            await asyncio.sleep(period)
+            try:
+                fn()
+            except Exception:
+                BPrint(f"periodic {fn}: exception\n{traceback.format_exc()}", level=DBG_LEVEL_ERR)
@@ -0,0 +1,376 @@
+#======================================================================================================================================
+# YK-Scan slicer analysis: histogram, peaks / valleys, PER.  Pure numpy, no Qt / matplotlib dependency
+#======================================================================================================================================
+import math
+import numpy as np
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Streaming histogram of slicer values, updated with the newly arrived slices only: O(new samples) per update.
+# The bin index of a sample is (value - lo) * n_bins / (hi - lo), truncated; np.bincount() then counts all of them in one pass.
+# Like np.histogram(), values outside [lo, hi] are ignored and the value hi falls into the last bin.
+#
+# Modes (spec string, as HIST_MODE):
+#   - "cumulative":  counts of all slices since start / reset
+#   - "window:N":    counts of the last N slices; per-slice counts are kept, the evicted slice is subtracted
+#   - "decay:F":     exponential decay, counts = counts * F + new_counts, per slice.  (0 < F < 1)
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Streaming_Histogram:
+    def __init__(self, n_bins, value_range=(0, 100), mode="cumulative"):
+        self.n_bins = n_bins
+        self.lo, self.hi = value_range
+        self.scale  = n_bins / (self.hi - self.lo)
+        self.bins   = np.linspace(self.lo, self.hi, n_bins + 1)
+        self.counts = np.zeros(n_bins)                  # float64: updated in place, so that external references stay valid
+
+        self.mode, _, arg = mode.partition(":")
+        match self.mode:
+            case "cumulative":
+                pass
+            case "window":
+                self.window = int(arg)
+                assert self.window > 0
+                self._slice_counts = np.zeros((self.window, n_bins), dtype=np.int64)
+                self._wpos  = 0
+                self._wfill = 0
+            case "decay":
+                self.decay = float(arg)
+                assert 0 < self.decay < 1
+            case _:
+                raise ValueError(f"Not valid histogram mode: {mode}\n")
+        self.n_slices = 0                               # slices accumulated since start / reset
+
+    def reset(self):
+        self.counts[:] = 0
+        self.n_slices  = 0
+        if self.mode == "window":
+            self._slice_counts[:] = 0
+            self._wpos  = 0
+            self._wfill = 0
+
+    def bin_counts(self, samples):
+        x   = np.ravel(samples)
+        x   = x[(x >= self.lo) & (x <= self.hi)]
+        idx = ((x - self.lo) * self.scale).astype(np.intp)
+        np.minimum(idx, self.n_bins - 1, out=idx)       # the value hi, into the last bin
+        return np.bincount(idx, minlength=self.n_bins)
+
+    def update(self, slices):
+        # slices: 2D array (n_slices, slice_size) of the newly arrived slicer frames only, oldest first
+        slices = np.atleast_2d(slices)
+        if slices.shape[0] == 0:  return self.counts
+
+        match self.mode:
+            case "cumulative":
+                self.counts += self.bin_counts(slices)
+            case "window":
+                for s in slices:
+                    c = self.bin_counts(s)
+                    self.counts -= self._slice_counts[self._wpos]       # the evicted slice, all zero while not full
+                    self.counts += c
+                    self._slice_counts[self._wpos] = c
+                    self._wpos  = (self._wpos + 1) % self.window
+                    self._wfill = min(self._wfill + 1, self.window)
+            case "decay":
+                for s in slices:
+                    self.counts *= self.decay
+                    self.counts += self.bin_counts(s)
+        self.n_slices += slices.shape[0]
+        return self.counts
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Smoothing kernel for histogram peak detection, by spec string (as HIST_SMOOTH):
+#   "none" | "box:<N>" | "tri:<N>" | "gauss:<sigma in bins>"
+#--------------------------------------------------------------------------------------------------------------------------------------
+def make_smoothing_kernel(spec):
+    kind, _, arg = spec.partition(":")
+    match kind:
+        case "none" | "":
+            k = np.ones(1)
+        case "box":
+            k = np.ones(int(arg))
+        case "tri":
+            h = (int(arg) + 1) // 2
+            k = np.concatenate((np.arange(1, h + 1), np.arange(h - 1, 0, -1))).astype(np.float64)
+        case "gauss":
+            sigma = float(arg)
+            x = np.arange(-int(3 * sigma + 0.5), int(3 * sigma + 0.5) + 1)
+            k = np.exp(-0.5 * (x / sigma) ** 2)
+        case _:
+            raise ValueError(f"Not valid smoothing kernel: {spec}\n")
+    return k / k.sum()
+
+def smooth_rows(counts, kernel):
+    # 'same'-size convolution of every row, looping over the (few) kernel taps, vectorized over links & bins
+    K = len(kernel)
+    if K == 1:  return counts * kernel[0]
+    n, B = counts.shape
+    padded = np.pad(counts, ((0, 0), (K // 2, K - 1 - K // 2)), mode="edge")
+    out = np.zeros((n, B))
+    for j, w in enumerate(kernel[::-1]):
+        out += w * padded[:, j:j + B]
+    return out
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Batched PAM4 / NRZ peaks and valleys detection, for a (n_links, n_bins) histogram count matrix in one numpy pass.
+#  --------- 00 -------------------------------- 50 -------------------------------- 100 -------
+#  peaks:            Peak0           Peak1                  Peak2           Peak3
+#  valeys:                  Valey0             Valey1               Valey2
+#
+# - each row is smoothed by the kernel, then the n_levels peaks are picked greedily: the highest remaining bin, where
+#   local maxima of the smoothed histogram always rank above the non-maxima, suppressing bins closer than min_distance
+#   to a picked peak.  Narrow or unbalanced levels are thus resolved without splitting the range into fixed halves.
+# - a valley is the minimum of the smoothed histogram between 2 adjacent peaks.
+# - eye_open is the average distance between adjacent peaks, in value units (0 ~ 100).
+# - valid[i] is False when row i can't resolve n_levels populated peaks, e.g. an empty histogram.
+#--------------------------------------------------------------------------------------------------------------------------------------
+class PeaksValleys:
+    def __init__(self, peaks, valleys, peak_counts, valley_counts, eye_open, valid):
+        self.peaks         = peaks              # (n_links, n_levels)   bin indices, ascending
+        self.valleys       = valleys            # (n_links, n_levels-1) bin indices
+        self.peak_counts   = peak_counts        # raw histogram counts at peaks
+        self.valley_counts = valley_counts      # raw histogram counts at valleys
+        self.eye_open      = eye_open           # (n_links,)
+        self.valid         = valid              # (n_links,) bool
+
+def batch_find_peaks_and_valleys(counts, n_levels, min_distance, kernel=np.ones(1), value_span=100):
+    counts = np.atleast_2d(np.asarray(counts, dtype=np.float64))
+    n, B   = counts.shape
+    rows   = np.arange(n)
+    bins   = np.arange(B)
+    s      = smooth_rows(counts, kernel)
+
+    # local maxima, with plateau taken at its left edge
+    pad    = np.pad(s, ((0, 0), (1, 1)), constant_values=-np.inf)
+    is_max = (s > pad[:, :-2]) & (s >= pad[:, 2:])
+    score  = s + np.where(is_max, s.max(axis=1, keepdims=True) + 1, 0)
+
+    peaks  = np.zeros((n, n_levels), dtype=np.intp)
+    valid  = np.ones(n, dtype=bool)
+    for k in range(n_levels):
+        p = score.argmax(axis=1)
+        valid &= np.isfinite(score[rows, p]) & (s[rows, p] > 0)
+        peaks[:, k] = p
+        score[np.abs(bins[None, :] - p[:, None]) < min_distance] = -np.inf
+    peaks.sort(axis=1)
+
+    valleys = np.zeros((n, n_levels - 1), dtype=np.intp)
+    for k in range(n_levels - 1):
+        between = (bins[None, :] >= peaks[:, k:k+1]) & (bins[None, :] <= peaks[:, k+1:k+2])
+        valleys[:, k] = np.where(between, s, np.inf).argmin(axis=1)
+
+    eye_open = (peaks[:, -1] - peaks[:, 0]) * (value_span / B) / (n_levels - 1)
+    return PeaksValleys(peaks, valleys, counts[rows[:, None], peaks], counts[rows[:, None], valleys], eye_open, valid)
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# PER (Probability of Error Rate) estimator, as a mixture of n_levels Gaussians (PAM4: 4, NRZ: 2).
+# - update(): per YK sample, split the slicer frame into levels by thresholds, then add the per-level sufficient statistics
+#             (count, sum, sum of squares) by np.bincount; the statistics of the slice evicted from the window are subtracted.
+# - evaluate(): per level (mean, std), the boundary of 2 adjacent levels at the middle of their means, and the crossover
+#             error probabilities in closed form:  P(level k beyond boundary b) = erfc(|b - mean_k| / (std_k * sqrt(2))) / 2
+#--------------------------------------------------------------------------------------------------------------------------------------
+class PER_Estimator:
+    def __init__(self, n_levels, window):
+        self.n_levels = n_levels
+        self.window   = window                                          # in slices, like the slicer ring buffer
+        self.stats    = np.zeros((3, n_levels))                         # rows: count, sum, sum of squares
+        self._slice_stats = np.zeros((window, 3, n_levels))
+        self._wpos    = 0
+        self.n_slices = 0
+
+    def reset(self):
+        self.stats[:] = 0
+        self._slice_stats[:] = 0
+        self._wpos    = 0
+        self.n_slices = 0
+
+    def update(self, slicer, thresholds):
+        # thresholds: ascending, n_levels-1 values; a value equal to threshold goes to the upper level
+        x   = np.ravel(slicer).astype(np.float64)
+        lvl = np.searchsorted(thresholds, x, side="right")
+        new = self._slice_stats[self._wpos]
+        self.stats -= new
+        new[0] = np.bincount(lvl,            minlength=self.n_levels)
+        new[1] = np.bincount(lvl, weights=x,     minlength=self.n_levels)
+        new[2] = np.bincount(lvl, weights=x * x, minlength=self.n_levels)
+        self.stats += new
+        self._wpos = (self._wpos + 1) % self.window
+        self.n_slices += 1
+
+    def level_stats(self):
+        # [{'mean', 'std', 'count'}, ...] per level; mean / std are NaN for an empty level
+        out = []
+        for k in range(self.n_levels):
+            n, s1, s2 = (float(v) for v in self.stats[:, k])
+            if n < 1:
+                out.append({'mean': math.nan, 'std': math.nan, 'count': 0})
+                continue
+            mean = s1 / n
+            out.append({'mean': mean, 'std': math.sqrt(max(s2 / n - mean * mean, 0.0)), 'count': int(round(n))})
+        return out
+
+    def evaluate(self):
+        # returns (level_stats, boundaries, errors), errors: [(err_k_to_k+1, err_k+1_to_k), ...] per boundary
+        st = self.level_stats()
+        return (st, *crossover_errors(st))
+
+def crossover_errors(level_stats):
+    boundaries = []
+    errors = []
+    for lo, hi in zip(level_stats[:-1], level_stats[1:]):
+        b = (lo['mean'] + hi['mean']) / 2
+        boundaries.append(b)
+        errors.append((gaussian_tail(b - lo['mean'], lo['std']), gaussian_tail(hi['mean'] - b, hi['std'])))
+    return boundaries, errors
+
+def gaussian_tail(distance, std):
+    # P(X > mean + distance) of a normal distribution.  An empty level (NaN mean / std, so also its boundaries NaN) counts as all
+    # errors: 1.0, so that the PER stays a finite failing value, rather than NaN into the table / the headless JSON summary
+    if math.isnan(distance) or math.isnan(std):  return 1.0
+    if not std > 0:  return 0.0 if distance > 0 else 1.0 if distance < 0 else 0.5
+    return 0.5 * math.erfc(distance / (std * math.sqrt(2)))
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Gaussian mixture fit of the slicer values by EM (expectation-maximization), as an alternative to the fixed-threshold
+# split of PER_Estimator, which biases mean / std of asymmetric levels.
+# - vectorized over (samples x levels); warm-started from the previous fit, so a few iterations per refresh suffice.
+# - init_means (e.g. the histogram peaks) seeds the first fit, or a re-fit after a level has collapsed.
+# - evaluate() has the same result format as PER_Estimator.evaluate().
+#--------------------------------------------------------------------------------------------------------------------------------------
+class EM_GaussianMixture:
+    LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
+
+    def __init__(self, n_levels, max_iter=8, tol=1e-5, min_sigma=0.2):
+        self.n_levels  = n_levels
+        self.max_iter  = max_iter
+        self.tol       = tol                    # on the change of average log-likelihood per sample
+        self.min_sigma = min_sigma
+        self.means     = None
+        self.sigmas    = None
+        self.weights   = None
+        self.log_likelihood = math.nan          # average per sample, of the last fit
+        self.n_samples = 0
+        self.n_iter    = 0                      # iterations done by the last fit
+
+    def reset(self):
+        self.means = self.sigmas = self.weights = None
+
+    def _initialize(self, x, init_means):
+        K = self.n_levels
+        if init_means is not None and len(init_means) == K:
+            self.means = np.array(init_means, dtype=np.float64)
+        else:
+            self.means = np.quantile(x, (np.arange(K) + 0.5) / K)
+        gap = np.diff(np.sort(self.means)).min() if K > 1 else x.std()
+        self.sigmas  = np.full(K, max(gap / 4, self.min_sigma))
+        self.weights = np.full(K, 1.0 / K)
+
+    def fit(self, samples, init_means=None):
+        x = np.ravel(samples).astype(np.float64)
+        self.n_samples = len(x)
+        if self.n_samples == 0:  return self
+        if self.means is None or not np.all(np.isfinite(self.means)) or self.weights.min() < 1e-4:
+            self._initialize(x, init_means)
+
+        xc = x[:, None]
+        prev_ll = -math.inf
+        for self.n_iter in range(1, self.max_iter + 1):
+            # E-step: log of weighted component densities, normalized by log-sum-exp per sample
+            z    = (xc - self.means) / self.sigmas
+            logp = np.log(self.weights) - np.log(self.sigmas) - self.LOG_SQRT_2PI - 0.5 * z * z
+            mx   = logp.max(axis=1, keepdims=True)
+            lse  = mx + np.log(np.exp(logp - mx).sum(axis=1, keepdims=True))
+            resp = np.exp(logp - lse)
+            ll   = lse.mean()
+
+            # M-step
+            Nk = resp.sum(axis=0) + 1e-12
+            self.weights = Nk / self.n_samples
+            self.means   = (resp * xc).sum(axis=0) / Nk
+            self.sigmas  = np.maximum(np.sqrt((resp * (xc - self.means) ** 2).sum(axis=0) / Nk), self.min_sigma)
+
+            if abs(ll - prev_ll) < self.tol:  break
+            prev_ll = ll
+
+        order = np.argsort(self.means)
+        self.means, self.sigmas, self.weights = self.means[order], self.sigmas[order], self.weights[order]
+        self.log_likelihood = float(ll)
+        return self
+
+    def level_stats(self):
+        if self.means is None:  return []
+        return [{'mean': float(m), 'std': float(s), 'weight': float(w), 'count': int(round(w * self.n_samples))}
+                for m, s, w in zip(self.means, self.sigmas, self.weights)]
+
+    def evaluate(self):
+        st = self.level_stats()
+        return (st, *crossover_errors(st))
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Per-link slicer analysis pipeline, the same for the live data sources and the offline re-analysis of slicer files:
+# - add_slices(): the streaming histogram of the newly arrived slices, its peaks / valleys / EYE opening, and the newly arrived slices
+#                 into PER_Estimator, split into levels by the peaks of the updated histogram
+# - evaluate_PER(): per-level statistics and crossover errors, by PER_Estimator ('threshold') or EM_GaussianMixture ('em')
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Slicer_Analyzer:
+    def __init__(self, n_bins, n_levels, window, hist_mode="cumulative", kernel=np.ones(1), min_distance=1, per_method="threshold"):
+        self.n_levels     = n_levels
+        self.bin_width    = 100 / n_bins        # histogram bin in value units (0 ~ 100)
+        self.kernel       = kernel
+        self.min_distance = min_distance
+        self.per_method   = per_method
+        self.hist         = Streaming_Histogram(n_bins, (0, 100), hist_mode)
+        self.PER_engine   = PER_Estimator(n_levels, window)      # per-level statistics over the last window slices
+        self.PER_EM       = EM_GaussianMixture(n_levels)         # PER_METHOD 'em': fitted on the slices given to evaluate_PER()
+        self.pv           = None                # (PeaksValleys, row) of the last peaks detection, resolved or not
+        self.peaks        = []                  # of the last resolved detection: bin indices
+        self.valleys      = []
+        self.eye_open     = 0
+
+    def add_slices(self, slices, per=True):
+        # slices: (n, SLICE_SIZE) newly arrived;  per: also into PER_engine (PER_METHOD 'threshold')
+        self.hist.update(slices)
+        self.find_peaks_and_valleys()
+        if per and self.per_method != "em":
+            thresholds = self.level_thresholds()
+            if thresholds is not None:
+                for slicer in slices:  self.PER_engine.update(slicer, thresholds)
+
+    def find_peaks_and_valleys(self):
+        pv = batch_find_peaks_and_valleys(self.hist.counts, self.n_levels, self.min_distance, self.kernel)
+        return self.apply_peaks_and_valleys(pv, 0)
+
+    def apply_peaks_and_valleys(self, pv, i):
+        # pv: PeaksValleys of one or a batch of links, i: row of this link; returns False if not resolved (the last peaks are kept)
+        self.pv = (pv, i)
+        if not pv.valid[i]:
+            return False
+        self.peaks    = list(pv.peaks[i])
+        self.valleys  = list(pv.valleys[i])
+        self.eye_open = pv.eye_open[i]
+        return True
+
+    def level_thresholds(self):
+        # Split the slicer values into levels: PAM4 by (valey0, 50, valey2),  NRZ by (50);  None if no peaks, or peaks too NARROW
+        P = self.peaks
+        if len(P) != self.n_levels or min(np.diff(P)) <= 5:
+            return None
+        if self.n_levels == 4:
+            return [self.bin_width * (P[0] + P[1]) / 2, 50, self.bin_width * (P[2] + P[3]) / 2]
+        return [50]
+
+    def evaluate_PER(self, slices=None):
+        # slices: the slices fitted by 'em', Ex. the ring buffer;  returns (level_stats, boundaries, errors, per), None if no data yet
+        if self.per_method == "em":
+            if slices is None or len(slices) == 0:  return None
+            init_means = [self.bin_width * p for p in self.peaks] if len(self.peaks) == self.n_levels else None
+            engine = self.PER_EM.fit(slices, init_means)
+        else:
+            if self.PER_engine.n_slices == 0:  return None
+            engine = self.PER_engine
+        stats, boundaries, errors = engine.evaluate()
+        return stats, boundaries, errors, sum(up + down for up, down in errors)
@@ -0,0 +1,134 @@
+#======================================================================================================================================
+# YK-Scan slicer archive (*.yks): binary file of float32 slicer frames, readable by np.memmap without loading everything
+#======================================================================================================================================
+#   offset 0:            b"YKSARC01"                          magic + format version
+#   offset 8:            JSON metadata, utf-8, space padded to ARCHIVE_HEADER_SIZE bytes:
+#                        TID, FPGA_HWID, DATA_RATE, DPATTERN, LINK, START_TIME, END_TIME, SLICE_SIZE, N_FRAMES, DTYPE
+#   offset 4096:         float32 little-endian frames, (N_FRAMES, SLICE_SIZE), appended in arrival order
+# N_FRAMES / END_TIME are rewritten on close(); after a crash, the reader derives the frame count from the file size instead.
+#
+# YK-Scan capture log (*.ykc): the same header with magic b"YKSCAP01", followed by records of CAPTURE_DTYPE(SLICE_SIZE):
+#   t (float64, time.monotonic() at arrival), snr (float32), cs_start / cs_stop (float64, epoch seconds of the cs_server
+#   YK-scan start / stop time, NaN if unknown), slicer (float32 x SLICE_SIZE).  Header T0_MONO / T0_TIME map t to wall time.
+#--------------------------------------------------------------------------------------------------------------------------------------
+import datetime, json, os
+import numpy as np
+
+ARCHIVE_MAGIC       = b"YKSARC01"
+ARCHIVE_HEADER_SIZE = 4096
+ARCHIVE_DTYPE       = np.dtype("<f4")
+CAPTURE_MAGIC       = b"YKSCAP01"
+
+def CAPTURE_DTYPE(slice_size):
+    return np.dtype([("t", "<f8"), ("snr", "<f4"), ("cs_start", "<f8"), ("cs_stop", "<f8"), ("slicer", "<f4", (slice_size,))])
+
+def _encode_header(meta, magic=ARCHIVE_MAGIC):
+    text = json.dumps(meta).encode("utf-8")
+    if len(magic) + len(text) > ARCHIVE_HEADER_SIZE:
+        raise ValueError(f"slicer archive metadata too long: {len(text)} bytes")
+    return (magic + text).ljust(ARCHIVE_HEADER_SIZE, b" ")
+
+def read_archive_header(f, magic=ARCHIVE_MAGIC):
+    head = f.read(ARCHIVE_HEADER_SIZE)
+    if head[:len(magic)] != magic:
+        raise ValueError(f"not a YK slicer archive ({magic.decode()}): {getattr(f, 'name', f)}")
+    return json.loads(head[len(magic):].decode("utf-8"))
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Slicer_Archive_Writer:
+    MAGIC = ARCHIVE_MAGIC
+
+    def __init__(self, path, slice_size, **meta):
+        # meta: TID, FPGA_HWID, DATA_RATE, DPATTERN, LINK, ... any JSON-able values
+        self.path = path
+        self.meta = dict(meta, SLICE_SIZE=slice_size, N_FRAMES=0, DTYPE=ARCHIVE_DTYPE.str,
+                               START_TIME=datetime.datetime.now().isoformat(timespec="seconds"), END_TIME="")
+        self.file = open(path, "wb")
+        self.file.write(_encode_header(self.meta, self.MAGIC))
+        self.bytes_written = 0
+
+    def append(self, frames):
+        # frames: one frame (SLICE_SIZE,) or a batch (n, SLICE_SIZE)
+        frames = np.asarray(frames, dtype=ARCHIVE_DTYPE).reshape(-1, self.meta["SLICE_SIZE"])
+        self._write(frames)
+
+    def _write(self, records):
+        data = records.tobytes()
+        self.file.write(data)
+        self.meta["N_FRAMES"] += len(records)
+        self.bytes_written    += len(data)
+
+    def flush(self, do_fsync=False):
+        self.file.flush()
+        if do_fsync:  os.fsync(self.file.fileno())
+
+    def close(self):
+        self.meta["END_TIME"] = datetime.datetime.now().isoformat(timespec="seconds")
+        self.file.seek(0)
+        self.file.write(_encode_header(self.meta, self.MAGIC))
+        self.flush(True)
+        self.file.close()
+
+
+class Capture_Log_Writer(Slicer_Archive_Writer):
+    MAGIC = CAPTURE_MAGIC
+
+    def __init__(self, path, slice_size, **meta):
+        super().__init__(path, slice_size, **meta)
+        self.dtype = CAPTURE_DTYPE(slice_size)
+
+    def append(self, samples):
+        # samples: list of YKSample, like module.YK_dataflow.YKSample
+        records = np.zeros(len(samples), dtype=self.dtype)
+        for r, s in zip(records, samples):
+            r["t"], r["snr"], r["cs_start"], r["cs_stop"], r["slicer"] = s.timestamp, s.snr, s.cs_start, s.cs_stop, s.slicer
+        self._write(records)
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+def _memmap_records(path, magic, dtype_of):
+    with open(path, "rb") as f:
+        meta = read_archive_header(f, magic)
+    dtype = dtype_of(meta["SLICE_SIZE"])
+    n_frames = (os.path.getsize(path) - ARCHIVE_HEADER_SIZE) // dtype.itemsize      # a partial frame after a crash is ignored
+    meta["N_FRAMES"] = n_frames
+    if n_frames == 0:
+        return meta, np.zeros(0, dtype=dtype)
+    return meta, np.memmap(path, dtype=dtype, mode="r", offset=ARCHIVE_HEADER_SIZE, shape=(n_frames,))
+
+def open_slicer_archive(path):
+    # returns (meta, frames): frames is a read-only np.memmap of (n_frames, SLICE_SIZE), nothing is loaded until indexed
+    meta, frames = _memmap_records(path, ARCHIVE_MAGIC, lambda size: np.dtype((ARCHIVE_DTYPE, (size,))))
+    return meta, frames.reshape(-1, meta["SLICE_SIZE"])
+
+def open_capture_log(path):
+    # returns (meta, records): records is a read-only np.memmap of CAPTURE_DTYPE, Ex. records["slicer"], records["snr"]
+    return _memmap_records(path, CAPTURE_MAGIC, CAPTURE_DTYPE)
+
+def load_slicer_file(path):
+    # flat array of slicer samples, from a *.yks archive, a *.ykc capture log, or a legacy np.savetxt *.txt file
+    with open(path, "rb") as f:
+        magic = f.read(len(ARCHIVE_MAGIC))
+    if magic == ARCHIVE_MAGIC:  return open_slicer_archive(path)[1].reshape(-1)
+    if magic == CAPTURE_MAGIC:  return open_capture_log(path)[1]["slicer"].reshape(-1)
+    return np.loadtxt(path)
+
+def load_slicer_frames(path, txt_slice_size):
+    # (n_frames, SLICE_SIZE): a *.yks / *.ykc by the SLICE_SIZE of its header; a legacy *.txt (no header) by txt_slice_size,
+    # a partial frame at its end dropped
+    with open(path, "rb") as f:
+        magic = f.read(len(ARCHIVE_MAGIC))
+    if magic == ARCHIVE_MAGIC:  return open_slicer_archive(path)[1]
+    if magic == CAPTURE_MAGIC:  return open_capture_log(path)[1]["slicer"]
+    data = np.loadtxt(path, dtype=np.float32).reshape(-1)
+    return data[:data.size - data.size % txt_slice_size].reshape(-1, txt_slice_size)
+
+def convert_slicer_txt(txt_path, yks_path, slice_size, **meta):
+    data = np.loadtxt(txt_path)
+    if data.size % slice_size != 0:
+        raise ValueError(f"{txt_path}: {data.size} samples is not a multiple of slice size {slice_size}")
+    archive = Slicer_Archive_Writer(yks_path, slice_size, **meta)
+    archive.append(data.reshape(-1, slice_size))
+    archive.close()
+    return archive.meta
@@ -0,0 +1,215 @@
+#======================================================================================================================================
+# YK-Scan data flow containers: pure numpy, no Qt / matplotlib dependency
+#======================================================================================================================================
+from dataclasses import dataclass
+import math
+import numpy as np
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Fixed-capacity ring buffer of YK-Scan slicer frames, (capacity, slice_size), allocated once at construction.
+#   - push():        copy one new slicer frame into the row at the write index, O(slice_size), never reallocates
+#   - filled():      zero-copy view of all valid rows, in storage order (for order-insensitive statistics)
+#   - ordered():     all valid rows, oldest -> newest
+#   - newest(n):     the most recent n rows, oldest -> newest
+#   - copy_newest(out): the most recent len(out) rows, oldest -> newest, copied into the caller's own array
+# ordered() / newest() return a view of the storage when the rows are contiguous; otherwise the rows are gathered into a
+# preallocated scratch array, whose content is only valid until the next ordered() / newest() call.  Both views are overwritten by
+# the next push(): what is kept beyond it, or read by another thread (Ex. the eye plot of the GUI), takes copy_newest().
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Slicer_RingBuffer:
+    def __init__(self, capacity, slice_size, dtype=np.float32):
+        assert capacity > 0 and slice_size > 0
+        self.capacity   = capacity
+        self.slice_size = slice_size
+        self.buf        = np.zeros((capacity, slice_size), dtype=dtype)
+        self._scratch   = np.zeros((capacity, slice_size), dtype=dtype)
+        self.head       = 0     # write index: row to be written by the next push()
+        self.count      = 0     # fill count:  number of valid rows, up to capacity
+        self.total      = 0     # total frames pushed since construction / clear()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.head  = 0
+        self.count = 0
+        self.total = 0
+
+    def push(self, slicer):
+        self.buf[self.head] = slicer        # raises ValueError on size mismatch, before any index is moved
+        self.head   = (self.head + 1) % self.capacity
+        self.count  = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    def latest(self):
+        # the most recently pushed frame, as a view; None if empty
+        if self.count == 0:  return None
+        return self.buf[(self.head - 1) % self.capacity]
+
+    def filled(self):
+        return self.buf[:self.count]        # while not wrapped, valid rows are [0:count]; once wrapped, all rows are valid
+
+    def newest(self, n):
+        n = min(max(n, 0), self.count)
+        start = (self.head - n) % self.capacity
+        if start + n <= self.capacity:
+            return self.buf[start:start + n]
+
+        # wrapped around: gather [start:capacity] + [0:head] into the scratch buffer
+        k = self.capacity - start
+        self._scratch[:k]  = self.buf[start:]
+        self._scratch[k:n] = self.buf[:n - k]
+        return self._scratch[:n]
+
+    def ordered(self):
+        return self.newest(self.count)
+
+    def copy_newest(self, out):
+        # returns out[:n], n = min(len(out), count)
+        n = min(len(out), self.count)
+        start = (self.head - n) % self.capacity
+        k = min(n, self.capacity - start)
+        np.copyto(out[:k], self.buf[start:start + k])
+        np.copyto(out[k:n], self.buf[:n - k])
+        return out[:n]
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# One YK-Scan sample, handed over from the chipscopy TCF event thread to the DataSource worker thread
+#--------------------------------------------------------------------------------------------------------------------------------------
+@dataclass
+class YKSample:
+    slicer:    np.ndarray       # float32 slicer frame, owned by the sample (not shared with chipscopy's YKScan.scan_data)
+    snr:       float
+    timestamp: float            # time.monotonic() at arrival in the callback
+    cs_start:  float = math.nan # cs_server YK-scan start / stop time, epoch seconds (chipscopy YKScan.start_time / stop_time)
+    cs_stop:   float = math.nan
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Bounded single-producer / single-consumer queue, without locks.
+#   - producer (acquisition loop thread) only writes self._tail, the consumer (FSM step) only writes self._head;
+#     each index is a plain int rebinding, which is atomic under the GIL, and a slot is written before _tail publishes it.
+#   - when full, put() drops the new sample and counts it in self.drops: the producer never blocks, nor touches _head.
+#   - self.high_water is the maximal queue depth ever seen by the producer.
+#--------------------------------------------------------------------------------------------------------------------------------------
+class SPSC_SampleQueue:
+    def __init__(self, capacity):
+        assert capacity > 0
+        self.capacity   = capacity
+        self._slots     = [None] * capacity
+        self._head      = 0     # count of items consumed, written by consumer only
+        self._tail      = 0     # count of items produced, written by producer only
+        self.drops      = 0     # written by producer only
+        self.high_water = 0     # written by producer only
+
+    def __len__(self):
+        return self._tail - self._head
+
+    @property
+    def accepted(self):
+        return self._tail       # count of items ever put, not dropped
+
+    #---- producer side ----------------------------------------------------------
+    def put(self, item):
+        tail  = self._tail
+        depth = tail - self._head
+        if depth >= self.capacity:
+            self.drops += 1
+            return False
+        self._slots[tail % self.capacity] = item
+        self._tail = tail + 1                                   # publish the slot to the consumer
+        if depth + 1 > self.high_water:
+            self.high_water = depth + 1
+        return True
+
+    #---- consumer side ----------------------------------------------------------
+    def get(self):
+        head = self._head
+        if head == self._tail:
+            return None
+        i = head % self.capacity
+        item = self._slots[i]
+        self._slots[i] = None                                   # release the reference before the slot is given back
+        self._head = head + 1
+        return item
+
+    def drain(self, max_items=None):
+        # consume what is available at the time of calling, oldest first
+        n = self._tail - self._head
+        if max_items is not None:  n = min(n, max_items)
+        return [self.get() for _ in range(n)]
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Bounded time-series of one metric (SNR, log10 BER, ...) of a link: float64 values with uint32 timestamps in msec since t0.
+#   - storage is preallocated for capacity points; when full, the stored points are compacted to half by min-max buckets
+#     of 4 points, so the memory is bounded for any run length, while spikes / dips survive the downsampling.
+#   - display(n): at most ~n points for plotting, by min-max buckets again, i.e. O(display points) per refresh.
+#   - running count / mean / variance (Welford) / min / max of all appended values, independent of the compaction.
+#--------------------------------------------------------------------------------------------------------------------------------------
+class TimeSeries_Store:
+    def __init__(self, capacity=4096, t0=0.0):
+        assert capacity >= 8 and capacity % 4 == 0
+        self.capacity = capacity
+        self.t0       = t0                                      # reference time, like time.monotonic() at app start
+        self.values   = np.zeros(capacity, dtype=np.float64)
+        self.t_msec   = np.zeros(capacity, dtype=np.uint32)
+        self.size     = 0                                       # stored points
+        self.n        = 0                                       # all appended values
+        self.mean     = 0.0
+        self._M2      = 0.0
+        self.min      = np.inf
+        self.max      = -np.inf
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def variance(self):
+        return self._M2 / self.n  if self.n > 0 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    def append(self, value, t):
+        if self.size == self.capacity:
+            self._compact()
+        self.values[self.size] = value
+        self.t_msec[self.size] = int((t - self.t0) * 1000)
+        self.size += 1
+
+        # Welford's running mean / variance
+        self.n   += 1
+        delta     = value - self.mean
+        self.mean += delta / self.n
+        self._M2 += delta * (value - self.mean)
+        if value < self.min:  self.min = value
+        if value > self.max:  self.max = value
+
+    @staticmethod
+    def _minmax_index(values, bucket):
+        # indices of (min, max) per bucket of the leading full buckets, in time order
+        m    = len(values) // bucket
+        v    = values[:m * bucket].reshape(m, bucket)
+        base = np.arange(m)[:, None] * bucket
+        lo   = v.argmin(axis=1)[:, None] + base
+        hi   = v.argmax(axis=1)[:, None] + base
+        return np.sort(np.hstack((lo, hi)), axis=1).ravel()
+
+    def _compact(self):
+        idx  = self._minmax_index(self.values[:self.size], 4)
+        keep = len(idx)
+        self.values[:keep] = self.values[idx]
+        self.t_msec[:keep] = self.t_msec[idx]
+        self.size = keep
+
+    def display(self, n_points=512):
+        # returns (t in seconds, values), at most about n_points
+        if self.size <= n_points:
+            return self.t_msec[:self.size] / 1000.0, self.values[:self.size]
+        bucket = -(-self.size // (n_points // 2))
+        idx = self._minmax_index(self.values[:self.size], bucket)
+        idx = np.concatenate((idx, np.arange(len(idx) // 2 * bucket, self.size)))     # the tail of a partial bucket, as is
+        return self.t_msec[idx] / 1000.0, self.values[idx]
@@ -0,0 +1,820 @@
+#======================================================================================================================================
+# YK-Scan link data sources: configuration, and the iBERT / simulation / replay data source classes, with no PyQt5 / matplotlib,
+# shared by the GUI (IBERT_HPC_Cable_testing.py) and the headless runner (IBERT_HPC_Cable_headless.py)
+#======================================================================================================================================
+from module.common      import *
+from module.iBert_ScoPy import *
+from module.YK_dataflow import Slicer_RingBuffer, YKSample, SPSC_SampleQueue, TimeSeries_Store
+from module.YK_storage  import LinkSample_Recorder, Result_StreamWriter, YK_Capture_Thread
+from module.YK_acquisition import Acquisition_Loop
+from module.YK_scheduler   import YK_FlowScheduler, FAIRNESS_POLICIES
+from module.YK_metrics     import Link_Metrics, merged_report, format_report
+from module.YK_archive  import open_slicer_archive, open_capture_log
+from module.YK_analysis import Slicer_Analyzer, make_smoothing_kernel, batch_find_peaks_and_valleys
+
+#------------------------------------------
+import numpy as np
+import pandas as pd
+import math, re
+import os, time, glob
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Configuration variables: 1) external EXPORT Environment variables, 2) command-line arguments (higher priority)
+#--------------------------------------------------------------------------------------------------------------------------------------
+ENV_HELP="""
+EXPORT Environment variables:
+----->
+export SERVER_IP="10.20.2.8";         export FPGA_CS_PORT="3042";              export FPGA_HW_PORT="3121";
+export FPGA_HWID="112A";              export CONN_TYPE=XConn_x8;               export DPATTERN="PRBS 9";
+export MAX_SLICES=20;                 export YKSCAN_SLICER_SIZE=200;           export HIST_BINS=40;
+export YKSAMPLE_QUEUE=32;               export TIMESERIES_SIZE=4096;             export DISPLAY_POINTS=512;
+export CSV_PATH="YK_CSV_Files";       SLICER_PATH="YK_SlicerData_Files";       export CONFIG_FILE="config.ini";
+export FLOWCTRL_MODE="object";        export RESULT_FLUSH_SEC=2;               export RESULT_FSYNC_SEC=30;              export SLICER_SNAPSHOT_SEC=60;
+export CAPTURE_QUEUE=256;             export CAPTURE_CHUNK=64;                 export ACQ_WORKERS=4;                    export BRINGUP_TIMEOUT=10;
+export METRICS_SEC=60;                export TABLE_REFRESH_MS=250;
+export PROGRAM_CACHE="program_cache.json";
+export PDI_FILE="PDI_Files/VPK120_iBERT_2xQDD_53G.pdi";
+### Example Simulation: python IBERT_HPC_Cable_testing.py --SIMULATE --RESOLUTION 1920x990 --TESTID Bernard_TestID --CONN_TYPE SLoop_x4 ###
+### Example Replay:     python IBERT_HPC_Cable_testing.py --REPLAY misc/YK_CSV_Files/TID_B2.sn111_B1.sn112.2024-0708 --PDI_FILE X/VPK120_iBERT_2xQDD_106G.pdi --FPGA_HWID 111A --REPLAY_SPEED 10 ###
+### Example 2 boards:   python IBERT_HPC_Cable_testing.py --FPGA_HWID 111A,112A --CONN_TYPE XConn_x8 --TESTID B5.sn111_B1.sn112 --PDI_FILE PDI_Files/VPK120_iBERT_2xQDD_53G.pdi ###
+"""
+APP_TITLE = "ChipScoPy APP for BizLink iBERT HPC-cables testing"
+
+# specify hw and if programming is desired
+CSV_PATH           = os.getenv("CSV_PATH", "YK_CSV_Files")
+SLICER_PATH        = os.getenv("SLICER_PATH", "YK_SlicerData_Files")
+CONFIG_FILE        = os.getenv("CONFIG_FILE", 'config.iBert_HPCTest.ini')
+
+MAX_SLICES         = int(os.getenv("MAX_SLICES",         "12"))
+HIST_BINS          = int(os.getenv("HIST_BINS",          "100"))
+YKSCAN_SLICER_SIZE = int(os.getenv("YKSCAN_SLICER_SIZE", "2000"))           # for simulation purpose, we may choose smaller value
+YKSAMPLE_QUEUE     = int(os.getenv("YKSAMPLE_QUEUE",     "32"))             # capacity of YKSample hand-over queue, from TCF call-back to FSM step
+TIMESERIES_SIZE    = int(os.getenv("TIMESERIES_SIZE",    "4096"))           # points kept per SNR / BER time-series, compacted by min-max when full
+DISPLAY_POINTS     = int(os.getenv("DISPLAY_POINTS",     "512"))            # points plotted per SNR / BER time-series
+RESULT_FLUSH_SEC   = float(os.getenv("RESULT_FLUSH_SEC",  "2"))              # result files: batched writes every N seconds, by the writer thread
+RESULT_FSYNC_SEC   = float(os.getenv("RESULT_FSYNC_SEC",  "30"))             # result files: fsync every N seconds
+SLICER_SNAPSHOT_SEC= float(os.getenv("SLICER_SNAPSHOT_SEC", "60"))           # slicer data file (txt format): replaced by a snapshot of the ring buffer every N seconds
+CAPTURE_QUEUE      = int(os.getenv("CAPTURE_QUEUE",      "256"))            # YK_CAPTURE: frames buffered per link before dropping, i.e. the memory bound
+CAPTURE_CHUNK      = int(os.getenv("CAPTURE_CHUNK",      "64"))             # YK_CAPTURE: frames per write() of the capture I/O thread
+ACQ_WORKERS        = int(os.getenv("ACQ_WORKERS",        "4"))              # Acquisition_Loop: threads for the blocking FSM steps / YK.start() / YK.stop() of all links
+METRICS_SEC        = float(os.getenv("METRICS_SEC",      "60"))             # latency / frames-per-sec report of all links every N seconds, 0: only at the end
+TABLE_REFRESH_MS   = int(os.getenv("TABLE_REFRESH_MS",   "250"))            # GUI: the link table repainted every N msec, for the rows updated meanwhile
+VIVADO_SLICES      = 4    # Vivado always shows 8000 samples
+human_bin          = 100 / HIST_BINS                                        # show to human always in 0 ~ 100 range
+HILL_MIN_WIDTH     = int(4.1 / human_bin)                                   # The hill peak should have sufficient width, i.e. minimal distance of peaks
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+def prepare_system_config(dbg_SrcName):
+    global global_grid_rows, global_grid_cols, global_N_links
+
+    parser = init_argParser(APP_TITLE, ENV_HELP, CONFIG_FILE)
+    parser.add_argument('--FORCE_PROGRAM', action='store_true', help='Program PDI_FILE even if the programming cache says the board already runs it. default: False')
+
+    # The get_design_files() function tries to find the PDI and LTX files. In non-standard configurations, you can put the path for PROGRAMMING_FILE and PROBES_FILE below.
+    #    design_files = get_design_files(f"{HW_PLATFORM}/production/chipscopy_ced")
+    #    PDI_FILE = design_files.programming_file
+    DEFAULT_1="Bernard_Simulation/VPK120_iBERT_2xQDD_53G.pdi"
+    DEFAULT_2="HIST1,PER2,LNKST"
+    DEFAULT_3="4 4 2 2 300 2 2 180"
+
+    get_parameter( "PDI_FILE",     DEFAULT_1,   "filename", 'FPGA image file (*.pdi) Ex. PDI_Files/VPK120_iBERT_2xQDD_53G.pdi' )
+    get_parameter( "SERVER_IP",    "localhost", "ip",       'FPGA-board IP address. Default: localhost' )
+    get_parameter( "FPGA_CS_PORT", "3042",      "port",     'FPGA-board cs_server port. Default: 3042' )
+    get_parameter( "FPGA_HW_PORT", "3121",      "port",     'FPGA-board hw_server port. Default: 3121' )
+    get_parameter( "FPGA_HWID",    "0",         "hwID",     'FPGA-board HWID: S/N (0 or 111A or 112A), or boards by one process: "111A,112A" | all (every Versal device). Default: 0 (NOT specified, auto-detection)' )
+    get_parameter( "CONN_TYPE",    "SLoop_x8",  "type",     'Connection Type: SLoop_x4 | SLoop_x8 | XConn_x4 | XConn_x8.  Or shorter: S4 | S8 | X4 | X8.  Default: SLoop_x8' )
+    get_parameter( "TESTID",       "",          "TID",      'Specify the TID-name of testing configuration, Ex. "B5.sn111_B1.sn112", means cable B5 on VPK120-sn111 && cable B1 on sn112. Default: ""' )
+    get_parameter( "DPATTERN",     "PRBS 31",   "pattern",  'Bits data pattern: PRBS 7 / PRBS 9 / ... Default: "PRBS 31"' )
+    get_parameter( "PER_NICE",     "1",         "nice",     'Nicely perform PER (Probility of Error Rate) calculation, with <nice> round per calculation, 0 diable PER, -1 calc PER on close. Default: 1', argType='int' )
+    get_parameter( "PER_METHOD",   "threshold", "method",   'PER levels fitting: threshold (split by histogram valleys) | em (Gaussian mixture by EM, warm-started). Default: threshold' )
+    get_parameter( "COMMENTS",     DEFAULT_2,   "format",   f"Comments Format spec: (HIST1 | HIST2 | PER1 | PER2 | PER3 | PER4 | LNKST). Default: '{DEFAULT_2}'" )
+    get_parameter( "HIST_SMOOTH",  "tri:3",     "kernel",   'Histogram smoothing kernel for peaks detection: none | box:<N> | tri:<N> | gauss:<sigma>. Default: tri:3' )
+    get_parameter( "RESULT_FORMAT","csv",       "format",   'Per-link result file format: csv | parquet (needs pyarrow, readable only after a clean close). Default: csv' )
+    get_parameter( "SLICER_FORMAT","yks",       "format",   'Slicer data file format: yks (binary archive of every YK frame) | txt (np.savetxt snapshot of the last MAX_SLICES frames). Default: yks' )
+    get_parameter( "YK_CAPTURE",   "0",         "0|1",      'Full-fidelity capture of every YK-Scan sample (slicer, SNR, times) into <SLICER_PATH>/TID_*/*.ykc per link. Default: 0', argType='int' )
+    get_parameter( "REPLAY",       "",          "folder",   'Replay recorded results of a TID folder (per-link CSV + slicer files of the PDI_FILE data rate), instead of hardware. Default: ""' )
+    get_parameter( "REPLAY_SPEED", "1",         "speed",    'Replay speed: 1 real-time, N accelerated by N times, 0 as fast as possible (one CSV row per FSM poll). Default: 1' )
+    get_parameter( "YK_CONCURRENCY","2",        "count",    'Global flow control: maximal YK engines running at the same time, adapted down on frame drops / queue backlog. Default: 2', argType='int' )
+    get_parameter( "YK_FAIRNESS",  "fresh",     "policy",   'Global flow control: which waiting YK engine runs next: fresh (staleness x arrival rate) | stale (stalest first) | round (round-robin). Default: fresh' )
+    get_parameter( "YK_QUANTUM",   "1.0",       "sec",      'Global flow control: minimal running time of a started YK engine, before yielding to waiting links. Default: 1.0' )
+    get_parameter( "LINK_POLL",    "batched",   "mode",     'Link polling of RX properties: batched (one cs_server round-trip per link poll) | single (one per property). Default: batched' )
+    get_parameter( "HIST_MODE",    "cumulative","mode",     'Histogram accumulation: cumulative | window:<N slices> | decay:<factor per slice>, Ex. "window:48", "decay:0.98". Default: cumulative' )
+    # headless runner only: test duration, and pass/fail thresholds per link (0: not checked)
+    get_parameter( "TEST_SEC",     "600",       "sec",      'Headless: test duration in seconds. Default: 600', argType='int' )
+    get_parameter( "PASS_BER",     "2.4e-4",    "ber",      'Headless: maximal BER of a link to pass. Default: 2.4e-4' )
+    get_parameter( "PASS_SNR",     "0",         "snr",      'Headless: minimal average SNR of a link to pass. Default: 0' )
+    get_parameter( "PASS_EYE",     "0",         "eye",      'Headless: minimal EYE opening (0 ~ 100 slicer scale) of a link to pass. Default: 0' )
+    get_parameter( "PASS_PER",     "0",         "per",      'Headless: maximal PER of a link to pass. Default: 0' )
+    get_parameter( "SUMMARY_FILE", "",          "filename", 'Headless: also write the JSON summary into this file. Default: "" (stdout only)' )
+
+    #----------------------------------------------------------------------------------------------------------------------------------
+    sysconfig = finish_argParser(dbg_SrcName, DEFAULT_3)
+
+    sysconfig.CS_URL        = f"TCP:{sysconfig.SERVER_IP}:{sysconfig.FPGA_CS_PORT}"
+    sysconfig.HW_URL        = f"TCP:{sysconfig.SERVER_IP}:{sysconfig.FPGA_HW_PORT}"
+    sysconfig.DATA_RATE     = int(re.findall(".*VPK120_iBERT_.*_([0-9]+)G.pdi", sysconfig.PDI_FILE)[0])
+    sysconfig.FLOWCTRL_MODE = os.getenv("FLOWCTRL_MODE", 'global')              # DataSource traffic flow control mode: 'global', 'object'
+    sysconfig.HIST_LEVELS   = 4 if sysconfig.DATA_RATE > 50 else 2              # PAM4 or NRZ
+    sysconfig.HIST_KERNEL   = make_smoothing_kernel(sysconfig.HIST_SMOOTH)
+    sysconfig.REPLAY_SPEED  = float(sysconfig.REPLAY_SPEED)
+    sysconfig.YK_QUANTUM    = float(sysconfig.YK_QUANTUM)
+    if not sysconfig.LINK_POLL in ("batched", "single"):
+        raise ValueError(f"Not valid LINK_POLL: {sysconfig.LINK_POLL}\n")
+    if not sysconfig.YK_FAIRNESS in FAIRNESS_POLICIES:
+        raise ValueError(f"Not valid YK_FAIRNESS: {sysconfig.YK_FAIRNESS}, one of {FAIRNESS_POLICIES}\n")
+    for k in ("PASS_BER", "PASS_SNR", "PASS_EYE", "PASS_PER"):
+        setattr(sysconfig, k, float(getattr(sysconfig, k)))
+    sysconfig.FPGA_HWIDS    = [h.strip() for h in sysconfig.FPGA_HWID.split(",") if h.strip() != ""] or ["0"]
+    if sysconfig.REPLAY != "" and len(sysconfig.FPGA_HWIDS) > 1:
+        raise ValueError(f"REPLAY of one board only, not FPGA_HWID={sysconfig.FPGA_HWID}\n")
+    sysconfig.REPLAY_LINKS  = find_replay_links(sysconfig) if sysconfig.REPLAY != "" else []
+
+    #----------------------------------------------------------------------------------------------------------------------------------
+    match sysconfig.CONN_TYPE:
+        case "S4" | "SLoop_x4" | "X4" | "XConn_x4": global_N_links = 8;   global_grid_rows = 2;  global_grid_cols = 4;
+        case "S8" | "SLoop_x8" | "X8" | "XConn_x8": global_N_links = 16;  global_grid_rows = 2;  global_grid_cols = 8;
+        case _:   raise ValueError(f"Not valid Connection Type: {sysconfig.CONN_TYPE}\n")
+
+    n_boards = 1 if sysconfig.FPGA_HWIDS == ["all"] else len(sysconfig.FPGA_HWIDS)     # "all": resized when the boards are found
+    calculate_plotFigure_size(global_grid_rows * n_boards, global_grid_cols, global_N_links * n_boards)
+
+    BPrint(f"\n{APP_TITLE} --- {app_start_time}\n", level=DBG_LEVEL_NOTICE)
+    BPrint(f"Server: CS:{sysconfig.CS_URL}  HW:{sysconfig.HW_URL}  FPGA_HW:{sysconfig.FPGA_HWID} \n", level=DBG_LEVEL_NOTICE)
+    BPrint(f"CONFIG: PDI='{sysconfig.PDI_FILE}'  TID={sysconfig.TESTID}  cTyp={sysconfig.CONN_TYPE}  pattern={sysconfig.DPATTERN}  RATE={sysconfig.DATA_RATE}G  " + \
+        f"PER={sysconfig.PER_NICE}/{sysconfig.PER_METHOD}  Comm={sysconfig.COMMENTS}  HIST={sysconfig.HIST_MODE}  OUT={sysconfig.RESULT_FORMAT}/{sysconfig.SLICER_FORMAT}  CAPTURE={sysconfig.YK_CAPTURE}  POLL={sysconfig.LINK_POLL}  YK={sysconfig.FLOWCTRL_MODE}/{sysconfig.YK_CONCURRENCY}/{sysconfig.YK_FAIRNESS}/{sysconfig.YK_QUANTUM}  MAGIC='{sysconfig.FSM_MAGIC}' " + \
+        f"resolution={sysconfig.RESOLUTION} FIG={sysconfig.FIG_SIZE_X}, {sysconfig.FIG_SIZE_Y} ", level=DBG_LEVEL_NOTICE)
+    if sysconfig.REPLAY != "":
+        BPrint(f"REPLAY: {sysconfig.REPLAY}  speed={sysconfig.REPLAY_SPEED}  links={len(sysconfig.REPLAY_LINKS)}", level=DBG_LEVEL_NOTICE)
+    BPrint(f"DEBUG:  lv={sysconfig.DBG_LEVEL}  srcName={sysconfig.DBG_SRCNAME}  lvAdj={sysconfig.DBG_LVADJ}  AsynCnt={sysconfig.DBG_ASYCOUNT}  SynCnt={sysconfig.DBG_SYNCOUNT}  SIM={sysconfig.SIMULATE} \n", level=DBG_LEVEL_NOTICE)
+    BPrint("----------------------------------------------------------------------------------------------------------------------------------------------------------------", level=DBG_LEVEL_NOTICE)
+    return sysconfig
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+def find_replay_links(syscfg):
+    # per-link recorded files of a TID folder: "Sn<HWID>_<RATE>G.YK-Quad_<q>_CH<c>-<hhmm>.csv", the last one if many (like combine_YK_CSV.sh)
+    # slicer file of the same name: *.ykc / *.yks / *.txt, in the same folder or in its SLICER_PATH counterpart
+    folder     = syscfg.REPLAY.rstrip("/")
+    slicer_dir = folder.replace(CSV_PATH, SLICER_PATH)
+    hwid       = "*" if syscfg.FPGA_HWID == "0" else syscfg.FPGA_HWID
+    links = {}
+    for f in sorted(glob.glob(f"{folder}/Sn{hwid}_{syscfg.DATA_RATE}G.YK-Quad_*_CH*-*.csv")):
+        m = re.match(r".*\.YK-(Quad_[0-9]+)_CH([0-9])-[0-9]+\.csv$", f)
+        if m is None:  continue
+        stem   = os.path.basename(f)[:-len(".csv")]
+        slicer = [f"{d}/{stem}.{ext}" for ext in ("ykc", "yks", "txt") for d in (slicer_dir, folder) if os.path.isfile(f"{d}/{stem}.{ext}")]
+        links[(m[1], int(m[2]))] = {"csv": f, "slicer": slicer[0] if len(slicer) > 0 else None}
+    if len(links) == 0:
+        raise ValueError(f"No replay files of {syscfg.DATA_RATE}G (HWID={hwid}) in: {folder}\n")
+    return [(q, c, links[(q, c)]) for q, c in sorted(links)]
+
+if not "sysconfig" in globals():
+    sysconfig = prepare_system_config("YK-Quad_204_CH0")
+
+#======================================================================================================================================
+# Result files writer threads of the run: one for per-link CSV / slicer files, one for the YK_CAPTURE logs
+#======================================================================================================================================
+result_writer = None
+yk_capture    = None
+
+def start_result_writers():
+    global result_writer, yk_capture
+    result_writer = Result_StreamWriter(RESULT_FLUSH_SEC, RESULT_FSYNC_SEC)
+    result_writer.start()
+    if sysconfig.YK_CAPTURE:
+        yk_capture = YK_Capture_Thread(CAPTURE_CHUNK, fsync_interval=RESULT_FSYNC_SEC)
+        yk_capture.start()
+
+def stop_result_writers():
+    if result_writer is not None:  result_writer.stop()
+    if yk_capture    is not None:  yk_capture.stop()
+
+#======================================================================================================================================
+# Acquisition of all links by one event loop: FSM pollers, watchdogs, and the global flow control of YKScan traffic
+#======================================================================================================================================
+acquisition = None
+
+def start_acquisition(dsrcs, on_update=None):
+    # on_update(dsrc): after each FSM step of dsrc, called on the acquisition loop thread
+    global acquisition
+    acquisition = Acquisition_Loop(min(ACQ_WORKERS, max(1, len(dsrcs))))
+    if on_update is not None:  acquisition.subscribe(on_update)
+    for d in dsrcs:
+        acquisition.add_source(d, sysconfig.FSM_MAGIC_A[0] / 10.0)                  # DEFAULT: 4    (0.4 sec)
+    if sysconfig.FLOWCTRL_MODE == 'global':
+        scheduler = YK_FlowScheduler(dsrcs, time.monotonic(), sysconfig.YK_CONCURRENCY, sysconfig.YK_FAIRNESS, sysconfig.YK_QUANTUM)
+        acquisition.set_flow_control(scheduler, sysconfig.FSM_MAGIC_A[5] / 10.0,     # DEFAULT: 2    (0.2 sec) scheduler tick
+                                     refresh_all_peaks_and_valleys,
+                                     sysconfig.FSM_MAGIC_A[7])                       # DEFAULT: 180  (3 min)
+    if METRICS_SEC > 0:
+        acquisition.every(METRICS_SEC, lambda: report_metrics(dsrcs))
+    acquisition.start()
+    return acquisition
+
+def stop_acquisition():
+    # stop all pollers; returns the poll jitter, the YK freshness and the latency / frames-per-sec metrics of each link
+    if acquisition is None:  return {}, {}, {}
+    acquisition.stop()
+    metrics = report_metrics([p.dsrc for p in acquisition.pacers])
+    jitter, fresh = acquisition.jitter_report(), acquisition.freshness_report()
+    for name, j in jitter.items():
+        f = fresh.get(name)
+        BPrint(f"{name}: poll jitter mean={j['mean_ms']:.1f} max={j['max_ms']:.1f} ms  steps={j['steps']}  overruns={j['overruns']}" +
+              ("" if f is None else f"   YK rate={f['rate_fps']:.2f} fps  stale={f['staleness_s']:.1f} s  frames={f['frames']}  drops={f['drops']}  run={f['run_sec']:.0f} s  starts={f['starts']}"), level=DBG_LEVEL_NOTICE)
+    return jitter, fresh, metrics
+
+def report_metrics(dsrcs):
+    # per link and of all links: frames/sec, and latency percentiles per stage (see module.YK_metrics); returns {name: report}
+    now = time.monotonic()
+    reports = {d.dsrcName: d.metrics.report(now) for d in dsrcs}
+    reports["ALL"] = merged_report([d.metrics for d in dsrcs], list(reports.values()))
+    for name, r in reports.items():
+        BPrint(format_report(name, r), level=DBG_LEVEL_NOTICE if name == "ALL" else DBG_LEVEL_INFO)
+    return reports
+
+def refresh_all_peaks_and_valleys(dsrcs):
+    # all links' histogram peaks / valleys / EYE_open in one batched numpy pass
+    if len(dsrcs) == 0:  return
+    pv = batch_find_peaks_and_valleys(np.stack([d.hist_counts for d in dsrcs]), sysconfig.HIST_LEVELS, HILL_MIN_WIDTH, sysconfig.HIST_KERNEL)
+    for i, d in enumerate(dsrcs):
+        d.apply_peaks_and_valleys(pv, i)
+
+#======================================================================================================================================
+# Data source classes: iBERT-Link data, YK-Scan data, radom number simulattion
+#======================================================================================================================================
+def PrtStat(stat, t):   # Helper Function: to give descriptive text for statistics of a PER level
+    match t:
+        case 4: return "({:.1f} / {:.1f} n={})".format(stat['mean'], stat['std'], stat['count'])
+        case 2: return "({:.1f} / {:.1f})".format(stat['mean'], stat['std'])
+        case 1: return "{:.1f}".format(stat['std'])
+
+#----------------------------------------------------------------------------------------------------------------------------
+class Base_YKScanLink_DataSrc(Base_DataSource):
+    def __init__(self, dView, link):
+        super().__init__(dView)
+        self.link = link
+        link.myLink = self
+
+        self.snr  = 0
+        self.ber  = 0
+        self.eye  = 0
+        self.hist = ""
+
+        #------------------------------------------------------------------------------
+        # Initialize circular buffer: preallocated (MAX_SLICES, YKSCAN_SLICER_SIZE), never reallocated afterwards
+        self.YKScan_slicer_ring = Slicer_RingBuffer(MAX_SLICES, YKSCAN_SLICER_SIZE)
+        self.YK_is_started = False
+
+        # hand-over of YK samples: produced by the acquisition loop thread (posted TCF call-backs), consumed into the ring buffer by the FSM steps only
+        self.YKSample_queue = SPSC_SampleQueue(YKSAMPLE_QUEUE)
+        self.yk_capture     = None              # Capture_Stream of YK_Capture_Thread, when YK_CAPTURE is enabled
+        self.metrics        = Link_Metrics(self.dsrcName)
+        self.newest_sample_time = math.nan      # time.monotonic() of the newest committed YK sample, at its arrival
+
+        # slicer viewer buffer: a copy of the newest VIVADO_SLICES slicers of the ring buffer, into its own array; drawn by the GUI thread,
+        # it must not be a view of the ring buffer (or its scratch array), overwritten meanwhile by the next push() / newest() / ordered()
+        self.YKScan_slicer_viewArray   = np.zeros((VIVADO_SLICES, YKSCAN_SLICER_SIZE), dtype=np.float32)
+        self.YKScan_slicer_viewBuffer  = self.YKScan_slicer_ring.copy_newest(self.YKScan_slicer_viewArray)
+
+        # histogram statistics
+        self.YKScan_slicer_histPointer = 0    # YK-Scan samples, TAIL pointer to differentiate the newly arrived data
+        # histogram / peaks / PER pipeline, with PER statistics over the same slices as the ring buffer (PER_METHOD 'em': fitted on the ring buffer)
+        self.analyzer    = Slicer_Analyzer(HIST_BINS, sysconfig.HIST_LEVELS, MAX_SLICES, sysconfig.HIST_MODE, sysconfig.HIST_KERNEL, HILL_MIN_WIDTH, sysconfig.PER_METHOD)
+        self.YKScan_hist = self.analyzer.hist
+        self.hist_counts = self.YKScan_hist.counts      # updated in place by self.YKScan_hist
+        self.hist_bins   = self.YKScan_hist.bins
+        self.per_nice    = sysconfig.PER_NICE
+
+        self.per_val     = 0
+        self.EYE_open    = 0
+        self.peaks_index  = []
+        self.valeys_index = []
+        self.comments    = ""
+        self.per_Qtbl    = ""
+        self.per_Pandas  = ""
+        self.hist_QTbl   = ""
+        self.hist_Pandas = ""
+        self.comments    = ""
+        self.LinkStatus  = ""
+        self.BER_stat    = ""
+        self.SNR_stat    = ""
+
+        self.SNR_series  = TimeSeries_Store(TIMESERIES_SIZE, app_start_mono)
+        self.BER_series  = TimeSeries_Store(TIMESERIES_SIZE, app_start_mono)     # log10(BER)
+
+    # BLog() head of the YK data sources: + ring buffer fill, YK started, queue length / high-water / drops, capture metrics
+    HEAD_FMT = Base_DataSource.HEAD_FMT + "WATER:{:>2}/{:<5} Q:{}/{}/{}{}\t"
+    def head_values(self):
+        q = self.YKSample_queue
+        cap = "" if self.yk_capture is None else " " + self.yk_capture.metrics()
+        return super().head_values() + (self.YKScan_slicer_ring.count, str(self.YK_is_started), len(q), q.high_water, q.drops, cap)
+
+    def roundtrips_per_poll(self):
+        return getattr(self.link, "roundtrips", 0) / max(1, self.SYNC_samples_count)     # cs_server round-trips, by poll_link_data() / check_link_status()
+
+    def blog_link(self, level):
+        self.BLog(level, "LINK STATUS={:<12} BER={:<15} RATE={:<12} BITS={:<18} ERR={}", str(self.status), str(self.ber), str(self.line_rate), str(self.bit_count), self.error_count)
+
+    def sync_update_LinkData(self):            pass    # Abstract method: to update data from ource engine, synchronously by polling
+    def async_update_YKData(self):             pass    # Abstract method: to update data from ource engine, asynchronously by call-back
+    def dsrc_traffic_manager(self, action):    pass    # Abstract method: To do flow control of data traffic management
+
+    ## Consumer of YKSample_queue, by the FSM step: commit newly arrived YK samples into the ring buffer
+    def commit_YKSamples(self):
+        now = time.monotonic()
+        for sample in self.YKSample_queue.drain():
+            self.ASYN_samples_count +=1
+            self.metrics.record("queue", now - sample.timestamp)
+            self.metrics.count("committed")
+            self.newest_sample_time = sample.timestamp
+            self.snr = sample.snr
+            if self.snr > 0:  self.SNR_series.append(self.snr, sample.timestamp)      # sanity check
+            self.YKScan_slicer_ring.push(sample.slicer)             # overwrite oldest slice data, once the ring is full
+            self.record_YKSample(sample)
+
+            latest = self.YKScan_slicer_ring.latest()
+            self.BLog_traceData( "ASYNC", "BUF_FILL:{}/{}   SNR:{:.2f}   DATA:({:.1f}, {:.1f}, {:.1f}, {:.1f})", self.YKScan_slicer_ring.count, MAX_SLICES, self.snr,
+               float(latest[-1]), float(latest[-2]), float(latest[-3]), float(latest[-4]) )
+
+    def record_YKSample(self, sample):        pass    # to archive every YK-Scan frame, by data source with result files
+
+    def fsmFunc_early_plots(self):
+        self.sync_refresh_plotBER()
+        self.commit_YKSamples()
+        if self.ASYN_samples_count > 0:
+            self.sync_refresh_plotYK()
+        self.dataView.update_chartView("redraw", self)
+
+    def sync_refresh_plotBER(self):
+        self.sync_update_LinkData()
+        self.comments = self.hist_QTbl + "  " + self.per_Qtbl 
+        if "LNKST" in sysconfig.COMMENTS:
+            self.comments += "  " + self.LinkStatus
+
+        self.dataView.update_chartView("link_ber", self)
+        self.dataView.update_tableView()
+        self.blog_link(self.dataView.mydbg_INFO if self.SYNC_samples_count < sysconfig.DBG_SYNCOUNT else self.dataView.mydbg_TRACE)
+
+    def sync_refresh_plotYK(self):
+        self.commit_YKSamples()
+        self.async_update_YKData()
+
+        #-----------------------------------------------------------------------------------------------
+        # refresh the matplotlib figures of YK-Scan slicer EYE, by the newest VIVADO_SLICES(=4) slicers
+        # of the ring buffer self.YKScan_slicer_ring[MAX_SLICES(=12)]
+        #-----------------------------------------------------------------------------------------------
+        self.YKScan_slicer_viewBuffer = self.YKScan_slicer_ring.copy_newest(self.YKScan_slicer_viewArray)
+        self.dataView.update_chartView("yk_scan", self)
+
+        #-----------------------------------------------------------------------------------------------
+        # refresh the matplotlib figures of YK-Scan histogram.
+        # - for histogram plot, accumulated new arrived data into older count
+        # - for statistical analysis of normal distribution, new arrived slices are added into the PER_engine of analyzer,
+        #   whose per-level statistics cover the last MAX_SLICES slices, i.e. the same data as YKScan_slicer_ring
+        #-----------------------------------------------------------------------------------------------
+        if  self.ASYN_samples_count == self.YKScan_slicer_histPointer:  return
+        n = self.ASYN_samples_count -  self.YKScan_slicer_histPointer   # amount of slicer data newly arrived
+        self.YKScan_slicer_histPointer = self.ASYN_samples_count
+
+        histBuffer = self.YKScan_slicer_ring.newest(n)                  # the buffer for new data only, at most MAX_SLICES
+        t0 = time.monotonic()
+        self.analyzer.add_slices(histBuffer, per=sysconfig.PER_NICE != 0)   # bin the new slices only, cumulated / windowed / decayed by HIST_MODE
+        self.metrics.record("histogram", time.monotonic() - t0)
+
+        self.dataView.update_chartView("yk_hist", self)
+        self.report_peaks_and_valleys()
+
+        if sysconfig.PER_NICE > 0:
+            self.per_nice += 1
+            if  self.per_nice >= sysconfig.PER_NICE:
+                self.per_nice = 0
+                self.do_statistics_analysis()
+
+        self.BLog_traceData( "ASYNC", "refresh_plotYK:: VIEW({})  HIST({}, {}, {})  BER: {:.2e}  SNR: {:6.2f}  Elapsed:{}",
+                             len(self.YKScan_slicer_viewBuffer), n, len(histBuffer), self.hist_counts.shape, self.ber, self.snr, self.elapsed )
+
+    def fsmFunc_running(self):
+        self.sync_refresh_plotBER()
+        self.sync_refresh_plotYK()
+        self.dataView.update_chartView("redraw", self)
+
+    def apply_peaks_and_valleys(self, pv, i):
+        # pv: PeaksValleys of batch_find_peaks_and_valleys(), i: row index of this link in pv
+        self.analyzer.apply_peaks_and_valleys(pv, i)
+        self.report_peaks_and_valleys()
+
+    def report_peaks_and_valleys(self):
+        pv, i = self.analyzer.pv
+        if not pv.valid[i]:
+            if self.dataView.mydbg_DEBUG <= sysconfig.DBG_LEVEL:
+                self.BLog(self.dataView.mydbg_DEBUG, "Histogram-Peaks not resolved: {}", [int(p*human_bin) for p in pv.peaks[i]])
+            return
+
+        #-----------------------------------------------------------------------------------------------
+        # self.hist: Histogram statistics
+        # self.eye : EYE opening. i.e average of Peaks distance
+        #-----------------------------------------------------------------------------------------------
+        self.peaks_index  = self.analyzer.peaks
+        self.valeys_index = self.analyzer.valleys
+        self.EYE_open     = self.analyzer.eye_open
+
+        peaks  = " / ".join(f"{int(p*human_bin):02}={c:n}" for p, c in zip(pv.peaks[i],   pv.peak_counts[i]))
+        valeys = " / ".join(f"{int(v*human_bin):02}={c:n}" for v, c in zip(pv.valleys[i], pv.valley_counts[i]))
+        self.hist_Pandas = f"PEAK ({peaks})  VALEY ({valeys})"
+
+        if "HIST1" in sysconfig.COMMENTS:
+            self.hist_QTbl = "PEAK ({})  VALEY ({})".format(" / ".join(f"{int(p*human_bin):02}" for p in pv.peaks[i]), " / ".join(f"{int(v*human_bin):02}" for v in pv.valleys[i]))
+        elif "HIST2" in sysconfig.COMMENTS:
+            self.hist_QTbl = self.hist_Pandas
+        else:
+            self.hist_QTbl = ""
+
+        self.BLog(self.dataView.mydbg_TRACE, "Histogram-EYE: {:.3f}  statistic: {}", self.EYE_open, self.hist_Pandas)
+        if self.analyzer.level_thresholds() is None:
+            self.BLog(self.dataView.mydbg_DEBUG, "Report-PER: Peaks too NARROW: {}", self.peaks_index)
+
+    def do_statistics_analysis(self):
+        t0 = time.monotonic()
+        result = self.analyzer.evaluate_PER(self.YKScan_slicer_ring.filled())
+        if result is None:  return
+        self.metrics.record("per", time.monotonic() - t0)
+        stats, boundaries, errors, self.per_val = result
+
+        per_ERRs = " ".join(f"E{k+1}{k+2}={up:.1e} E{k+2}{k+1}={down:.1e}" for k, (up, down) in enumerate(errors))
+        per_LVLs = lambda t: " ".join(f"P{k+1}:{PrtStat(st, t)}" for k, st in enumerate(stats))
+        self.per_Pandas = f"PER: ({per_LVLs(4)} ERR:{per_ERRs})"
+
+        if "PER1" in sysconfig.COMMENTS:
+            self.per_Qtbl = "PER: ({})".format(" / ".join(PrtStat(st, 1) for st in stats))
+        elif "PER2" in sysconfig.COMMENTS:
+            self.per_Qtbl = f"PER: ({per_LVLs(2)})"
+        elif "PER3" in sysconfig.COMMENTS:
+            self.per_Qtbl = f"PER: ({per_LVLs(2)} ERR:{per_ERRs})"
+        elif "PER4" in sysconfig.COMMENTS:
+            self.per_Qtbl = self.per_Pandas
+        else:
+            self.per_Qtbl = ""
+
+        if self.dataView.mydbg_TRACE <= sysconfig.DBG_LEVEL:
+            self.BLog(self.dataView.mydbg_TRACE, "Report-PER: {}   Boundary: {}  EM: {}/{:.3f}", self.per_Pandas, ", ".join(f"{b:.1f}" for b in boundaries),
+                      self.analyzer.PER_EM.n_iter, self.analyzer.PER_EM.log_likelihood)
+
+    def finish_object(self):
+        if sysconfig.PER_NICE < 0:
+            self.do_statistics_analysis()
+            sleep_QAppVitalize(10) 
+
+        super().finish_object()
+
+
+#----------------------------------------------------------------------------------------------------------------------------
+class Fake_YKScanLink_DataSrc(Base_YKScanLink_DataSrc):
+    WATCHDOG_INTERVAL = 5 * 1000
+
+    def __init__(self, dView, link):
+        super().__init__(dView, link)
+        np.random.seed(42)
+        self.peaks_rand_mode   = True
+        self.wdog_i = 0
+
+        #------------------------------------------------------------------------------
+        self.bits_increment = 2 * sysconfig.DATA_RATE * 1.0E9    # incremented by every 2 seconds
+        self.bit_count   = "0"
+        self.bit_count_N = 0
+        self.error_count = 0
+        self.status      = self.link.status
+        self.line_rate   = self.link.status
+        self.comments    = ""
+
+    def fsmFunc_reset(self):
+        self.BLog(self.dataView.mydbg_INFO, "fsmFunc_reset")
+        self.fsmFunc_early_plots()
+        match self.fsm_state:
+            case 4:
+                return True
+            case _:
+                return False
+
+    def fsmFunc_watchdog(self):
+        if self.fsm_state < 10:
+            # RESET state, replenish the data as soon as possible
+            self.sync_update_YKScanData()
+            self.sync_update_YKScanData()
+        else:
+            # Normal state, replenish the data at much slower WATCHDOG_INTERVAL
+            if self.wdog_i % 8 == 0: self.sync_update_YKScanData()
+            self.wdog_i += 1
+
+    def sync_update_YKScanData(self):
+        std_devs = [1.5, 2.0, 2.5, 3.0]
+        if self.peaks_rand_mode:
+            # Each peak will have separate randomness
+            peak_positions = [20, 40, 60, 80]
+            for i in range(4): peak_positions[i] +=  4*(np.random.rand() - 0.5)          #  Adding randomness to PEAK position by +2/-2
+        else:
+            # All 4 peaks will have the same randomness
+            peak_positions = np.array([20, 40, 60, 80]) + 4*(np.random.rand() - 0.5)     #  Adding randomness to PEAK position by +2/-2
+
+        slice_data = []
+        for i in range(len(peak_positions)):
+            peak_pos = peak_positions[i]
+            std_dev = std_devs[i]
+            slice_data.append( np.random.normal(loc=peak_pos, scale=std_dev, size=int(YKSCAN_SLICER_SIZE/4)) )
+        slice_buf = np.column_stack(( slice_data[0], slice_data[1], slice_data[2], slice_data[3] ))
+
+        self.YKSample_queue.put(YKSample(slice_buf.flatten('c').astype(np.float32), self.snr, time.monotonic()))
+        self.metrics.count("arrived")
+
+    def sync_update_LinkData(self):
+        self.__refresh_common_data__()
+        self.bit_count_N += self.bits_increment
+        self.bit_count    = f"{self.bit_count_N:.3e}"
+        self.error_count += np.random.randint(100) + 1             # random int between 0 and 100
+        self.ber          = self.error_count / self.bit_count_N;   #  np.random.random() / 1000000   # BER by random number simulation
+        self.snr          = 18 + np.random.rand() * 4              # random float between 0 and 4
+        self.BER_series.append(math.log10(self.ber), time.monotonic())
+
+
+#----------------------------------------------------------------------------------------------------------------------------
+# Replay of recorded per-link results (CSV + slicer file, see find_replay_links), through the same FSM / plotting / analysis path.
+#   REPLAY_SPEED > 0: the recorded "Elapsed Time" / frame times are replayed against the wall-clock, scaled by REPLAY_SPEED
+#   REPLAY_SPEED = 0: as fast as possible, one CSV row (and its slicer frames) per FSM poll
+# Slicer frames of *.ykc capture logs keep their recorded times; frames of *.yks / *.txt are spread evenly over the CSV time span.
+#----------------------------------------------------------------------------------------------------------------------------
+class Replay_YKScanLink_DataSrc(Base_YKScanLink_DataSrc):
+    WATCHDOG_INTERVAL = 60 * 1000
+
+    def __init__(self, dView, link):
+        super().__init__(dView, link)
+        files = link.replay
+        self.replay_rows = pd.read_csv(files["csv"], index_col=0, dtype={"Bits Count": str}, keep_default_na=False)
+        self.replay_i    = 0            # next CSV row
+        self.replay_j    = 0            # next slicer frame
+        self.replay_t0   = None         # time.monotonic() of the replay start
+        self.replay_done = False
+        elapsed = self.replay_rows["Elapsed Time"].to_numpy(dtype=float)
+        self.replay_row_times = elapsed
+        self.replay_frame_times, self.replay_frames, self.replay_snr = self.load_replay_frames(files["slicer"], elapsed[0], elapsed[-1])
+
+        self.status      = self.link.status
+        self.line_rate   = self.link.status
+        self.bit_count   = "0"
+        self.error_count = 0
+        BPrint(f"{self.dsrcName}:: REPLAY  CSV={files['csv']} ({len(self.replay_rows)} rows)  SLICER={files['slicer']} ({len(self.replay_frames)} frames)", level=self.dataView.mydbg_INFO)
+
+    def load_replay_frames(self, path, t_first, t_last):
+        # returns (frame times in seconds since app start, frames (n, YKSCAN_SLICER_SIZE), snr per frame or None)
+        empty = (np.zeros(0), np.zeros((0, YKSCAN_SLICER_SIZE), dtype=np.float32), None)
+        if path is None:  return empty
+        match os.path.splitext(path)[1]:
+            case ".ykc":
+                meta, rec = open_capture_log(path)
+                times, frames, snr = rec["t"] - meta.get("T0_MONO", rec["t"][0] if len(rec) > 0 else 0), rec["slicer"], rec["snr"]
+            case ".yks":
+                frames, snr = open_slicer_archive(path)[1], None
+                times = np.linspace(t_first, t_last, len(frames))
+            case _:
+                frames, snr = np.loadtxt(path).reshape(-1, YKSCAN_SLICER_SIZE), None
+                times = np.linspace(t_first, t_last, len(frames))
+        if frames.shape[1] != YKSCAN_SLICER_SIZE:
+            BPrint(f"{self.dsrcName}:: REPLAY slicer size {frames.shape[1]} != YKSCAN_SLICER_SIZE {YKSCAN_SLICER_SIZE}, ignored: {path}", level=DBG_LEVEL_ERR)
+            return empty
+        return times, frames, snr
+
+    def fsmFunc_reset(self):
+        self.BLog(self.dataView.mydbg_INFO, "fsmFunc_reset")
+        self.fsmFunc_early_plots()
+        match self.fsm_state:
+            case 4:
+                return True
+            case _:
+                return False
+
+    def replay_clock(self):
+        # the recorded time to be replayed up to, in seconds of "Elapsed Time"
+        if self.replay_t0 is None:  self.replay_t0 = time.monotonic()
+        if sysconfig.REPLAY_SPEED > 0:
+            return self.replay_row_times[0] + (time.monotonic() - self.replay_t0) * sysconfig.REPLAY_SPEED
+        return self.replay_row_times[min(self.replay_i, len(self.replay_row_times) - 1)]
+
+    def replay_YKSamples(self, t_clock):
+        while self.replay_j < len(self.replay_frames) and self.replay_frame_times[self.replay_j] <= t_clock:
+            snr = float(self.replay_snr[self.replay_j]) if self.replay_snr is not None else self.snr
+            if not self.YKSample_queue.put(YKSample(np.array(self.replay_frames[self.replay_j], dtype=np.float32), snr, time.monotonic())):
+                self.commit_YKSamples()         # replay never drops: commit in the same FSM step, then retry
+                continue
+            self.replay_j += 1
+            self.metrics.count("arrived")
+
+    def sync_update_LinkData(self):
+        self.__refresh_common_data__()
+        t_clock = self.replay_clock()
+        while self.replay_i < len(self.replay_rows) and self.replay_row_times[self.replay_i] <= t_clock:
+            row = self.replay_rows.iloc[self.replay_i]
+            self.replay_i   += 1
+            self.elapsed     = int(row["Elapsed Time"])
+            self.status      = row["Status"]
+            self.line_rate   = row["Line Rate"]
+            self.bit_count   = row["Bits Count"]
+            self.error_count = int(row["Errors Count"])
+            self.ber         = float(row["BER"])
+            self.snr         = float(row["SNR"])
+            self.LinkStatus  = row["Link Status"]
+            if self.ber > 0:  self.BER_series.append(math.log10(self.ber), time.monotonic())
+            if sysconfig.REPLAY_SPEED == 0:  break
+        self.replay_YKSamples(t_clock)
+
+        if not self.replay_done and self.replay_i >= len(self.replay_rows) and self.replay_j >= len(self.replay_frames):
+            self.replay_done = True
+            self.BLog(DBG_LEVEL_NOTICE, "REPLAY finished: {} rows, {} frames in {:.1f} sec", self.replay_i, self.replay_j, time.monotonic() - self.replay_t0)
+
+
+# The class correlates to chipscopy.api.ibert.link.Link
+#----------------------------------------------------------------------------------------------------------------------------
+class IBert_YKScanLink_DataSrc(Base_YKScanLink_DataSrc):
+    WATCHDOG_INTERVAL = sysconfig.FSM_MAGIC_A[4] * 1000            # DEFAULT: 300
+
+    def __init__(self, dView, link):
+        super().__init__(dView, link)
+
+        #------------------------------------------------------------------------------
+        self.monitor_YK_cnt = 0
+        self.YK   = create_yk_scans(target_objs=link.rx)[0]                # returns: chipscopy.api.ibert.yk_scan.YKScan object
+        self.YK.updates_callback = lambda obj: self.asynCB_update_YKScanData(obj)
+        BPrint(f"{self.dsrcName}:: TX={link.tx}  RX={link.rx}  LINK={str(link):<8}  YK={self.YK.name:<10}  RX.yk_scan={link.rx.yk_scan}", level=self.dataView.mydbg_INFO)
+
+        #------------------------------------------------------------------------------
+        # Columnar recorder to keep data in memory for running statistics; the result files are streamed by result_writer
+        self.link_records = LinkSample_Recorder()
+        self.open_result_files()
+
+    def open_result_files(self):
+        fname = f"Sn{self.link.board}_{sysconfig.DATA_RATE}G.YK-{self.link.gt_name}_CH{self.link.channel}-{app_start_time.hour:02}{app_start_time.minute:02}"
+        #------------------- CSV file output -----------------------------------------------------
+        path = f"{CSV_PATH}/TID_{sysconfig.TESTID}.{app_start_time.year}-{app_start_time.month:02}{app_start_time.day:02}"
+        os.makedirs(path, exist_ok=True)
+        ext  = "csv" if sysconfig.RESULT_FORMAT == "csv" else "parquet"
+        self.result_table = result_writer.open_table(f"{path}/{fname}.{ext}", fmt=sysconfig.RESULT_FORMAT)
+        #------------------- Slicer data file output ----------------------------------------------
+        path = f"{SLICER_PATH}/TID_{sysconfig.TESTID}.{app_start_time.year}-{app_start_time.month:02}{app_start_time.day:02}"
+        os.makedirs(path, exist_ok=True)
+        if sysconfig.SLICER_FORMAT == "yks":
+            self.slicer_file = result_writer.open_archive(f"{path}/{fname}.yks", YKSCAN_SLICER_SIZE, TID=sysconfig.TESTID, FPGA_HWID=self.link.board,
+                                                          DATA_RATE=sysconfig.DATA_RATE, DPATTERN=sysconfig.DPATTERN, LINK=self.dsrcName)
+        else:
+            self.slicer_file = result_writer.open_snapshot(f"{path}/{fname}.txt")
+        self.slicer_snapshot_time = time.monotonic()
+        #------------------- full-fidelity YK capture log ------------------------------------------
+        if sysconfig.YK_CAPTURE:
+            self.yk_capture = yk_capture.add_link(f"{path}/{fname}.ykc", YKSCAN_SLICER_SIZE, CAPTURE_QUEUE, TID=sysconfig.TESTID, FPGA_HWID=self.link.board,
+                                                  DATA_RATE=sysconfig.DATA_RATE, DPATTERN=sysconfig.DPATTERN, LINK=self.dsrcName,
+                                                  T0_MONO=app_start_mono, T0_TIME=app_start_time.isoformat())
+
+    def record_YKSample(self, sample):
+        if sysconfig.SLICER_FORMAT == "yks":
+            result_writer.write_frame(self.slicer_file, sample.slicer)
+
+    def snapshot_slicer_data(self):
+        if sysconfig.SLICER_FORMAT != "yks":
+            result_writer.write_snapshot(self.slicer_file, self.YKScan_slicer_ring.ordered().flatten())
+        self.slicer_snapshot_time = time.monotonic()
+
+    def fsmFunc_reset(self):
+        self.BLog(self.dataView.mydbg_INFO, "fsmFunc_reset")
+        self.fsmFunc_early_plots()
+        if sysconfig.FLOWCTRL_MODE == 'global':
+            match self.fsm_state:
+                case 9:
+                    return True                         # end of FSM-RESET state
+                case _:
+                    return False
+        else:
+            match self.fsm_state:
+                case 1:
+                    self.__YKEngine_manage__(True, 0)   # launch YK.start(), to start the YKScan engine, after fsmFunc_delay()
+                    return False
+                case self.fsm_state if self.fsm_state == sysconfig.FSM_MAGIC_A[2]:     # DEFAULT: 4
+                    self.__YKEngine_manage__(False, 12) # launch YK.stop(), to stop the YKScan engine, throttle to prevent overflow of the slicer buffer
+                    return False
+                case 9:
+                    return True                         # end of FSM-RESET state
+                case _:
+                    return False
+
+    def fsmFunc_delay(self):
+        if sysconfig.FLOWCTRL_MODE != 'global' and self.fsm_state == 1:
+            return self.link.nID * sysconfig.FSM_MAGIC_A[1]     # DEFAULT: 4  ## interleaving to prevent overwhelming of data traffic from simultaneous YKScan on all Quad/CH
+        return 0
+
+    def fsmFunc_watchdog(self):
+        if sysconfig.FLOWCTRL_MODE == 'global': return
+
+        self.BLog(self.dataView.mydbg_DEBUG, "Watchdog")
+        if self.fsm_state >= 10:  # Normal FSM-state
+            self.__YKEngine_manage__(True, 1)  # relaunch YK.start(), likely it is stopped by throttling of flow control
+
+    def async_update_YKData(self):
+        if sysconfig.FLOWCTRL_MODE == 'global': return      # YK engines are started / stopped by the YK_FlowScheduler only
+
+        self.monitor_YK_cnt += 1
+        if  self.monitor_YK_cnt >= sysconfig.FSM_MAGIC_A[3]:       # DEFAULT: 4
+            self.monitor_YK_cnt = 0
+            self.__YKEngine_manage__(False, 13)     # launch YK.stop(), to stop the YKScan engine
+
+    def dsrc_traffic_manager(self, action):
+        self.__YKEngine_manage__(action, 99)        # launch YK.stop() or start()
+        if action:
+            if not self.YK_is_started:
+                self.YK_is_started = not self.YK_is_started
+                self.BLog(self.dataView.mydbg_INFO, "dsrc_traffic_manager Error Recover: ACTION={}, force STOP\n",  action)
+                self.__YKEngine_manage__(False, 101)    # Force to YK.stop()
+        else:
+            if self.YK_is_started:
+                self.YK_is_started = not self.YK_is_started
+                self.BLog(self.dataView.mydbg_INFO, "dsrc_traffic_manager Error Recover: ACTION={}, force START\n", action)
+                self.__YKEngine_manage__(True, 102)    # Force to YK.start()
+
+    def __YKEngine_manage__(self, to_start_YK, _where_):
+        try:
+            self.BLog(self.dataView.mydbg_DEBUG, "__YKEngine_manage__({:2},  do_YK_Start={})", _where_, to_start_YK)
+            if to_start_YK:
+                if not self.YK_is_started:
+                    self.YK.start()
+                self.YK_is_started = True
+            else:
+                if self.YK_is_started:
+                    self.YK.stop()
+                self.YK_is_started = False
+        except Exception as e:
+            print(f"YKScan-{self.dsrcName} ({_where_:2} {to_start_YK} {self.YK_is_started})  Exception: {str(e)}")
+
+    def asynCB_update_YKScanData(self, obj):
+        # ## 6 - Define YK Scan Update Method
+        # NOTE: called on the chipscopy TCF event dispatcher thread, it only posts the sample to the acquisition loop thread,
+        #       the single producer of YKSample_queue; the FSM step does the buffering / histogram / statistics by commit_YKSamples()
+        #------------------------------------------------------------------------------
+        # assert YKSCAN_SLICER_SIZE == len(obj.scan_data[-1].slicer)
+        t_entry = time.monotonic()
+        sample = obj.scan_data[-1]
+        if YKSCAN_SLICER_SIZE != len(sample.slicer):
+            self.BLog(DBG_LEVEL_ERR, "ERROR slicer: {}", len(sample.slicer))
+            if len(sample.slicer) != 0:
+                obj.scan_data.pop(0)
+            return
+            self.__YKEngine_manage__(False, 110)    # Force to YK.stop()
+
+        #------------------------------------------------------------------------------
+        yk = YKSample(np.asarray(sample.slicer, dtype=np.float32), sample.snr, t_entry,
+                      obj.start_time.timestamp() if obj.start_time else math.nan, obj.stop_time.timestamp() if obj.stop_time else math.nan)
+        if self.acq is not None:  self.acq.post(self.put_YKSample, yk)
+        else:                     self.put_YKSample(yk)
+
+        if len(obj.scan_data) > 2:   # only keep a few samples
+            obj.scan_data.pop(0)
+        self.metrics.count("arrived")
+        self.metrics.record("callback", time.monotonic() - t_entry)
+
+    def put_YKSample(self, yk):
+        self.YKSample_queue.put(yk)
+        if self.yk_capture is not None:
+            self.yk_capture.queue.put(yk)           # never blocks: dropped and counted when the capture I/O thread falls behind
+
+    def sync_update_LinkData(self):
+        self.__refresh_common_data__()
+        data = poll_link_data(self.link)                                                                                      # LINK_POLL: batched / single
+        self.status      = data["status"]
+        self.line_rate   = data["line_rate"]
+        self.bit_count   = data["bit_count"]
+        self.error_count = data["error_count"]
+        self.ber         = data["ber"]                                                                                        # main BER read method (link.ber): works
+        #self.ber1       = self.link.rx.property_for_alias(RX_BER)                                                            # another BER method 1: not working
+        #self.ber2       = list(self.link.rx.property.refresh(self.link.rx.property_for_alias[RX_BER]).values())[0]           # another BER method 2: works, almost the same value as <self.link.ber>
+        self.BER_series.append(math.log10(self.ber), time.monotonic())
+
+        # Append data into the columnar recorder
+        self.LinkStatus = check_link_status(self.link, data)
+        if self.LinkStatus == "":
+            # the Link works normally, then get its statistical data. NOTE to do sanity check
+            ber_stat = self.link_records.stats["BER"]
+            if len(ber_stat)         > 0:  self.BER_stat = "BER ({:.2e} / {:.1e}) rng=[{:.1e} - {:.1e}])".format(ber_stat.mean, ber_stat.std, ber_stat.min, ber_stat.max)
+            if len(self.SNR_series)  > 0:  self.SNR_stat = "SNR ({:4.1f} / {:4.1f})".format(self.SNR_series.mean, self.SNR_series.std)
+            self.LinkStatus = f"{self.BER_stat}  {self.SNR_stat}"
+
+        row = [ self.SYNC_samples_count, self.elapsed, self.status, self.line_rate, self.bit_count, self.error_count, self.ber, self.snr, self.LinkStatus, \
+            self.EYE_open, self.hist_Pandas, self.per_val, self.per_Pandas]
+        self.link_records.append(row)
+        result_writer.write_row(self.result_table, row)
+        if time.monotonic() - self.slicer_snapshot_time >= SLICER_SNAPSHOT_SEC:
+            self.snapshot_slicer_data()
+
+    def finish_object(self):
+        super().finish_object()
+        self.__YKEngine_manage__(False, 11)  # launch YK.stop(), to stop the YKScan engine from running.
+        self.BLog(DBG_LEVEL_NOTICE, "LINK_POLL={}: {:.2f} cs_server round-trips per poll", sysconfig.LINK_POLL, self.roundtrips_per_poll())
+        self.fsm_running = False
+        #------------------- result files: already streamed, only the last slicer snapshot and close --------------------
+        self.snapshot_slicer_data()
+        result_writer.close(self.result_table)
+        result_writer.close(self.slicer_file)
+        if self.yk_capture is not None:
+            self.BLog(self.dataView.mydbg_INFO, "YK capture: {}  {} bytes", self.yk_capture.path, self.yk_capture.bytes_written)
+            yk_capture.close(self.yk_capture)
@@ -0,0 +1,141 @@
+#======================================================================================================================================
+# Cross-run index of the per-link result CSVs: YK_CSV_Files/TID_<TID>.<date>/Sn<board>_<rate>G.YK-Quad_<q>_CH<c>-<hhmm>.csv
+#======================================================================================================================================
+#   catalog:  one row per CSV file (path relative to the indexed folder), from its path:  TID, date, board, cable, rate, quad, channel, hhmm  (+ size, mtime, rows)
+#             cable: by the TID naming "B5.sn111_B3.sn112", i.e. cable B5 on the board sn111A, cable B3 on sn112A
+#   series:   the numeric columns of all files, concatenated in catalog order (file i: rows offsets[i] ~ offsets[i+1])
+# Both are kept in one compact npz cache (INDEX_CACHE in the indexed folder). A file is (re-)ingested only if new, or its size or
+# mtime changed; the ingest of many files is spread over worker processes. Queries are answered from the cache alone.
+#--------------------------------------------------------------------------------------------------------------------------------------
+import glob, os, re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+INDEX_CACHE    = ".YK_index.npz"
+CSV_NAME_RE    = re.compile(r"Sn(\w+?)_([0-9]+)G\.YK-Quad_([0-9]+)_CH([0-9]+)-([0-9]+)\.csv$")
+TID_FOLDER_RE  = re.compile(r"TID_(.*)\.([0-9]{4}-[0-9]{4})$")
+CATALOG_STR    = ("path", "TID", "date", "board", "cable", "hhmm")
+CATALOG_NUM    = {"rate": np.int32, "quad": np.int32, "channel": np.int32, "size": np.int64, "mtime": np.float64, "rows": np.int64}
+SERIES_COLUMNS = {"Samples": "samples", "Elapsed Time": "elapsed", "Bits Count": "bits", "Errors Count": "errors",
+                  "BER": "BER", "SNR": "SNR", "EYE-Opening": "EYE", "PER": "PER"}
+
+def parse_csv_path(path):
+    # returns the catalog entry of a result CSV by its path, None if not named as a per-link result file
+    m = CSV_NAME_RE.match(os.path.basename(path))
+    if m is None:
+        return None
+    t = TID_FOLDER_RE.match(os.path.basename(os.path.dirname(os.path.abspath(path))))
+    tid, date = (t[1], t[2]) if t else ("", "")
+    board = m[1]
+    cable = [c for c, sn in re.findall(r"(B[0-9]+)\.sn([0-9]+)", tid) if board.startswith(sn)]
+    return {"path": path, "TID": tid, "date": date, "board": board, "cable": cable[0] if cable else "",
+            "rate": int(m[2]), "quad": int(m[3]), "channel": int(m[4]), "hhmm": m[5]}
+
+def ingest_csv(path):
+    # worker process: the numeric series of one CSV, {column: float64 array}; unparsable values as NaN
+    df = pd.read_csv(path, usecols=lambda c: c in SERIES_COLUMNS)
+    return {name: pd.to_numeric(df[col], errors="coerce").to_numpy(np.float64) if col in df else np.full(len(df), np.nan)
+            for col, name in SERIES_COLUMNS.items()}
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+class YK_CSV_Index:
+    def __init__(self, root, cache=None):
+        self.root      = root.rstrip("/")
+        self.cache     = cache or os.path.join(self.root, INDEX_CACHE)
+        self.catalog   = pd.DataFrame(columns=CATALOG_STR + tuple(CATALOG_NUM))
+        self.series    = {name: np.zeros(0) for name in SERIES_COLUMNS.values()}
+        self.offsets   = np.zeros(1, np.int64)
+        self.ingested  = 0                      # files parsed by the last refresh(), the others from the cache
+        self.load()
+
+    #---- cache file ----------------------------------------------------------
+    def load(self):
+        if not os.path.isfile(self.cache):
+            return
+        try:
+            with np.load(self.cache) as z:
+                self.catalog = pd.DataFrame({k: z[f"cat_{k}"] for k in CATALOG_STR + tuple(CATALOG_NUM)})
+                self.series  = {name: z[f"ser_{name}"] for name in SERIES_COLUMNS.values()}
+        except (OSError, KeyError, ValueError):
+            return                              # unreadable / older layout: rebuilt by refresh()
+        self.offsets = np.concatenate(([0], np.cumsum(self.catalog["rows"].to_numpy(np.int64))))
+
+    def save(self):
+        arrays = {f"cat_{k}": np.asarray(self.catalog[k], dtype=str) for k in CATALOG_STR}
+        arrays.update({f"cat_{k}": self.catalog[k].to_numpy(dtype) for k, dtype in CATALOG_NUM.items()})
+        arrays.update({f"ser_{name}": a for name, a in self.series.items()})
+        tmp = self.cache + ".tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, self.cache)
+
+    #---- ingest --------------------------------------------------------------
+    def refresh(self, workers=None):
+        # sync the cache with the CSV files on disk; returns True if anything changed
+        files = sorted(glob.glob(f"{self.root}/**/Sn*_*G.YK-Quad_*_CH*-*.csv", recursive=True))
+        known = {p: i for i, p in enumerate(self.catalog["path"])}
+        entries, todo = [], []
+        for path in files:
+            entry = parse_csv_path(path)
+            if entry is None:  continue
+            st = os.stat(path)
+            entry.update(path=os.path.relpath(path, self.root), size=st.st_size, mtime=st.st_mtime)
+            i = known.get(entry["path"])
+            if i is not None and self.catalog["size"].iat[i] == st.st_size and self.catalog["mtime"].iat[i] == st.st_mtime:
+                entry["cached"] = i
+            else:
+                todo.append(len(entries))
+            entries.append(entry)
+
+        self.ingested = len(todo)
+        if len(todo) == 0 and len(entries) == len(self.catalog):
+            return False
+
+        paths = [os.path.join(self.root, entries[j]["path"]) for j in todo]
+        if workers == 1 or len(paths) < 2:
+            parsed = [ingest_csv(p) for p in paths]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                parsed = list(pool.map(ingest_csv, paths, chunksize=8))
+        parsed = dict(zip(todo, parsed))
+
+        columns = {name: [] for name in SERIES_COLUMNS.values()}
+        for j, entry in enumerate(entries):
+            i = entry.pop("cached", None)
+            ser = parsed[j] if i is None else {name: a[self.offsets[i]:self.offsets[i + 1]] for name, a in self.series.items()}
+            entry["rows"] = len(ser["samples"])
+            for name in columns:  columns[name].append(ser[name])
+
+        self.catalog = pd.DataFrame(entries, columns=CATALOG_STR + tuple(CATALOG_NUM))
+        self.series  = {name: np.concatenate(a) if len(a) > 0 else np.zeros(0) for name, a in columns.items()}
+        self.offsets = np.concatenate(([0], np.cumsum(self.catalog["rows"].to_numpy(np.int64))))
+        self.save()
+        return True
+
+    #---- queries -------------------------------------------------------------
+    def select(self, **filters):
+        # filters: TID / date / board / cable / rate / quad / channel = value or a list of values; returns the catalog indices
+        mask = np.ones(len(self.catalog), bool)
+        for k, v in filters.items():
+            if v is None:  continue
+            values = v if isinstance(v, (list, tuple, set)) else [v]
+            values = [int(x) for x in values] if k in CATALOG_NUM else [str(x) for x in values]
+            mask  &= self.catalog[k].isin(values).to_numpy()
+        return np.flatnonzero(mask)
+
+    def final_results(self, latest=False, **filters):
+        # the last row of every selected file: BER / SNR / EYE / PER ..., one row per file (latest: only the last run of a link per TID)
+        idx = self.select(**filters)
+        df  = self.catalog.iloc[idx].drop(columns=["size", "mtime"]).reset_index(drop=True)
+        last = self.offsets[idx + 1] - 1
+        for name, a in self.series.items():
+            df[name] = np.where(self.catalog["rows"].to_numpy()[idx] > 0, a[np.maximum(last, 0)] if len(a) > 0 else np.nan, np.nan)
+        df = df.sort_values(["date", "TID", "board", "rate", "quad", "channel", "hhmm"], kind="stable")
+        if latest:
+            df = df.drop_duplicates(["TID", "date", "board", "rate", "quad", "channel"], keep="last")
+        return df.reset_index(drop=True)
+
+    def link_series(self, i):
+        # the full series of catalog row i, as a DataFrame
+        return pd.DataFrame({name: a[self.offsets[i]:self.offsets[i + 1]] for name, a in self.series.items()})
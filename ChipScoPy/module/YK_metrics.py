@@ -0,0 +1,108 @@
+#======================================================================================================================================
+# Always-on acquisition instrumentation, per link: latency histograms per stage of the YK-frame path, and frames/sec counters.
+#   stages (seconds, by time.monotonic()):
+#     callback:     TCF call-back, entry -> exit (chipscopy dispatcher thread)
+#     queue:        TCF call-back entry -> committed into the ring buffer by the FSM step
+#     histogram:    histogram / peaks / PER level split of the newly committed slices
+#     per:          PER evaluation
+#     draw:         figures rendering of the GUI thread
+#     table:        table row update, the link values written into the table model
+#     display_age:  age of the newest frame when its eye / histogram is drawn, i.e. how stale the displayed eye is
+#   counters:       arrived (call-backs), committed (into the ring buffer), drawn (figure renderings)
+# Every stage is recorded by one thread only; recording is O(1), a few integer operations and one array increment.
+#--------------------------------------------------------------------------------------------------------------------------------------
+import time
+import numpy as np
+
+LATENCY_STAGES = ("callback", "queue", "histogram", "per", "draw", "table", "display_age")
+RATE_COUNTERS  = ("arrived", "committed", "drawn")
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# HDR-style log-linear histogram of latencies in microseconds: values < 2*HALF exact, above that HALF sub-buckets per power of 2,
+# i.e. <= 1/HALF (6.25%) relative error, over 1 us ~ 2^40 us (12 days) in a fixed SIZE of int64 counts.
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Latency_Histogram:
+    SUB_BITS = 5
+    HALF     = 1 << (SUB_BITS - 1)
+    SIZE     = (40 - SUB_BITS) * HALF + 2 * HALF
+
+    def __init__(self):
+        self.counts = np.zeros(self.SIZE, np.int64)
+        self.n      = 0
+        self.total  = 0.0               # seconds, for the mean
+        self.max    = 0.0
+
+    def record(self, sec):
+        us = int(sec * 1e6) if sec > 0 else 0
+        b  = us.bit_length() - self.SUB_BITS
+        i  = us if b <= 0 else (b * self.HALF) + (us >> b)
+        self.counts[min(i, self.SIZE - 1)] += 1
+        self.n     += 1
+        self.total += sec
+        if sec > self.max:  self.max = sec
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.n      += other.n
+        self.total  += other.total
+        self.max     = max(self.max, other.max)
+
+    @classmethod
+    def bucket_mid_us(cls):
+        i = np.arange(cls.SIZE)
+        b = np.maximum(i // cls.HALF - 1, 0)
+        return ((i - b * cls.HALF) << b) + ((1 << b) - 1) / 2
+
+    def percentile(self, q):
+        # seconds, the middle of the bucket holding the q-th percentile; 0 if empty
+        if self.n == 0:  return 0.0
+        k = np.searchsorted(np.cumsum(self.counts), q / 100 * self.n)
+        return min(float(_BUCKET_MID_US[min(k, self.SIZE - 1)]) / 1e6, self.max)
+
+    def summary(self):
+        # milliseconds
+        if self.n == 0:  return {"n": 0}
+        return {"n": self.n, "mean": self.total / self.n * 1000, "p50": self.percentile(50) * 1000, "p90": self.percentile(90) * 1000,
+                "p99": self.percentile(99) * 1000, "max": self.max * 1000}
+
+_BUCKET_MID_US = Latency_Histogram.bucket_mid_us()
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Link_Metrics:
+    def __init__(self, name):
+        self.name     = name
+        self.stages   = {s: Latency_Histogram() for s in LATENCY_STAGES}
+        self.counters = {c: 0 for c in RATE_COUNTERS}
+        self.t0       = time.monotonic()
+        self._last    = (self.t0, dict(self.counters))        # of the last report(), for the recent frames/sec
+
+    def record(self, stage, sec):
+        self.stages[stage].record(sec)
+
+    def count(self, counter, n=1):
+        self.counters[counter] += n
+
+    def report(self, now):
+        # {"fps": recent frames/sec since the last report, "fps_avg": since start, "totals", "latency_ms": {stage: summary}}
+        t_last, c_last = self._last
+        counters = dict(self.counters)
+        self._last = (now, counters)
+        return {"fps":        {c: (counters[c] - c_last[c]) / max(now - t_last, 1e-6) for c in RATE_COUNTERS},
+                "fps_avg":    {c: counters[c] / max(now - self.t0, 1e-6) for c in RATE_COUNTERS},
+                "totals":     counters,
+                "latency_ms": {s: h.summary() for s, h in self.stages.items() if h.n > 0}}
+
+def merged_report(metrics, reports):
+    # all links together: latency histograms merged, frames/sec summed;  reports: the report() of each link, just taken
+    stages = {s: Latency_Histogram() for s in LATENCY_STAGES}
+    for m in metrics:
+        for s, h in m.stages.items():  stages[s].merge(h)
+    summed = lambda key: {c: sum(r[key][c] for r in reports) for c in RATE_COUNTERS}
+    return {"fps": summed("fps"), "fps_avg": summed("fps_avg"), "totals": summed("totals"),
+            "latency_ms": {s: h.summary() for s, h in stages.items() if h.n > 0}}
+
+def format_report(name, r):
+    fps = "  ".join(f"{c}={r['fps'][c]:.2f}/{r['fps_avg'][c]:.2f}" for c in RATE_COUNTERS)
+    lat = "  ".join(f"{s}={v['p50']:.1f}/{v['p99']:.1f}/{v['max']:.1f}" for s, v in r["latency_ms"].items())
+    return f"{name:<24} fps(now/avg): {fps}   ms(p50/p99/max): {lat}"
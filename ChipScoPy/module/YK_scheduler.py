@@ -0,0 +1,103 @@
+#======================================================================================================================================
+# Adaptive YK-Scan flow control: which links' YK engines run at the same time, re-planned every tick by the acquisition loop.
+#   - per link: slicer arrival rate (EWMA of frames/sec while its engine runs), staleness (sec since its newest frame),
+#     call-back queue depth (YKSample_queue, i.e. how far its FSM steps are behind)
+#   - concurrency: at most `cap` engines run together; cap grows by 1 per quantum up to `concurrency`, and is halved whenever
+#     frames are dropped or a running link's queue is over depth_limit (AIMD), so the cs_server / TCF traffic is never overflowed
+#   - a started engine runs at least `quantum` sec (unless its queue is backed up), then competes again for its slot by fairness:
+#       fresh: staleness x arrival rate, the expected fresh frames of a slot, the stalest / fastest first (a starved link always wins)
+#       stale: staleness only, the stalest first
+#       round: round-robin, the longest since started first
+#--------------------------------------------------------------------------------------------------------------------------------------
+FAIRNESS_POLICIES = ("fresh", "stale", "round")
+
+class Link_Freshness:
+    def __init__(self, dsrc, now):
+        self.dsrc       = dsrc
+        self.running    = False
+        self.started_at = now - 1e9     # never started: the longest since started
+        self.last_frame = now           # time of the newest frame, or of the scheduler start
+        self.frames     = 0             # frames accepted into YKSample_queue
+        self.drops      = 0             # frames dropped by YKSample_queue
+        self.rate       = None          # frames/sec while running, EWMA; None until first measured
+        self.run_sec    = 0.0
+        self.starts     = 0
+
+    def staleness(self, now):
+        return now - self.last_frame
+
+    def depth(self):
+        return len(self.dsrc.YKSample_queue)
+
+
+class YK_FlowScheduler:
+    def __init__(self, dsrcs, now, concurrency=2, fairness="fresh", quantum=1.0, alpha=0.3, depth_limit=0.5):
+        if not fairness in FAIRNESS_POLICIES:
+            raise ValueError(f"Not valid YK fairness policy: {fairness}, one of {FAIRNESS_POLICIES}\n")
+        self.links       = [Link_Freshness(d, now) for d in dsrcs]
+        self.concurrency = max(1, concurrency)
+        self.cap         = 1.0
+        self.cap_time    = now
+        self.fairness    = fairness
+        self.quantum     = quantum
+        self.alpha       = alpha
+        self.depth_limit = max(1, int(depth_limit * dsrcs[0].YKSample_queue.capacity)) if len(dsrcs) > 0 else 1
+        self.last_time   = now
+        self.congestions = 0
+
+    def observe(self, now):
+        # update arrival counters / rates / staleness since the last tick; returns True if congested
+        dt = max(now - self.last_time, 1e-6)
+        self.last_time = now
+        congested = False
+        for k in self.links:
+            q = k.dsrc.YKSample_queue
+            new, dropped = q.accepted - k.frames, q.drops - k.drops
+            k.frames, k.drops = q.accepted, q.drops
+            if new > 0:   k.last_frame = now
+            if dropped > 0:  congested = True
+            if k.running:
+                k.run_sec += dt
+                rate = new / dt
+                k.rate = rate if k.rate is None else k.rate + self.alpha * (rate - k.rate)
+                if k.depth() >= self.depth_limit:  congested = True
+
+        if congested:
+            self.congestions += 1
+            self.cap      = max(1.0, self.cap / 2)
+            self.cap_time = now
+        elif now - self.cap_time >= self.quantum:
+            self.cap      = min(float(self.concurrency), self.cap + 1)
+            self.cap_time = now
+        return congested
+
+    def priority(self, k, now):
+        match self.fairness:
+            case "stale":  return k.staleness(now)
+            case "round":  return now - k.started_at
+            case _:
+                known = [x.rate for x in self.links if x.rate is not None and x.rate > 0]
+                rate  = k.rate if k.rate is not None and k.rate > 0 else (sum(known) / len(known) if known else 1.0)
+                return k.staleness(now) * rate
+
+    def plan(self, now):
+        # returns (to_stop, to_start): lists of data sources; the running states are updated as if all actions succeed
+        slots   = int(self.cap)
+        healthy = [k for k in self.links if k.depth() < self.depth_limit]
+        keep    = [k for k in healthy if k.running and now - k.started_at < self.quantum][:slots]
+        others  = sorted((k for k in healthy if not k in keep), key=lambda k: (self.priority(k, now), now - k.started_at), reverse=True)     # ties: round-robin
+        chosen  = keep + others[:slots - len(keep)]
+
+        to_stop  = [k for k in self.links if k.running and not k in chosen]
+        to_start = [k for k in chosen if not k.running]
+        for k in to_stop:
+            k.running = False
+        for k in to_start:
+            k.running, k.started_at = True, now
+            k.starts += 1
+        return [k.dsrc for k in to_stop], [k.dsrc for k in to_start]
+
+    def metrics(self, now):
+        return {k.dsrc.dsrcName: {"rate_fps": k.rate or 0.0, "staleness_s": k.staleness(now), "queue": k.depth(), "frames": k.frames,
+                                  "drops": k.drops, "run_sec": k.run_sec, "starts": k.starts}
+                for k in self.links}
@@ -0,0 +1,397 @@
+#======================================================================================================================================
+# YK-Scan link results storage: columnar in-memory recorder, and streaming result files writer
+#======================================================================================================================================
+import csv, os, queue, threading, time, traceback
+import numpy as np
+import pandas as pd
+from module.common import BPrint, DBG_LEVEL_ERR
+from module.YK_archive import Slicer_Archive_Writer, Capture_Log_Writer
+from module.YK_dataflow import SPSC_SampleQueue
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Column schema of the per-link result table, in the CSV column order: (name, kind)
+#   kind: numpy dtype string for numeric columns, "str" for text columns (interned: stored as int32 codes into a string table)
+#--------------------------------------------------------------------------------------------------------------------------------------
+LINK_RESULT_SCHEMA = [
+    ("Samples",        "i8"),
+    ("Elapsed Time",   "i8"),
+    ("Status",         "str"),
+    ("Line Rate",      "str"),
+    ("Bits Count",     "str"),
+    ("Errors Count",   "i8"),
+    ("BER",            "f8"),
+    ("SNR",            "f8"),
+    ("Link Status",    "str"),
+    ("EYE-Opening",    "f8"),
+    ("Histogram",      "str"),
+    ("PER",            "f8"),
+    ("PER Statistics", "str"),
+]
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Running count / mean / sample-std (Welford) / min / max of one numeric column, O(1) per value
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Running_Stats:
+    def __init__(self):
+        self.n    = 0
+        self.mean = 0.0
+        self._M2  = 0.0
+        self.min  = np.inf
+        self.max  = -np.inf
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def std(self):
+        return (self._M2 / (self.n - 1)) ** 0.5  if self.n > 1 else 0.0      # ddof=1, the same as pandas Series.std()
+
+    def add(self, value):
+        self.n   += 1
+        delta     = value - self.mean
+        self.mean += delta / self.n
+        self._M2 += delta * (value - self.mean)
+        if value < self.min:  self.min = value
+        if value > self.max:  self.max = value
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Append-only columnar recorder of link samples.
+#   - each numeric column is a list of preallocated numpy chunks of chunk_size rows; a new chunk is allocated when the last
+#     one is full, so an append is O(1) and nothing is ever copied while recording.
+#   - text columns keep int32 codes; each distinct string is stored once in self.strings (Status, Line Rate, ... repeat a lot).
+#   - running aggregates for the columns given in stats_columns, like self.stats["BER"].mean
+#   - to_dataframe(): one concatenation per column, meant for finish_object() / reporting, not per poll.
+#--------------------------------------------------------------------------------------------------------------------------------------
+class LinkSample_Recorder:
+    def __init__(self, schema=LINK_RESULT_SCHEMA, chunk_size=4096, stats_columns=("BER", "SNR")):
+        assert chunk_size > 0
+        self.schema     = list(schema)
+        self.columns    = [name for name, _ in self.schema]
+        self.chunk_size = chunk_size
+        self.strings    = []                            # code -> string
+        self._codes     = {}                            # string -> code
+        self._chunks    = [[] for _ in self.schema]     # per column: list of numpy chunks
+        self.n_rows     = 0
+        self.stats      = {name: Running_Stats() for name in stats_columns}
+        self._stats_idx = [(self.columns.index(name), self.stats[name]) for name in stats_columns]
+
+    def __len__(self):
+        return self.n_rows
+
+    def _intern(self, text):
+        code = self._codes.get(text)
+        if code is None:
+            code = len(self.strings)
+            self._codes[text] = code
+            self.strings.append(text)
+        return code
+
+    def append(self, row):
+        # row: values in schema order, like the former pd_data.loc[len(pd_data)] = [...]
+        assert len(row) == len(self.schema)
+        i = self.n_rows % self.chunk_size
+        if i == 0:
+            for chunks, (_, kind) in zip(self._chunks, self.schema):
+                chunks.append(np.zeros(self.chunk_size, dtype=np.int32 if kind == "str" else kind))
+
+        for chunks, (_, kind), value in zip(self._chunks, self.schema, row):
+            chunks[-1][i] = self._intern(str(value)) if kind == "str" else value
+        for col, stat in self._stats_idx:
+            stat.add(float(row[col]))
+        self.n_rows += 1
+
+    def column(self, name):
+        # the whole column as one numpy array (text columns as an object array of strings)
+        j    = self.columns.index(name)
+        kind = self.schema[j][1]
+        if self.n_rows == 0:
+            return np.array([], dtype=object if kind == "str" else kind)
+        data = np.concatenate(self._chunks[j])[:self.n_rows]
+        if kind == "str":
+            return np.array(self.strings, dtype=object)[data]
+        return data
+
+    def to_dataframe(self):
+        return pd.DataFrame({name: self.column(name) for name in self.columns}, columns=self.columns)
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Streaming, crash-safe writer of per-link results, one background thread per run.
+#   - open_table(path, schema, fmt):  an append-only result table, fmt="csv" (pandas to_csv layout, with the index column)
+#                                     or "parquet" (one row-group per flush, needs pyarrow)
+#   - open_snapshot(path):            a slicer snapshot file (np.savetxt layout), atomically replaced by tmp-file + os.replace()
+#   - open_archive(path, size, meta): a binary slicer archive (module/YK_archive.py), every frame appended
+#   - write_row() / write_snapshot() / write_frame():
+#                                     called from any thread, only enqueue; the writer thread batches them to disk every
+#                                     flush_interval seconds, and fsync's every fsync_interval seconds
+#   - close(stream) / stop():         flush + fsync + close, so finish_object() has nothing else to write.
+# NOTE: a CSV table survives a crash up to the last flush; a Parquet file is only readable after close(), when its footer is written.
+#--------------------------------------------------------------------------------------------------------------------------------------
+class _Table_Stream:
+    def __init__(self, path, schema, fmt):
+        self.path    = path
+        self.schema  = list(schema)
+        self.fmt     = fmt
+        self.pending = []
+        self.n_rows  = 0
+        match fmt:
+            case "csv":
+                self.file   = open(path, "w", newline="", encoding="utf-8")
+                self.csv    = csv.writer(self.file)
+                self.csv.writerow([""] + [name for name, _ in self.schema])
+            case "parquet":
+                import pyarrow as pa, pyarrow.parquet as pq
+                pa_type = {"i8": pa.int64(), "f8": pa.float64(), "str": pa.string()}
+                self.pa     = pa
+                self.pa_schema = pa.schema([(name, pa_type[kind]) for name, kind in self.schema])
+                self.file   = pq.ParquetWriter(path, self.pa_schema)
+            case _:
+                raise ValueError(f"Not valid result format: {fmt}")
+
+    def flush(self, do_fsync):
+        if len(self.pending) > 0:
+            rows, self.pending = self.pending, []
+            if self.fmt == "csv":
+                self.csv.writerows([self.n_rows + i] + row for i, row in enumerate(rows))
+            else:
+                cols = {name: [(str(r[j]) if kind == "str" else r[j]) for r in rows] for j, (name, kind) in enumerate(self.schema)}
+                self.file.write_table(self.pa.Table.from_pydict(cols, schema=self.pa_schema))
+            self.n_rows += len(rows)
+        if self.fmt == "csv":
+            self.file.flush()
+            if do_fsync:  os.fsync(self.file.fileno())
+
+    def close(self):
+        self.flush(True)
+        self.file.close()
+
+
+class _Snapshot_Stream:
+    def __init__(self, path):
+        self.path    = path
+        self.pending = None         # only the latest snapshot matters
+
+    def flush(self, do_fsync):
+        if self.pending is None:  return
+        data, self.pending = self.pending, None
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savetxt(f, data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def close(self):
+        self.flush(True)
+
+
+class _Archive_Stream:
+    def __init__(self, path, slice_size, meta):
+        self.path    = path
+        self.archive = Slicer_Archive_Writer(path, slice_size, **meta)
+        self.pending = []
+
+    def flush(self, do_fsync):
+        if len(self.pending) > 0:
+            frames, self.pending = self.pending, []
+            self.archive.append(np.stack(frames))
+        self.archive.flush(do_fsync)
+
+    def close(self):
+        self.flush(False)
+        self.archive.close()
+
+
+class Result_StreamWriter(threading.Thread):
+    def __init__(self, flush_interval=2.0, fsync_interval=30.0):
+        super().__init__(name="Result_StreamWriter", daemon=True)
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._queue   = queue.SimpleQueue()
+        self._streams = []
+        self._failed  = set()                           # quarantined streams: closed on their first exception, later ops dropped
+        self.errors   = 0
+
+    #---- any thread ----------------------------------------------------------
+    def open_table(self, path, schema=LINK_RESULT_SCHEMA, fmt="csv"):
+        stream = _Table_Stream(path, schema, fmt)       # opened by the caller, so a bad path / format raises right here
+        self._queue.put(("open", stream, None))
+        return stream
+
+    def open_snapshot(self, path):
+        stream = _Snapshot_Stream(path)
+        self._queue.put(("open", stream, None))
+        return stream
+
+    def open_archive(self, path, slice_size, **meta):
+        stream = _Archive_Stream(path, slice_size, meta)
+        self._queue.put(("open", stream, None))
+        return stream
+
+    def write_row(self, stream, row):
+        self._queue.put(("row", stream, list(row)))
+
+    def write_snapshot(self, stream, data):
+        self._queue.put(("snapshot", stream, np.array(data, copy=True)))      # own copy: the caller keeps mutating its ring buffer
+
+    def write_frame(self, stream, frame):
+        self._queue.put(("row", stream, frame))                                  # frame must not be modified afterwards, like YKSample.slicer
+
+    def close(self, stream):
+        self._queue.put(("close", stream, None))
+
+    # True when every stream was written and closed without error
+    def stop(self, timeout=None):
+        self._queue.put(("stop", None, None))
+        self.join(timeout)
+        if self.is_alive():
+            BPrint(f"Result_StreamWriter: not stopped within {timeout} sec, result files may be incomplete", level=DBG_LEVEL_ERR)
+            return False
+        if self.errors > 0:
+            BPrint(f"Result_StreamWriter: {self.errors} errors, {len(self._failed)} result files incomplete: "
+                   f"{', '.join(s.path for s in self._failed)}", level=DBG_LEVEL_ERR)
+        return self.errors == 0
+
+    #---- writer thread -------------------------------------------------------
+    # An exception of one stream never stops the thread: the stream is quarantined, the other links keep being written
+    def _quarantine(self, stream, what):
+        self.errors += 1
+        BPrint(f"Result_StreamWriter: {stream.path}  {what} exception, the file is no longer written\n{traceback.format_exc()}", level=DBG_LEVEL_ERR)
+        if stream in self._streams:  self._streams.remove(stream)
+        self._failed.add(stream)
+        try:
+            stream.close()
+        except Exception:
+            pass
+
+    def _close(self, stream):
+        if stream not in self._streams:  return         # idempotent: closed already, or quarantined
+        self._streams.remove(stream)
+        try:
+            stream.close()
+        except Exception:
+            self._quarantine(stream, "close")
+
+    def _flush_all(self, do_fsync):
+        for s in list(self._streams):
+            try:
+                s.flush(do_fsync)
+            except Exception:
+                self._quarantine(s, "flush")
+
+    def run(self):
+        now = time.monotonic()
+        next_flush = now + self.flush_interval
+        next_fsync = now + self.fsync_interval
+        while True:
+            try:
+                op, stream, payload = self._queue.get(timeout=max(0.0, next_flush - time.monotonic()))
+            except queue.Empty:
+                op = None
+            if op == "stop":
+                for s in list(self._streams):  self._close(s)
+                return
+            if op is not None and stream not in self._failed:
+                try:
+                    match op:
+                        case "open":      self._streams.append(stream)
+                        case "row":       stream.pending.append(payload)
+                        case "snapshot":  stream.pending = payload
+                        case "close":     self._close(stream)
+                except Exception:
+                    self._quarantine(stream, op)
+
+            now = time.monotonic()
+            if now >= next_flush:
+                do_fsync = now >= next_fsync
+                self._flush_all(do_fsync)
+                next_flush = now + self.flush_interval
+                if do_fsync:  next_fsync = now + self.fsync_interval
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Full-fidelity YK-Scan capture: every YKSample of every link into a per-link capture log (*.ykc), by one I/O thread per run.
+#   - add_link(): a Capture_Stream with its own bounded SPSC_SampleQueue; the producer (TCF call-back thread) only does
+#     stream.queue.put(sample), which never blocks: memory is bounded by capacity frames per link, overflow is dropped
+#   - the I/O thread drains each queue in chunks of up to chunk_frames, one write() per chunk, and fsync's every fsync_interval
+#   - backpressure metrics per link: frames_written, bytes_written, queue.drops, queue.high_water, max_write_ms
+#--------------------------------------------------------------------------------------------------------------------------------------
+class Capture_Stream:
+    def __init__(self, path, slice_size, capacity, meta):
+        self.path           = path
+        self.queue          = SPSC_SampleQueue(capacity)
+        self.log            = Capture_Log_Writer(path, slice_size, **meta)
+        self.frames_written = 0
+        self.max_write_ms   = 0.0
+        self.closing        = False
+
+    @property
+    def bytes_written(self):
+        return self.log.bytes_written
+
+    def metrics(self):
+        return f"CAP:{self.frames_written}/{self.queue.drops}/{self.queue.high_water}/{self.max_write_ms:.0f}ms"
+
+
+class YK_Capture_Thread(threading.Thread):
+    def __init__(self, chunk_frames=64, poll_interval=0.2, fsync_interval=30.0):
+        super().__init__(name="YK_Capture_Thread", daemon=True)
+        self.chunk_frames   = chunk_frames
+        self.poll_interval  = poll_interval
+        self.fsync_interval = fsync_interval
+        self._streams  = []
+        self._lock     = threading.Lock()                   # guards rebinding of self._streams only, never held during I/O
+        self._stopping = threading.Event()
+        self.errors    = 0
+
+    def add_link(self, path, slice_size, capacity=256, **meta):
+        stream = Capture_Stream(path, slice_size, capacity, meta)
+        with self._lock:
+            self._streams = self._streams + [stream]        # rebinding, the I/O thread iterates over its own snapshot
+        return stream
+
+    def close(self, stream):
+        stream.closing = True                               # the I/O thread writes what is left, then closes the log
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self.join(timeout)
+
+    #---- I/O thread ----------------------------------------------------------
+    def _write_chunk(self, stream):
+        samples = stream.queue.drain(self.chunk_frames)
+        if len(samples) == 0:  return 0
+        t = time.monotonic()
+        try:
+            stream.log.append(samples)
+            stream.frames_written += len(samples)
+        except Exception:
+            self.errors += 1
+            BPrint(f"YK_Capture_Thread: {stream.path}  append exception, {len(samples)} frames lost\n{traceback.format_exc()}", level=DBG_LEVEL_ERR)
+        stream.max_write_ms = max(stream.max_write_ms, (time.monotonic() - t) * 1000)
+        return len(samples)
+
+    def _close_stream(self, stream):
+        while self._write_chunk(stream) > 0:  pass
+        stream.log.close()
+        with self._lock:
+            self._streams = [s for s in self._streams if s is not stream]
+
+    def run(self):
+        next_fsync = time.monotonic() + self.fsync_interval
+        while True:
+            stopping = self._stopping.is_set()
+            written  = 0
+            for s in self._streams:
+                if s.closing or stopping:
+                    self._close_stream(s)
+                else:
+                    written += self._write_chunk(s)
+            if stopping:  return
+
+            if time.monotonic() >= next_fsync:
+                for s in self._streams:  s.log.flush(True)
+                next_fsync = time.monotonic() + self.fsync_interval
+            if written == 0:
+                self._stopping.wait(self.poll_interval)
@@ -1,9 +1,11 @@
 #======================================================================================================================================
-from PyQt5 import QtWidgets, QtCore, QtGui
+# NOTE: no PyQt5 / matplotlib here, so that the data sources can also run headless (IBERT_HPC_Cable_headless.py)
+#======================================================================================================================================
 import numpy as np
 import pandas as pd
 import argparse, configparser, math, re
 import os, sys, time, datetime, threading
+import atexit, collections, itertools
 
 #======================================================================================================================================
 
@@ -20,9 +22,119 @@ DBG_LEVEL_TRACE  = 5
 #--------------------------------
 def BPrint(*args, level=DBG_LEVEL_INFO):
     if level <= sysconfig.DBG_LEVEL:
-        print(*args)
+        log_writer.put(level, None, " ".join(map(str, args)))
+
+def BLog(level, fmt, *args):
+    # hot paths: nothing is built when filtered out, fmt.format(*args) is done later by the writer thread; printed in call order,
+    # across threads and flushes, like BPrint()
+    if level <= sysconfig.DBG_LEVEL:
+        log_writer.put(level, fmt, args)
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Log records (seq, time, thread, level, fmt, args) of every thread go into its own ring buffer, without any lock; the writer thread
+# merges them in seq order and prints them every LOG_FLUSH_MS, at once for ERR / WARN.  A full ring drops its oldest records.
+#   order across flushes: a flush prints the records below its seq horizon only, once every put() started before it is done; the
+#   records above (seq taken meanwhile) are held back for the next flush.  The rings of the exited threads are dropped once empty.
+#   args are formatted by the writer: pass values (numbers, strings), not containers still being modified by the caller.
+#   LOG_FLUSH_MS=0: printed synchronously by the calling thread, like print()
+#--------------------------------------------------------------------------------------------------------------------------------------
+LOG_RING_SIZE = int(os.getenv("LOG_RING_SIZE", "4096"))
+LOG_FLUSH_MS  = int(os.getenv("LOG_FLUSH_MS", "100"))
+
+class Log_Ring(collections.deque):
+    def __init__(self):
+        super().__init__(maxlen=LOG_RING_SIZE)
+        self.dropped = 0
+        self.thread  = threading.current_thread()
+        self.started = 0                    # put() calls started / done, by the owner thread only
+        self.done    = 0
+
+class Log_Writer:
+    def __init__(self, out=None):
+        self.out        = out               # None: sys.stdout of the moment
+        self.rings      = []
+        self.local      = threading.local()
+        self.seq        = itertools.count()
+        self.lock       = threading.Lock()  # self.rings, and the writer start
+        self.flush_lock = threading.Lock()
+        self.wakeup     = threading.Event()
+        self.thread     = None
+        self.held       = []                # records above the seq horizon of the last flush, by the flushing thread only
+
+    def ring(self):
+        ring = getattr(self.local, "ring", None)
+        if ring is None:
+            ring = self.local.ring = Log_Ring()
+            with self.lock:
+                self.rings.append(ring)
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self.run, name="Log_Writer", daemon=True)
+                    self.thread.start()
+                    atexit.register(self.flush, True)
+        return ring
+
+    def put(self, level, fmt, args):
+        if LOG_FLUSH_MS <= 0:
+            self.write([(0, time.monotonic(), threading.current_thread().name, level, fmt, args)])
+            return
+        ring = self.ring()
+        ring.started += 1                   # before the seq is taken: see flush()
+        try:
+            if len(ring) == LOG_RING_SIZE:  ring.dropped += 1
+            ring.append((next(self.seq), time.monotonic(), ring.thread.name, level, fmt, args))
+        finally:
+            ring.done += 1
+        if level <= DBG_LEVEL_WARN:  self.wakeup.set()
+
+    def run(self):
+        while True:
+            self.wakeup.wait(LOG_FLUSH_MS / 1000)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self, final=False):
+        # by the writer thread; also at exit, and before anything printed directly to stdout (Ex. the headless summary).
+        # final: no holding back, every record in the rings is printed
+        with self.flush_lock:
+            horizon = next(self.seq)        # every seq below is taken, by a put() started before now
+            with self.lock:
+                rings = [r for r in self.rings if r.thread.is_alive() or len(r) > 0 or r.dropped > 0]
+                self.rings = rings
+            started  = [r.started for r in rings]
+            deadline = time.monotonic() + 0.1
+            for ring, n in zip(rings, started):
+                while ring.done < n and time.monotonic() < deadline:  time.sleep(0)    # a put() in progress: its record is appended
+            records, dropped = self.held, 0
+            for ring in rings:
+                while ring:  records.append(ring.popleft())
+                dropped, ring.dropped = dropped + ring.dropped, 0
+            records.sort(key=lambda r: r[0])
+            if final:
+                self.held = []
+            else:
+                k = next((i for i, r in enumerate(records) if r[0] > horizon), len(records))
+                records, self.held = records[:k], records[k:]
+            if dropped > 0:
+                records.append((horizon, time.monotonic(), "", DBG_LEVEL_WARN, "Log_Writer: {} records dropped, LOG_RING_SIZE={}", (dropped, LOG_RING_SIZE)))
+            self.write(records)
+
+    def write(self, records):
+        if len(records) == 0:  return
+        lines = []
+        for seq, t, thread, level, fmt, args in records:
+            try:
+                lines.append(args if fmt is None else fmt.format(*args))
+            except Exception as e:
+                lines.append(f"Log_Writer: {fmt!r} {args!r}  Exception: {str(e)}")
+        out = self.out or sys.stdout
+        out.write("\n".join(lines) + "\n")
+        out.flush()
+
+log_writer = Log_Writer()
+def log_flush():  log_writer.flush(final=True)
 
 app_start_time = datetime.datetime.now()
+app_start_mono = time.monotonic()       # reference of time.monotonic() timestamps, like YKSample.timestamp
 TODAY = f"{app_start_time.date()}"
 
 last_check = app_start_time
@@ -39,12 +151,13 @@ def bprint_loading_time(msg, level=DBG_LEVEL_NOTICE):
        "\n----------------------------------------------------------------------------------------------------------------------------------------------------------------\n", level=level)
 
 def sleep_QAppVitalize(n):
+    QtWidgets = sys.modules.get("PyQt5.QtWidgets")     # only if the GUI has loaded PyQt5; headless, it is a plain sleep
     for _ in range(int(n)):
-        QtWidgets.QApplication.processEvents()
+        if QtWidgets:  QtWidgets.QApplication.processEvents()
         time.sleep(1)
     n -= int(n)
     if n > 0:
-        QtWidgets.QApplication.processEvents()
+        if QtWidgets:  QtWidgets.QApplication.processEvents()
         time.sleep(n)
 """
 def sleep_QAppVitalize(n):
@@ -62,6 +175,7 @@ if not "ENV_COMMON_HELP" in globals():
     export SHOW_FIG_TITLE=True;
     export QWIN_TITLE_STYLE='color: red; font-size: 24px; font-weight: bold; background-color: rgba(255, 255, 128, 120);';
     export QWIN_GUI_FONTNAME='Times';  export QWIN_GUI_FONTSIZE=12;
+    export LOG_FLUSH_MS=100;  export LOG_RING_SIZE=4096;     # log writer period (0: synchronous print), records per thread
     """
 
     # https://doc.qt.io/qt-6/qml-color.html
@@ -162,12 +276,11 @@ def is_scientific_number(s):
     return re.match(r'^[-+]?\d*\.\d+[eE][-+]?\d+$', s) is not None
 
 #======================================================================================================================================
-class Base_DataSource(QtCore.QObject):
+# The FSM steps and the watchdog are driven by module.YK_acquisition.Acquisition_Loop: no thread per data source, no Qt event loop
+class Base_DataSource:
     WATCHDOG_INTERVAL = 10 * 1000
-    s_start_FSM_Worker = QtCore.pyqtSignal()
 
     def __init__(self, dView, fsm_state=0, fsm_running=True, wdog_delay=0):
-        super().__init__()
         if not dView is None:
             self.dsrcName = dView.myName
             self.dataView = dView
@@ -180,63 +293,53 @@ class Base_DataSource(QtCore.QObject):
         self.fsm_state   = fsm_state
         self.fsm_running = fsm_running 
 
-        # Setup a timer to trigger the redraw by calling update_plot.
-        self.watchdog_timer = QtCore.QTimer()
-        self.watchdog_timer.setInterval(self.WATCHDOG_INTERVAL)
-        self.watchdog_timer.timeout.connect(self.fsmFunc_watchdog)
-        if wdog_delay > 0:
-            QtCore.QTimer.singleShot(wdog_delay, lambda:self.watchdog_timer.start())
-        else:
-            self.watchdog_timer.start()
+        # fsmFunc_watchdog() every WATCHDOG_INTERVAL msec, after wdog_delay msec; by the Acquisition_Loop of add_source()
+        self.wdog_delay  = wdog_delay
+        self.acq         = None
+
+    # message head of the data source: name, samples counts, FSM state, elapsed seconds, thread; its values taken now, formatted by the log writer
+    HEAD_FMT = "{:<18} #{:<3d}/{:<3d} S:{:<2} t:{:<4d} T:{:<10}   "
+    def head_values(self):
+        return (f"{self.dsrcName}:", self.ASYN_samples_count, self.SYNC_samples_count, self.fsm_state,
+                int(time.monotonic() - app_start_mono), threading.current_thread().name)
 
-    def BPrt_HEAD_COMMON(self, HEAD0 = True, HEAD1 = True, HEAD2 = True, ):
-        h0 = f"#{self.ASYN_samples_count:<3d}/{self.SYNC_samples_count:<3d} S:{self.fsm_state:<2} "  if HEAD0 else ""
-        h1 = "t:{:<4d} ".format((datetime.datetime.now() - app_start_time).seconds)                  if HEAD1 else ""
-        h2 = f"T:{threading.current_thread().name:<10} "                                             if HEAD2 else ""
-        return "{:<18} {}{}{}  ".format(f"{self.dsrcName}:", h0, h1, h2)
+    def BLog(self, level, fmt, *args):
+        if level <= sysconfig.DBG_LEVEL:
+            log_writer.put(level, self.HEAD_FMT + fmt, self.head_values() + args)
 
     # helper method to trace data for initial counts of traffic
-    def BPrt_traceData(self, msgTxt, trType="ASYNC"):
+    def BLog_traceData(self, trType, fmt, *args):
         if trType == "ASYNC":
             lvl = self.dataView.mydbg_INFO  if self.ASYN_samples_count < sysconfig.DBG_ASYCOUNT  else self.dataView.mydbg_TRACE
         elif trType == "SYNC":
             lvl = self.dataView.mydbg_INFO  if self.SYNC_samples_count < sysconfig.DBG_SYNCOUNT  else self.dataView.mydbg_TRACE
-        BPrint(msgTxt, level=lvl)
+        self.BLog(lvl, fmt, *args)
 
     def __refresh_common_data__(self):
         self.SYNC_samples_count +=1
         self.now         = datetime.datetime.now()
         self.elapsed     = (self.now - app_start_time).seconds
 
-    def setup_worker_thread(self):
-        self.worker_thread = QtCore.QThread()
-        self.moveToThread(self.worker_thread)                           # move worker to the worker thread
-        self.s_start_FSM_Worker.connect(self.fsmFunc_worker_thread)
-        self.worker_thread.start()                                                # start the thread
-
-    @QtCore.pyqtSlot()
-    def fsmFunc_worker_thread(self):
-        INTERVAL = sysconfig.FSM_MAGIC_A[0]/10.0     # DEFAULT: 10
-        while self.fsm_running:
-            match self.fsm_state:
-                case self.fsm_state if self.fsm_state < 10:  # reset && initial fetch
-                    lvl = self.dataView.mydbg_INFO
-                    if not self.fsmFunc_reset(): 
-                        self.fsm_state += 1
-                    else:
-                        self.fsm_state = 10
-
-                case 10: # main state, main-loop for polling, sporadically fetching or stopping
-                    lvl = self.dataView.mydbg_TRACE
-                    self.fsmFunc_running()
-
-                #case 2: # inital stop
-                #case 3: # sporadically fetching
-                #case 4: # sporadically stop 
-                case _: raise ValueError(f"Not valid BaseDataSource.fsm_state : {self.fsm_state}\n")
-
-            BPrint(self.BPrt_HEAD_COMMON() + f"FSM-WorkerThread.{QtCore.QThread.currentThread()} ", level=lvl)
-            sleep_QAppVitalize(INTERVAL)     # QtCore.QTimer.singleShot(2000, lambda:self.fsmFunc_worker_thread())  (REF: https://stackoverflow.com/questions/41545300/equivalent-to-time-sleep-for-a-pyqt-application)
+    def fsmFunc_step(self):
+        # one FSM step, every FSM_MAGIC_A[0]/10 sec by the Acquisition_Loop
+        match self.fsm_state:
+            case self.fsm_state if self.fsm_state < 10:  # reset && initial fetch
+                lvl = self.dataView.mydbg_INFO
+                if not self.fsmFunc_reset(): 
+                    self.fsm_state += 1
+                else:
+                    self.fsm_state = 10
+
+            case 10: # main state, main-loop for polling, sporadically fetching or stopping
+                lvl = self.dataView.mydbg_TRACE
+                self.fsmFunc_running()
+
+            #case 2: # inital stop
+            #case 3: # sporadically fetching
+            #case 4: # sporadically stop 
+            case _: raise ValueError(f"Not valid BaseDataSource.fsm_state : {self.fsm_state}\n")
+
+        self.BLog(lvl, "FSM-Step.{} ", threading.current_thread().name)
 
     #----------------------------------------------------------------------------------
     #def start_data(self):             pass    # Abstract method: to start data-source engine, like YK.start()
@@ -245,11 +348,11 @@ class Base_DataSource(QtCore.QObject):
     def fsmFunc_watchdog(self):        pass    # Abstract method: long  timer polling function
     def fsmFunc_running(self):         pass    # Abstract method: FSM function, polling periodically
     def fsmFunc_reset(self):           pass    # Abstract method: FSM function, resetting initially
+    def fsmFunc_delay(self):           return 0    # seconds to hold off before the next FSM step, without holding any thread
     #----------------------------------------------------------------------------------
 
     def finish_object(self):
         self.fsm_running = False
-        self.watchdog_timer.stop()
 
 
 #======================================================================================================================================
@@ -257,9 +360,8 @@ class Base_DataSource(QtCore.QObject):
 #======================================================================================================================================
 
 #----------------------------------------------------------------------------------------------------------------------------
-class Base_DataView(QtCore.QObject):
+class Base_DataView:
     def __init__(self, name, parent):
-        super().__init__()
         self.myArena = parent
         self.myName  = name
         self.updateTable = parent.updateTable
@@ -8,6 +8,8 @@ from chipscopy.api.ibert.aliases import ( PATTERN,
     RX_LOOPBACK, RX_BER, RX_STATUS, RX_LINE_RATE, RX_RECEIVED_BIT_COUNT, RX_NORMALIZED_RECEIVED_BIT_COUNT, RX_PATTERN_CHECKER_ERROR_COUNT, RX_TERMINATION_VOLTAGE, RX_COMMON_MODE
 )
 from more_itertools import one
+from concurrent.futures import ThreadPoolExecutor
+import hashlib, json, tempfile
 
 #--------------------------------------------------------------------------------------------------------------------------------------
 from module.common      import *
@@ -18,9 +20,26 @@ from module.common      import *
 # The session is a container that keeps track of devices and debug cores.
 # - Session is initialized and connected to server(s)
 # - Versions are detected and reported to stdout
+#
+# Multi-board: FPGA_HWID="111A,112A" (or "all": every Versal device on the hw_server) drives all the boards by the one session, i.e. one
+# hw_server / cs_server connection per process; each board is programmed, its IBERT core discovered and its links brought up concurrently.
 #======================================================================================================================================
-def create_iBERT_session_device():
-    global ibert_gtm
+class IBert_Board:
+    def __init__(self, index, hwid, device):
+        self.index     = index          # the nID of its links: index * global_N_links + 0, 1, ...
+        self.hwid      = hwid
+        self.device    = device
+        self.serial    = board_serial(device)
+        self.ibert_gtm = None
+        self.links     = []
+
+    def __str__(self):
+        return f"Sn{self.hwid}"
+
+links_lock = threading.Lock()           # chipscopy create_links() of the boards, one at a time into the link registry of the session
+
+def create_iBERT_session():
+    global session
 
     # Specify locations of the running hw_server and cs_server below.
     session = create_session(cs_server_url=sysconfig.CS_URL, hw_server_url=sysconfig.HW_URL)
@@ -30,25 +49,75 @@ def create_iBERT_session_device():
     # Versal devices: [ 'xcvp1202:255211775190703847597631284360770503682:jsn-VPK120 FT4232H-872311160112A-14d00093-0',
     #                   'xcvp1202:255211775190703847597631284360770495362:jsn-VPK120 FT4232H-872311160111A-14d00093-0' ]
     BPrint(f"Versal devices: {session.devices}", level=DBG_LEVEL_NOTICE)
+    return session
 
-    # ## 3 - Program the device with PDI_FILE programming image file.
-    if sysconfig.FPGA_HWID == "0": 
-        device = session.devices.filter_by(family="versal").get()
-    else:
+def find_versal_boards(session):
+    versal = session.devices.filter_by(family="versal")
+    if sysconfig.FPGA_HWIDS == ["0"]:
+        return [IBert_Board(0, "0", versal.get())]
+    if sysconfig.FPGA_HWIDS == ["all"]:
+        return [IBert_Board(i, board_hwid(d), d) for i, d in enumerate(versal)]
+
+    boards = []
+    for hwid in sysconfig.FPGA_HWIDS:
         device = None
         for d in session.devices:
             context = d['cable_context']
-            if len( re.findall(f"jsn.*{sysconfig.FPGA_HWID}", context) ) > 0:
-                BPrint(f"Found Versal devices for {sysconfig.FPGA_HWID}: {context}", level=DBG_LEVEL_NOTICE)
+            if len( re.findall(f"jsn.*{hwid}", context) ) > 0:
+                BPrint(f"Found Versal devices for {hwid}: {context}", level=DBG_LEVEL_NOTICE)
                 device = d
                 break
             else:
                 BPrint(f"Versal devices: {context}", level=DBG_LEVEL_NOTICE)
+        if device is None:
+            raise ValueError(f"No Versal device of FPGA_HWID {hwid} on {sysconfig.HW_URL}\n")
+        boards.append(IBert_Board(len(boards), hwid, device))
+    return boards
+
+def board_hwid(device):
+    # Ex. 'jsn-VPK120 FT4232H-872311160112A-14d00093-0' => '112A'
+    hwid = re.findall(r"jsn-.*?-[0-9]*?([0-9]{3}[0-9A-Z])-", device['cable_context'])
+    return hwid[0] if len(hwid) > 0 else board_serial(device)
+
+def create_iBERT_boards():
+    global boards, board_ids, myLinks, all_lnkgrps, all_links
+
+    session = create_iBERT_session()
+    boards  = find_versal_boards(session)
+    board_ids = [b.hwid for b in boards]
+    BPrint(f"Boards: {[f'{b} ({b.serial})' for b in boards]}", level=DBG_LEVEL_NOTICE)
+
+    with ThreadPoolExecutor(len(boards), thread_name_prefix="BOARD") as pool:
+        futures = [pool.submit(setup_iBERT_board, b) for b in boards]
+        for f in futures:
+            f.result()
+    myLinks = [link for b in boards for link in b.links]
 
-    if os.path.exists(sysconfig.PDI_FILE):
-        device.program(sysconfig.PDI_FILE)
+    all_lnkgrps = get_all_link_groups()
+    all_links   = get_all_links()
+    BPrint(f"\n--> All Link Groups available - {all_lnkgrps}", level=DBG_LEVEL_DEBUG)
+    BPrint(f"\n--> All Links available - {all_links}", level=DBG_LEVEL_DEBUG)
+
+def setup_iBERT_board(board):
+    program_iBERT_device(board)
+    bprint_loading_time(f"{board}: Xilinx iBERT-core created")
+
+    create_LinkGroups(board)
+    bprint_loading_time(f"{board}: Xilinx Link-Groups created")
+
+def program_iBERT_device(board):
+    device = board.device
+
+    # ## 3 - Program the device with PDI_FILE programming image file.
+    # Skipped if the board already runs this PDI, by the programming cache: board serial => PDI content hash (see --FORCE_PROGRAM)
+    pdi_hash = file_sha256(sysconfig.PDI_FILE) if os.path.exists(sysconfig.PDI_FILE) else None
+    cached   = pdi_hash is not None and not sysconfig.FORCE_PROGRAM and program_cache_lookup(board.serial) == pdi_hash
+    if pdi_hash is None:
+        BPrint(f"{board}: skipping programming", level=DBG_LEVEL_NOTICE)
+    elif cached:
+        BPrint(f"{board}: skipping programming: {board.serial} already runs {sysconfig.PDI_FILE} (sha256 {pdi_hash[:12]}), by {PROGRAM_CACHE}", level=DBG_LEVEL_NOTICE)
     else:
-        BPrint("skipping programming", level=DBG_LEVEL_NOTICE)
+        device.program(sysconfig.PDI_FILE)
 
     # ## 4 - Discover and setup the IBERT core. Debug core discovery initializes the chipscope server debug cores.
     # - The cs_server is initialized and ready for use
@@ -58,27 +127,91 @@ def create_iBERT_session_device():
     # params_to_set = {"IBERT.internal_mode": True}
     # session.set_param(params_to_set)
 
-    BPrint(f"Discovering debug cores...", level=DBG_LEVEL_NOTICE)
-    device.discover_and_setup_cores(ibert_scan=True)
-    if len(device.ibert_cores) == 0:
-        BPrint("No IBERT core found! Exiting...", level=DBG_LEVEL_ERR)
+    ibert_gtm = discover_ibert_gtm(device)
+    if cached and (ibert_gtm is None or not check_line_rate(ibert_gtm)):
+        BPrint(f"{board}: programming cache of {board.serial} is stale, programming {sysconfig.PDI_FILE}", level=DBG_LEVEL_WARN)
+        device.program(sysconfig.PDI_FILE)
+        ibert_gtm = discover_ibert_gtm(device)
+
+    if ibert_gtm is None:
+        BPrint(f"{board}: No IBERT core found! Exiting...", level=DBG_LEVEL_ERR)
         exit()
-    
-    # ## 5 - Print the hierarchy of the IBERT core
-    # We also ensure that all the quads instantiated by the ChipScoPy CED design are found by the APIs
-    
-    # Use the first available IBERT core from the device
-    BPrint(f"--> Found {[f'{ibert.name} ({ibert.handle})' for ibert in device.ibert_cores]}\n", level=DBG_LEVEL_NOTICE)
-    ibert_gtm = one(device.ibert_cores.filter_by(name="IBERT Versal GTM"))
     if len(ibert_gtm.gt_groups) == 0:
-        BPrint("No GT Groups available for use! Exiting...", level=DBG_LEVEL_WARN)
+        BPrint(f"{board}: No GT Groups available for use! Exiting...", level=DBG_LEVEL_WARN)
         exit()
+    if pdi_hash is not None:
+        program_cache_store(board.serial, pdi_hash)
+    board.ibert_gtm = ibert_gtm
 
     # We also ensure that all the quads instantiated by the ChipScoPy CED design are found by the APIs
     if DBG_LEVEL_DEBUG <= sysconfig.DBG_LEVEL:
         report_hierarchy(ibert_gtm)
-    BPrint(f"--> GT Groups available - {ibert_gtm.gt_groups}", level=DBG_LEVEL_NOTICE)
-    BPrint(f"==> GT Groups available - {[gt_group_obj.name for gt_group_obj in ibert_gtm.gt_groups]}", level=DBG_LEVEL_DEBUG)
+    BPrint(f"--> {board}: GT Groups available - {ibert_gtm.gt_groups}", level=DBG_LEVEL_NOTICE)
+    BPrint(f"==> {board}: GT Groups available - {[gt_group_obj.name for gt_group_obj in ibert_gtm.gt_groups]}", level=DBG_LEVEL_DEBUG)
+
+
+def discover_ibert_gtm(device):
+    BPrint(f"Discovering debug cores...", level=DBG_LEVEL_NOTICE)
+    device.discover_and_setup_cores(ibert_scan=True)
+    if len(device.ibert_cores) == 0:
+        return None
+
+    # ## 5 - Print the hierarchy of the IBERT core
+    # Use the first available IBERT core from the device
+    BPrint(f"--> Found {[f'{ibert.name} ({ibert.handle})' for ibert in device.ibert_cores]}\n", level=DBG_LEVEL_NOTICE)
+    gtm = device.ibert_cores.filter_by(name="IBERT Versal GTM")
+    return one(gtm) if len(gtm) > 0 else None
+
+def check_line_rate(gtm):
+    # cheap on-device check of the running image: the RX line rate (Gbps) of the first GT, Ex. 25.78125 for *_25G.pdi, 26.5625 for *_26G.pdi
+    try:
+        rate = get_property_value(gtm.gt_groups[0].gts[0].rx, 'Line Rate', DBG_LEVEL_INFO)
+        return int(float(re.findall(r"[0-9.]+", str(rate))[0])) == sysconfig.DATA_RATE
+    except Exception as e:
+        BPrint(f"Line rate check: {str(e)}", level=DBG_LEVEL_WARN)
+        return False
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Programming cache: { board serial (the "jsn-..." cable context): {"sha256", "pdi", "time"} } of the last PDI programmed, in PROGRAM_CACHE
+#--------------------------------------------------------------------------------------------------------------------------------------
+PROGRAM_CACHE = os.getenv("PROGRAM_CACHE", "program_cache.json")
+
+def board_serial(device):
+    context = device['cable_context']
+    return (re.findall(r"(jsn-.*)", context) or [context])[0]
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_program_cache():
+    try:
+        with open(PROGRAM_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def program_cache_lookup(board):
+    return load_program_cache().get(board, {}).get("sha256")
+
+program_cache_lock = threading.Lock()   # read-modify-write of PROGRAM_CACHE, by the boards programmed concurrently
+
+def program_cache_store(board, pdi_hash):
+    with program_cache_lock:
+        cache = load_program_cache()
+        cache[board] = {"sha256": pdi_hash, "pdi": sysconfig.PDI_FILE, "time": datetime.datetime.now().isoformat(timespec="seconds")}
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(PROGRAM_CACHE) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(PROGRAM_CACHE)))
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp, PROGRAM_CACHE)
+        except BaseException:
+            os.unlink(tmp)
+            raise
 
 
 #--------------------------------------------------------------------------------------------------------------------------------------
@@ -99,110 +232,198 @@ def get_property_value(obj, propName, lv=DBG_LEVEL_DEBUG):
     return val
 
 def set_property_value(obj, propName, val, lv=DBG_LEVEL_DEBUG):
-    alias  = obj.property_for_alias.get(propName)
-    props = { alias: val }
+    set_property_values(obj, {propName: val}, lv)
+
+def set_property_values(obj, values, lv=DBG_LEVEL_DEBUG):
+    # values: {propName: val}, all set by one commit
+    props = { obj.property_for_alias.get(propName): val for propName, val in values.items() }
     obj.property.set(**props)
     obj.property.commit(list(props.keys()))
 
     if lv < DBG_LEVEL_DEBUG:
-        get_property_value(obj, propName, lv)
-
-
-def check_link_status(link):
-    if link.status == "No link" or link.ber > 1e-5:
-        lr = get_property_value( link.rx, 'Line Rate'                  )
-        ls = get_property_value( link.rx, 'Pattern Checker Lock Status')
-        ec = get_property_value( link.rx, 'Pattern Checker Error Count')
-        cc = get_property_value( link.rx, 'Pattern Checker Cycle Count')
-        return f"LINK ('{link.status}' R={lr} LS='{ls}' EC='{ec}' CC='{cc}')"
-    else:
+        for propName in values:  get_property_value(obj, propName, lv)
+
+
+def check_link_status(link, data=None):
+    # data: of poll_link_data() in batched mode, already holding the properties below, i.e. no more round-trips to cs_server
+    if data is None or not LINK_CHECK_PROPS[0] in data:
+        link.roundtrips = getattr(link, "roundtrips", 0) + 2
+        if link.status == "No link" or link.ber > 1e-5:
+            link.roundtrips += 5
+            data = {"status": link.status}
+            for p in LINK_CHECK_PROPS:  data[p] = get_property_value(link.rx, p)
+        else:
+            return ""
+    elif not (data["status"] == "No link" or data["ber"] > 1e-5):
         return ""
+    lr, ls, ec, cc = (data[p] for p in LINK_CHECK_PROPS)
+    return f"LINK ('{data['status']}' R={lr} LS='{ls}' EC='{ec}' CC='{cc}')"
 
-#======================================================================================================================================
-def create_links_common(RXs, TXs):
-    global myLinks
-
-    BPrint(f"Links_TXs: {TXs}", level=DBG_LEVEL_INFO)
-    BPrint(f"Links_RXs: {RXs}", level=DBG_LEVEL_INFO)
-    myLinks = create_links(txs=TXs, rxs=RXs)
-
-    nID = 0
-    if   DBG_LEVEL_TRACE <= sysconfig.DBG_LEVEL:  dbg_print = True;  dbg_print_all = True; 
-    elif DBG_LEVEL_DEBUG <= sysconfig.DBG_LEVEL:  dbg_print = True;  dbg_print_all = False;
-    else:                                         dbg_print = False; dbg_print_all = False; 
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Batched link polling: every RX property of one link poll, i.e. link.status / line_rate / bit_count / error_count / ber and those
+# of check_link_status(), by one property.refresh() of a list, one round-trip to cs_server instead of one per property access.
+#   LINK_POLL=single: the per-property accesses as before; link.roundtrips counts the cs_server round-trips either way
+#--------------------------------------------------------------------------------------------------------------------------------------
+LINK_POLL_ALIASES = {"status": RX_STATUS, "line_rate": RX_LINE_RATE, "bit_count": RX_RECEIVED_BIT_COUNT, "error_count": RX_PATTERN_CHECKER_ERROR_COUNT, "ber": RX_BER}
+LINK_CHECK_PROPS  = ('Line Rate', 'Pattern Checker Lock Status', 'Pattern Checker Error Count', 'Pattern Checker Cycle Count')
+
+def poll_link_data(link):
+    # returns {"status", "line_rate", "bit_count", "error_count", "ber"}, and the LINK_CHECK_PROPS in batched mode
+    link.roundtrips = getattr(link, "roundtrips", 0)
+    if sysconfig.LINK_POLL == "single":
+        link.roundtrips += 5
+        return {"status": link.status, "line_rate": link.line_rate, "bit_count": link.bit_count, "error_count": link.error_count, "ber": link.ber}
+
+    if not hasattr(link, "poll_names"):     # key => RX property name, resolved once per link
+        link.poll_names = {k: link.rx.property_for_alias[a] for k, a in LINK_POLL_ALIASES.items()}
+        link.poll_names.update({p: link.rx.property_for_alias[p] for p in LINK_CHECK_PROPS})
+    values = link.rx.property.refresh(list(dict.fromkeys(link.poll_names.values())))
+    link.roundtrips += 1
+
+    data = {k: values[name] for k, name in link.poll_names.items()}
+    data["ber"]         = float(data["ber"])
+    data["bit_count"]   = link_count_value(data["bit_count"])
+    data["error_count"] = link_count_value(data["error_count"])
+    return data
+
+def link_count_value(v):
+    # counters of cs_server are hex strings, Ex. '0xE_12DA'; as chipscopy Link.bit_count / error_count: the raw value if not hex
+    try:
+        return int(v, 16)
+    except (TypeError, ValueError):
+        return v
 
-    #----------------------------------------------------------------------------------------------------------
-    # We split TX & RX reset in 2 loops: 1st TX, 2nd RX
-    # Note: the TX -> RX pair may not come in the order of the below FOR-LOOP.
-    #----------------------------------------------------------------------------------------------------------
+#======================================================================================================================================
+def create_links_common(board, RXs, TXs):
+    BPrint(f"{board}: Links_TXs: {TXs}", level=DBG_LEVEL_INFO)
+    BPrint(f"{board}: Links_RXs: {RXs}", level=DBG_LEVEL_INFO)
+    timing = Bringup_Timing()
+    with links_lock:
+        myLinks = create_links(txs=TXs, rxs=RXs)
+
+    nID = board.index * global_N_links
     for link in myLinks:
         link.nID = nID; nID += 1
+        link.board    = board.hwid
         link.gt_name  = re.findall(".*(Quad_[0-9]*).*", str(link.rx))[0]
         link.channel  = int(re.findall(".*CH_([0-9]*).*", str(link.rx))[0])
-        link.GT_Group = ibert_gtm.gt_groups.filter_by(name=link.gt_name)[0]
+        link.GT_Group = board.ibert_gtm.gt_groups.filter_by(name=link.gt_name)[0]
         link.GT_Chan  = link.GT_Group.gts[link.channel]
-        BPrint(f"\n--- {link.name} :: RX={link.rx} TX={link.tx}  GT={link.gt_name} CH={link.channel} ST={link.status}  -----", level=DBG_LEVEL_INFO)
-
-        set_property_value( link.rx, 'Pattern',  sysconfig.DPATTERN, DBG_LEVEL_INFO) 
-        set_property_value( link.tx, 'Pattern',  sysconfig.DPATTERN, DBG_LEVEL_DEBUG) 
-        set_property_value( link.rx, 'Loopback', "None"   , DBG_LEVEL_DEBUG)
-        set_property_value( link.tx, 'Loopback', "None"   , DBG_LEVEL_DEBUG)
-
-        link.GT_Chan.reset()
-        link.tx.reset()
-        #set_property_value( link.tx, 'Reset', 1, DBG_LEVEL_DEBUG)
-
-        if link.status == "No link":     # assert link.status != "No link"
-            BPrint(f"link.status:'No link'   ==> {check_link_status(link)}", level=DBG_LEVEL_WARN)
-
-        assert link.rx.pll.locked and link.tx.pll.locked
-        BPrint(f"--> RX and TX PLLs are locked for {link}. Checking for link lock...", level=DBG_LEVEL_DEBUG)
-
-        if dbg_print:
-            _, tx_pattern_report      = link.tx.property.report(link.tx.property_for_alias[PATTERN]).popitem()
-            _, tx_preCursor_report    = link.tx.property.report(link.tx.property_for_alias[TX_PRE_CURSOR]).popitem()
-            _, tx_postCursor_report   = link.tx.property.report(link.tx.property_for_alias[TX_POST_CURSOR]).popitem()
-            #_, tx_diffSwing_report    = link.tx.property.report(link.tx.property_for_alias[TX_DIFFERENTIAL_SWING]).popitem()
-            #_, rx_termVolt_report     = link.tx.property.report(link.rx.property_for_alias[RX_TERMINATION_VOLTAGE]).popitem()
-            _, rx_pattern_report      = link.rx.property.report(link.rx.property_for_alias[PATTERN]).popitem()
-            _, rx_loopback_report     = link.tx.property.report(link.rx.property_for_alias[RX_LOOPBACK]).popitem()
-
-            BPrint(f"\n\n--> {link} properties:  BER={link.ber}  Count={link.bit_count}", level=DBG_LEVEL_INFO)
-            BPrint(f"--> Valid values for TX pattern     - {tx_pattern_report['Valid values']}", level=DBG_LEVEL_INFO)
-            BPrint(f"--> Valid values for TX pre-Cursor  - {tx_preCursor_report['Valid values']}", level=DBG_LEVEL_INFO)
-            BPrint(f"--> Valid values for TX post-Cursor - {tx_postCursor_report['Valid values']}", level=DBG_LEVEL_INFO)
-            #BPrint(f"--> Valid values for TX diff Swing  - {tx_diffSwing_report['Valid values']}", level=DBG_LEVEL_INFO)
-            #BPrint(f"--> Valid values for RX term Volt   - {rx_termVolt_report['Valid values']}", level=DBG_LEVEL_INFO)
-            BPrint(f"--> Valid values for RX pattern     - {rx_pattern_report['Valid values']}", level=DBG_LEVEL_INFO)
-            BPrint(f"--> Valid values for RX loopback    - {rx_loopback_report['Valid values']}\n", level=DBG_LEVEL_INFO)
-
-            BPrint(f"==> link.RX: {link.rx} / {link.rx.parent} RX_NAME={link.rx.name} GT_NAME={link.rx.parent.name} GT_alias={link.rx.parent.aliases}", level=DBG_LEVEL_INFO)
-            BPrint(f"==> link.TX: {link.tx} / {link.tx.parent} TX_NAME={link.tx.name} GT_NAME={link.tx.parent.name} GT_alias={link.tx.parent.aliases}\n ", level=DBG_LEVEL_INFO)
-            BPrint(f"GTG_alias={link.GT_Group.property_for_alias}", level=DBG_LEVEL_INFO)
-            BPrint(f"GT_alias={link.GT_Chan.property_for_alias}", level=DBG_LEVEL_INFO)
-            BPrint(f"TX_alias={link.tx.property_for_alias}\n", level=DBG_LEVEL_INFO)
-            BPrint(f"RX_alias={link.rx.property_for_alias}\n", level=DBG_LEVEL_INFO)
-
-            get_property_value( link.rx, 'Pattern' )
-            get_property_value( link.rx, 'Loopback' )
-            get_property_value( link.rx, 'Line Rate' )
-            get_property_value( link.rx, 'Pattern Checker Lock Status' )
-            get_property_value( link.rx, 'Pattern Checker Error Count' )
-            get_property_value( link.rx, 'Pattern Checker Cycle Count' )
-            get_property_value( link.tx, 'Pattern' )
-            get_property_value( link.tx, 'Loopback' )
-
-            link.generate_report()
-            dbg_print = dbg_print_all
+        BPrint(f"\n--- {link.name} :: RX={link.rx} TX={link.tx}  GT={link.gt_name} CH={link.channel}  -----", level=DBG_LEVEL_INFO)
+    timing.phase("create links")
 
     #----------------------------------------------------------------------------------------------------------
-    # This is 2nd loop for RX reset
+    # Bring-up pipeline: each phase for all quads concurrently (the links of a quad in order), TX before RX reset.
+    # Note: the TX -> RX pair may not come in the order of myLinks.
     #----------------------------------------------------------------------------------------------------------
-    for link in myLinks:
-        link.rx.reset()
-        #set_property_value( link.rx, 'Reset', 1, DBG_LEVEL_DEBUG)
-        #set_property_value( link.rx, 'RX BER Reset', 1, DBG_LEVEL_DEBUG)
+    for_each_quad(myLinks, lambda link: (
+        set_property_values( link.rx, {'Pattern': sysconfig.DPATTERN, 'Loopback': "None"}, DBG_LEVEL_INFO),
+        set_property_values( link.tx, {'Pattern': sysconfig.DPATTERN, 'Loopback': "None"}, DBG_LEVEL_DEBUG) ))
+    timing.phase("pattern / loopback")
+
+    for_each_quad(myLinks, lambda link: (link.GT_Chan.reset(), link.tx.reset()))     #set_property_value( link.tx, 'Reset', 1, DBG_LEVEL_DEBUG)
+    timing.phase("GT / TX reset")
+
+    unlocked = wait_links_until(myLinks, lambda link: link.rx.pll.locked and link.tx.pll.locked, BRINGUP_TIMEOUT)
+    timing.phase("PLL lock")
+    assert len(unlocked) == 0, f"RX / TX PLLs not locked in {BRINGUP_TIMEOUT} sec: {[str(link) for link in unlocked]}"
+
+    for_each_quad(myLinks, lambda link: link.rx.reset())                               #set_property_value( link.rx, 'Reset', 1, DBG_LEVEL_DEBUG)
+    timing.phase("RX reset")
+
+    no_link = wait_links_until(myLinks, lambda link: link.status != "No link", BRINGUP_TIMEOUT)
+    timing.phase("link lock")
+    for link in no_link:
+        BPrint(f"{link.name} link.status:'No link'   ==> {check_link_status(link)}", level=DBG_LEVEL_WARN)
 
+    #----------------------------------------------------------------------------------------------------------
+    if   DBG_LEVEL_TRACE <= sysconfig.DBG_LEVEL:  report_links = myLinks
+    elif DBG_LEVEL_DEBUG <= sysconfig.DBG_LEVEL:  report_links = myLinks[:1]
+    else:                                         report_links = []
+    for link in report_links:
+        report_link_properties(link)
+    timing.phase("debug report")
+
+    quads = len(set(link.gt_name for link in myLinks))
+    BPrint(f"{board}: Bring-up of {len(myLinks)} links / {quads} quads:  {timing}", level=DBG_LEVEL_NOTICE)
+    board.links = myLinks
+
+
+def report_link_properties(link):
+    _, tx_pattern_report      = link.tx.property.report(link.tx.property_for_alias[PATTERN]).popitem()
+    _, tx_preCursor_report    = link.tx.property.report(link.tx.property_for_alias[TX_PRE_CURSOR]).popitem()
+    _, tx_postCursor_report   = link.tx.property.report(link.tx.property_for_alias[TX_POST_CURSOR]).popitem()
+    #_, tx_diffSwing_report    = link.tx.property.report(link.tx.property_for_alias[TX_DIFFERENTIAL_SWING]).popitem()
+    #_, rx_termVolt_report     = link.tx.property.report(link.rx.property_for_alias[RX_TERMINATION_VOLTAGE]).popitem()
+    _, rx_pattern_report      = link.rx.property.report(link.rx.property_for_alias[PATTERN]).popitem()
+    _, rx_loopback_report     = link.tx.property.report(link.rx.property_for_alias[RX_LOOPBACK]).popitem()
+
+    BPrint(f"\n\n--> {link} properties:  BER={link.ber}  Count={link.bit_count}", level=DBG_LEVEL_INFO)
+    BPrint(f"--> Valid values for TX pattern     - {tx_pattern_report['Valid values']}", level=DBG_LEVEL_INFO)
+    BPrint(f"--> Valid values for TX pre-Cursor  - {tx_preCursor_report['Valid values']}", level=DBG_LEVEL_INFO)
+    BPrint(f"--> Valid values for TX post-Cursor - {tx_postCursor_report['Valid values']}", level=DBG_LEVEL_INFO)
+    #BPrint(f"--> Valid values for TX diff Swing  - {tx_diffSwing_report['Valid values']}", level=DBG_LEVEL_INFO)
+    #BPrint(f"--> Valid values for RX term Volt   - {rx_termVolt_report['Valid values']}", level=DBG_LEVEL_INFO)
+    BPrint(f"--> Valid values for RX pattern     - {rx_pattern_report['Valid values']}", level=DBG_LEVEL_INFO)
+    BPrint(f"--> Valid values for RX loopback    - {rx_loopback_report['Valid values']}\n", level=DBG_LEVEL_INFO)
+
+    BPrint(f"==> link.RX: {link.rx} / {link.rx.parent} RX_NAME={link.rx.name} GT_NAME={link.rx.parent.name} GT_alias={link.rx.parent.aliases}", level=DBG_LEVEL_INFO)
+    BPrint(f"==> link.TX: {link.tx} / {link.tx.parent} TX_NAME={link.tx.name} GT_NAME={link.tx.parent.name} GT_alias={link.tx.parent.aliases}\n ", level=DBG_LEVEL_INFO)
+    BPrint(f"GTG_alias={link.GT_Group.property_for_alias}", level=DBG_LEVEL_INFO)
+    BPrint(f"GT_alias={link.GT_Chan.property_for_alias}", level=DBG_LEVEL_INFO)
+    BPrint(f"TX_alias={link.tx.property_for_alias}\n", level=DBG_LEVEL_INFO)
+    BPrint(f"RX_alias={link.rx.property_for_alias}\n", level=DBG_LEVEL_INFO)
+
+    get_property_value( link.rx, 'Pattern' )
+    get_property_value( link.rx, 'Loopback' )
+    get_property_value( link.rx, 'Line Rate' )
+    get_property_value( link.rx, 'Pattern Checker Lock Status' )
+    get_property_value( link.rx, 'Pattern Checker Error Count' )
+    get_property_value( link.rx, 'Pattern Checker Cycle Count' )
+    get_property_value( link.tx, 'Pattern' )
+    get_property_value( link.tx, 'Loopback' )
+
+    link.generate_report()
+
+
+#--------------------------------------------------------------------------------------------------------------------------------------
+# Bring-up helpers: per-quad concurrency, lock polling with timeout, per-phase timing
+#--------------------------------------------------------------------------------------------------------------------------------------
+BRINGUP_TIMEOUT = float(os.getenv("BRINGUP_TIMEOUT", "10"))    # sec, waiting for PLL lock / link lock of all links at bring-up
+
+def for_each_quad(links, func):
+    # func(link) for all links: the quads (GT groups) concurrently, the links of one quad in order; exceptions re-raised
+    quads = {}
+    for link in links:
+        quads.setdefault(link.gt_name, []).append(link)
+    with ThreadPoolExecutor(max(1, len(quads)), thread_name_prefix="BRINGUP") as pool:
+        futures = [pool.submit(lambda q_links: [func(link) for link in q_links], q_links) for q_links in quads.values()]
+        for f in futures:
+            f.result()
+
+def wait_links_until(links, ready, timeout, interval=0.2):
+    # polls ready(link) until all links are ready, or timeout sec; returns the links not ready
+    deadline = time.monotonic() + timeout
+    pending  = list(links)
+    while True:
+        pending = [link for link in pending if not ready(link)]
+        if len(pending) == 0 or time.monotonic() >= deadline:
+            return pending
+        time.sleep(interval)
+
+class Bringup_Timing:
+    def __init__(self):
+        self.t0     = time.monotonic()
+        self.t      = self.t0
+        self.phases = []
+
+    def phase(self, name):
+        now = time.monotonic()
+        self.phases.append((name, now - self.t))
+        self.t = now
+
+    def __str__(self):
+        return "  ".join(f"{name}={sec:.1f}s" for name, sec in self.phases) + f"  TOTAL={self.t - self.t0:.1f}s"
 
 #--------------------------------------------------------------------------------------------------------------------------------------
 # Connection Map for QSFP-DD ports: QDD-1 & QDD-2 on 2x VPK120 (SN: 111/112)
@@ -214,8 +435,7 @@ def create_links_common(RXs, TXs):
 #                      2x QSFP-DD cables                                                                  |  1x QSFP-DD cable
 #     QDD-2 cage <-------------------------------> cage QDD-2                         QDD-2 cage <--------+                   
 #--------------------------------------------------------------------------------------------------------------------------------------
-def create_links_SelfLooped_X8():
-    global q205, q204, q203, q202
+def create_links_SelfLooped_X8(board, q202, q203, q204, q205):
 
     RXs = list(); TXs = list();
     for q_TX, ch_TX, q_RX, ch_RX in ( (q202,0, q204,0), (q202,1, q204,2), (q202,2, q205,0), (q202,3, q205,2), (q203,0, q204,1), (q203,1, q204,3), (q203,2, q205,1), (q203,3, q205,3)
@@ -223,11 +443,10 @@ def create_links_SelfLooped_X8():
         RXs.append(q_RX.gts[ch_RX].rx)
         TXs.append(q_TX.gts[ch_TX].tx)
 
-    create_links_common(RXs, TXs)
+    create_links_common(board, RXs, TXs)
 
 #------------------------------------------
-def create_links_SelfLooped_X4():
-    global q205, q204, q203, q202
+def create_links_SelfLooped_X4(board, q202, q203, q204, q205):
 
     RXs = list(); TXs = list();
     for q_TX, ch_TX, q_RX, ch_RX in ( (q202,0, q204,0), (q202,1, q204,2), (q202,2, q205,0), (q202,3, q205,2)
@@ -235,29 +454,27 @@ def create_links_SelfLooped_X4():
         RXs.append(q_RX.gts[ch_RX].rx)
         TXs.append(q_TX.gts[ch_TX].tx)
 
-    create_links_common(RXs, TXs)
+    create_links_common(board, RXs, TXs)
 
 #------------------------------------------
-def create_links_XConnected_X8():
-    global q202, q203, q204, q205
+def create_links_XConnected_X8(board, q202, q203, q204, q205):
 
     RXs = list(); TXs = list();
     for q, ch in ( (q202,0), (q202,1), (q202,2), (q202,3), (q203,0), (q203,1), (q203,2), (q203,3), (q204,0), (q204,2), (q205,0), (q205,2), (q204,1), (q204,3), (q205,1), (q205,3) ):
         RXs.append(q.gts[ch].rx)
         TXs.append(q.gts[ch].tx)
 
-    create_links_common(RXs, TXs)
+    create_links_common(board, RXs, TXs)
 
 #------------------------------------------
-def create_links_XConnected_X4():
-    global q202, q203, q204, q205
+def create_links_XConnected_X4(board, q202, q203, q204, q205):
 
     RXs = list(); TXs = list();
     for q, ch in ( (q202,0), (q202,2), (q203,0), (q203,2), (q204,0), (q204,2), (q205,0), (q205,2) ):
         RXs.append(q.gts[ch].rx)
         TXs.append(q.gts[ch].tx)
 
-    create_links_common(RXs, TXs)
+    create_links_common(board, RXs, TXs)
 
 #------------------------------------------
 class FakeLink:
@@ -265,14 +482,23 @@ class FakeLink:
         self.nID = nID;
         self.name = f"FakeLink-{nID}"
 
-def create_fake_links():
-    global myLinks, all_lnkgrps, all_links
+def create_fake_links(replay_links=None):
+    # replay_links: [(gt_name, channel, replay_files), ...] of recorded links to be replayed, instead of the simulated Quad_90x
+    # simulation of multi-board: the same simulated links for every board of FPGA_HWID
+    global board_ids, myLinks, all_lnkgrps, all_links
 
+    board_ids = [h for h in sysconfig.FPGA_HWIDS if h != "all"] if replay_links is None else [sysconfig.FPGA_HWID]
+    board_ids = board_ids or ["0"]
     myLinks = []
-    for nID in range(global_N_links):
+    n_links = global_N_links if replay_links is None else min(global_N_links, len(replay_links))
+    for nID in range(n_links * len(board_ids)):
         link = FakeLink(nID)
-        link.gt_name  = f"Quad_90{int(nID/4)}"
-        link.channel  = nID % 4
+        link.board = board_ids[nID // n_links]
+        if replay_links is None:
+            link.gt_name  = f"Quad_90{int(nID % n_links / 4)}"
+            link.channel  = nID % 4
+        else:
+            link.gt_name, link.channel, link.replay = replay_links[nID]
         #link.GT_Group = ibert_gtm.gt_groups.filter_by(name=link.gt_name)[0]
         #link.GT_Chan  = link.GT_Group.gts[link.channel]
         link.tx = f"IBERT_0.{link.gt_name}.CH_{link.channel}.TX(TX)"
@@ -282,20 +508,17 @@ def create_fake_links():
         BPrint(f"\n--- {link.name:<12}:: RX={link.rx} TX={link.tx}  GT={link.gt_name} CH={link.channel} ST={link.status}  -----", level=DBG_LEVEL_INFO)
 
 #------------------------------------------
-def create_LinkGroups():
-    global q205, q204, q203, q202
-    global myLinks, all_lnkgrps, all_links
-
-    q205 = one(ibert_gtm.gt_groups.filter_by(name="Quad_205"))
-    q204 = one(ibert_gtm.gt_groups.filter_by(name="Quad_204"))
-    q203 = one(ibert_gtm.gt_groups.filter_by(name="Quad_203"))
-    q202 = one(ibert_gtm.gt_groups.filter_by(name="Quad_202"))
+def create_LinkGroups(board):
+    q205 = one(board.ibert_gtm.gt_groups.filter_by(name="Quad_205"))
+    q204 = one(board.ibert_gtm.gt_groups.filter_by(name="Quad_204"))
+    q203 = one(board.ibert_gtm.gt_groups.filter_by(name="Quad_203"))
+    q202 = one(board.ibert_gtm.gt_groups.filter_by(name="Quad_202"))
 
     match sysconfig.CONN_TYPE:
-        case "S4" | "SLoop_x4": create_links_SelfLooped_X4()
-        case "S8" | "SLoop_x8": create_links_SelfLooped_X8()
-        case "X4" | "XConn_x4": create_links_XConnected_X4()
-        case "X8" | "XConn_x8": create_links_XConnected_X8()
+        case "S4" | "SLoop_x4": create_links_SelfLooped_X4(board, q202, q203, q204, q205)
+        case "S8" | "SLoop_x8": create_links_SelfLooped_X8(board, q202, q203, q204, q205)
+        case "X4" | "XConn_x4": create_links_XConnected_X4(board, q202, q203, q204, q205)
+        case "X8" | "XConn_x8": create_links_XConnected_X8(board, q202, q203, q204, q205)
         case _:                 raise ValueError(f"Not valid Connection Type: {sysconfig.CONN_TYPE}\n")
 
     # These below RESET aren't necessarily required
@@ -306,11 +529,6 @@ def create_LinkGroups():
     q205.reset()
     """
 
-    all_lnkgrps = get_all_link_groups()
-    all_links   = get_all_links()
-    BPrint(f"\n--> All Link Groups available - {all_lnkgrps}", level=DBG_LEVEL_DEBUG)
-    BPrint(f"\n--> All Links available - {all_links}", level=DBG_LEVEL_DEBUG)
-
 
 #======================================================================================================================================
 def init_iBERT_engine(syscfg, N_links):
@@ -321,12 +539,16 @@ def init_iBERT_engine(syscfg, N_links):
 
     if sysconfig.SIMULATE:
         create_fake_links()
+    elif sysconfig.REPLAY != "":
+        create_fake_links(sysconfig.REPLAY_LINKS)
     else:
-        create_iBERT_session_device()
-        bprint_loading_time("Xilinx iBERT-core created")
-
-        create_LinkGroups()
-        bprint_loading_time("Xilinx Link-Groups created")
+        create_iBERT_boards()
+        bprint_loading_time(f"Xilinx iBERT-cores / Link-Groups of {len(boards)} boards created")
 
     return myLinks
 
+def link_dsrc_name(link):
+    # Ex. "YK-Quad_204_CH0"; of multi-board, prefixed by the board HWID: "111A.YK-Quad_204_CH0"
+    name = f"YK-{link.gt_name}_CH{link.channel}"
+    return name if len(board_ids) <= 1 else f"{link.board}.{name}"
+
@@ -0,0 +1,59 @@
+import timeit, os, sys, threading, time, datetime
+
+#------------------------------------------------------------------------------------------
+# Hot-path logging cost, per call of the calling thread (the FSM step / TCF call-back):
+#   BPrint(self.BPrt_HEAD_COMMON() + f"...")  eager head + f-string, then the level check, then print()
+#   self.BLog(level, "...", *args)            level check first; head values + args into the thread ring, formatted by the writer
+# at DBG_LEVEL=3 (the TRACE message filtered out) and DBG_LEVEL=5 (printed, into /dev/null)
+#------------------------------------------------------------------------------------------
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "../.."))
+import module.common as common
+from module.common import Base_DataSource, DBG_LEVEL_TRACE, app_start_time
+
+NUMBER  = 200000
+devnull = open(os.devnull, "w")
+common.sysconfig = common.SysConfig_Singleton()
+common.log_writer.out = devnull
+
+class Fake_DataView:
+    myName      = "YK-Quad_204_CH0"
+    mydbg_TRACE = DBG_LEVEL_TRACE
+
+class Bench_DataSource(Base_DataSource):
+    def __init__(self):
+        super().__init__(Fake_DataView())
+        self.snr, self.ber, self.elapsed = 20.53, 4.74e-10, 5
+
+    # the former eager head and BPrint()
+    def BPrt_HEAD_COMMON(self):
+        h0 = f"#{self.ASYN_samples_count:<3d}/{self.SYNC_samples_count:<3d} S:{self.fsm_state:<2} "
+        h1 = "t:{:<4d} ".format((datetime.datetime.now() - app_start_time).seconds)
+        h2 = f"T:{threading.current_thread().name:<10} "
+        return "{:<18} {}{}{}  ".format(f"{self.dsrcName}:", h0, h1, h2)
+
+    def eager(self):
+        msg = self.BPrt_HEAD_COMMON() + f"refresh_plotYK:: BER: {self.ber:.2e}  SNR: {self.snr:6.2f}  Elapsed:{self.elapsed}"
+        if DBG_LEVEL_TRACE <= common.sysconfig.DBG_LEVEL:
+            print(msg, file=devnull)
+
+    def lazy(self):
+        self.BLog(self.dataView.mydbg_TRACE, "refresh_plotYK:: BER: {:.2e}  SNR: {:6.2f}  Elapsed:{}", self.ber, self.snr, self.elapsed)
+
+dsrc = Bench_DataSource()
+for level in (3, 5):
+    common.sysconfig.DBG_LEVEL = level
+    t_eager = timeit.timeit(dsrc.eager, number=NUMBER) / NUMBER
+    t_lazy  = timeit.timeit(dsrc.lazy,  number=NUMBER) / NUMBER
+    common.log_flush()
+    for _ in range(NUMBER // 100):  dsrc.lazy()
+    t0 = time.perf_counter()
+    common.log_flush()
+    t_flush = (time.perf_counter() - t0) / (NUMBER // 100)
+    print(f"DBG_LEVEL={level}:  eager BPrint {t_eager*1e6:6.2f} us   lazy BLog {t_lazy*1e6:6.2f} us   (writer thread: {t_flush*1e6:6.2f} us per record)")
+
+#----------------------------------------------------------------------------------
+# number=200000, Python 3.11:
+#   DBG_LEVEL=3:  eager BPrint   7.05 us   lazy BLog   0.35 us   (writer thread:   0.00 us per record)
+#   DBG_LEVEL=5:  eager BPrint   8.20 us   lazy BLog   3.74 us   (writer thread:   4.35 us per record)
+#----------------------------------------------------------------------------------
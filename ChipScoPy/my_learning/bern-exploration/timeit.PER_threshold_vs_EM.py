@@ -0,0 +1,90 @@
+import timeit, os, sys
+import numpy as np
+
+#------------------------------------------------------------------------------------------
+# PER estimation: fixed-threshold split (PER_Estimator) vs. Gaussian mixture by EM (EM_GaussianMixture)
+#   1) on the committed YK slicer sample files: cost, and the fitted levels / PER of both methods
+#   2) on synthetic asymmetric PAM4 levels with known (mean, std): PER accuracy vs. the true PER
+#------------------------------------------------------------------------------------------
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "../.."))
+from module.YK_analysis import Streaming_Histogram, batch_find_peaks_and_valleys, make_smoothing_kernel, \
+                               PER_Estimator, EM_GaussianMixture, crossover_errors
+
+SAMPLE_PATH = os.path.join(HERE, "../copilot.assistance/misc")
+SAMPLE_FILES = [ "Sample_YK-Slicer_Files.Cable-2m.txt",
+                 "Sample_YK-Slicer_Files.Cable-3m.Quad204_CH1.POOR.txt",
+                 "Sample_YK-Slicer_Files.Cable-3m.Quad205_CH2.GOOD.txt" ]
+YKSCAN_SLICER_SIZE = 2000
+HIST_BINS = 100
+NUMBER = 20
+
+def thresholds_of(frames):
+    hist = Streaming_Histogram(HIST_BINS)
+    hist.update(frames)
+    pv = batch_find_peaks_and_valleys(hist.counts, 4, 4, make_smoothing_kernel("tri:3"))
+    P = pv.peaks[0] * (100 / HIST_BINS)
+    return P, [(P[0] + P[1]) / 2, 50, (P[2] + P[3]) / 2]
+
+def per_threshold(frames, thresholds):
+    engine = PER_Estimator(4, len(frames))
+    for f in frames:  engine.update(f, thresholds)
+    return engine.evaluate()
+
+def txt_levels(stats):
+    return "  ".join(f"({s['mean']:5.1f}/{s['std']:4.2f})" for s in stats)
+
+def txt_PER(errors):
+    return f"{sum(up + down for up, down in errors):.3e}"
+
+#------------------------------------------------------------------------------------------
+for fname in SAMPLE_FILES:
+    frames = np.loadtxt(os.path.join(SAMPLE_PATH, fname)).astype(np.float32).reshape(-1, YKSCAN_SLICER_SIZE)
+    peaks, thresholds = thresholds_of(frames)
+    em = EM_GaussianMixture(4)
+
+    t_thr  = timeit.timeit(lambda: per_threshold(frames, thresholds), number=NUMBER) / NUMBER
+    t_cold = timeit.timeit(lambda: EM_GaussianMixture(4).fit(frames, peaks), number=NUMBER) / NUMBER
+    em.fit(frames, peaks)
+    t_warm = timeit.timeit(lambda: em.fit(frames), number=NUMBER) / NUMBER
+
+    st_thr, _, err_thr = per_threshold(frames, thresholds)
+    st_em,  _, err_em  = em.evaluate()
+    print(f"{fname}   samples={frames.size}  peaks={peaks}")
+    print(f"    threshold: {t_thr*1000:7.2f} ms  PER={txt_PER(err_thr)}  levels: {txt_levels(st_thr)}")
+    print(f"    EM cold:   {t_cold*1000:7.2f} ms")
+    print(f"    EM warm:   {t_warm*1000:7.2f} ms  PER={txt_PER(err_em)}  levels: {txt_levels(st_em)}  iter={em.n_iter} LL={em.log_likelihood:.3f}\n")
+
+#------------------------------------------------------------------------------------------
+rng = np.random.default_rng(42)
+TRUTH = [ {'mean': 22, 'std': 2.0}, {'mean': 37, 'std': 4.5}, {'mean': 58, 'std': 3.5}, {'mean': 80, 'std': 2.0} ]
+_, true_err = crossover_errors(TRUTH)
+frames = np.concatenate([rng.normal(t['mean'], t['std'], 6000) for t in TRUTH])
+rng.shuffle(frames)
+frames = frames.astype(np.float32).reshape(-1, YKSCAN_SLICER_SIZE)
+
+peaks, thresholds = thresholds_of(frames)
+st_thr, _, err_thr = per_threshold(frames, thresholds)
+st_em,  _, err_em  = EM_GaussianMixture(4).fit(frames, peaks).evaluate()
+print(f"synthetic asymmetric PAM4, true PER={txt_PER(true_err)}  levels: {txt_levels(TRUTH)}")
+print(f"    threshold: PER={txt_PER(err_thr)}  levels: {txt_levels(st_thr)}")
+print(f"    EM:        PER={txt_PER(err_em)}  levels: {txt_levels(st_em)}")
+
+#----------------------------------------------------------------------------------
+# number=20, 12 x 2000 samples per file:
+#   Sample_YK-Slicer_Files.Cable-2m.txt
+#       threshold:    0.79 ms  PER=1.386e-13
+#       EM cold:     44.14 ms
+#       EM warm:     22.26 ms  PER=1.386e-13   iter=2
+#   Sample_YK-Slicer_Files.Cable-3m.Quad204_CH1.POOR.txt
+#       threshold:    0.93 ms  PER=2.146e-03
+#       EM cold:     33.62 ms
+#       EM warm:     18.42 ms  PER=2.163e-03   iter=2
+#   Sample_YK-Slicer_Files.Cable-3m.Quad205_CH2.GOOD.txt
+#       threshold:    0.72 ms  PER=1.924e-12
+#       EM cold:     38.25 ms
+#       EM warm:     25.68 ms  PER=1.924e-12   iter=2
+#   synthetic asymmetric PAM4, true PER=5.988e-02
+#       threshold:  PER=4.625e-02   levels: ( 22.2/2.22)  ( 37.4/4.26)  ( 58.1/3.39)  ( 80.1/2.01)
+#       EM:         PER=6.173e-02   levels: ( 22.0/1.99)  ( 36.9/4.53)  ( 58.1/3.51)  ( 80.1/1.99)
+#----------------------------------------------------------------------------------
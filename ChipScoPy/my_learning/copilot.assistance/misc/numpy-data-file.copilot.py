@@ -29,16 +29,18 @@ Reading Data from the Disk File and Creating Matplotlib Plots: Now let’s read
 Additionally, we’ll calculate some basic statistical measures:
 """
 
-import sys
+import sys, os
 import matplotlib.pyplot as plt
 import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../.."))
+from module.YK_archive import load_slicer_file      # *.yks archive or legacy *.txt
 
 # Read data from the file
 #---------------------------------------------------------------------------------------------------
 if len(sys.argv) > 1: fname = sys.argv[1]
 else:                 fname = 'Sample_YK-Slicer_Files.Cable-2m.txt'
 
-loaded_data = np.loadtxt(fname)
+loaded_data = load_slicer_file(fname)
 #---------------------------------------------------------------------------------------------------
 
 # Create scatter plot
@@ -15,6 +15,8 @@ Can you give me the complete Python code for this?
 import sys, os
 import matplotlib.pyplot as plt
 import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../.."))
+from module.YK_archive import load_slicer_file      # *.yks archive or legacy *.txt
 
 #---------------------------------------------------------------------------------------------------
 # Bernard's ChipScoPy's design: YKScan_slicer_buf
@@ -52,7 +54,7 @@ if len(sys.argv) > 1:
 else:
     fname = 'Sample_YK-Slicer_Files.Cable-2m.txt'
 
-if os.path.isfile(fname): your_array = np.loadtxt(fname)
+if os.path.isfile(fname): your_array = load_slicer_file(fname)
 else:                     your_array = data_source_from_ramdom()
 
 #---------------------------------------------------------------------------------------------------